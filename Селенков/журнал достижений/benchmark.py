@@ -0,0 +1,247 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from docx import Document
+
+# Добавляем путь к текущей директории
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import journal
+
+ROWS = 100_000
+SEARCH_ROWS = 1_000_000
+EXPORT_ROWS = 50_000
+REPEATS = 20
+
+
+# ========== ПОДГОТОВКА ДАННЫХ ==========
+
+def fill_database(rows):
+    """Заполнение базы тестовыми записями"""
+    journal.init_db()
+    types = [journal.lookup_id("типы", typ)
+             for typ in ["Олимпиада", "Сертификат", "Проект", "Экзамен", "Конференция"]]
+    levels = [journal.lookup_id("уровни", level) for level in journal.LEVELS]
+    conn = sqlite3.connect(journal.DB_NAME)
+    conn.executemany(
+        "INSERT INTO достижения (название, дата, тип_id, уровень_id, описание) VALUES (?, ?, ?, ?, ?)",
+        ((f"Достижение {i}",
+          f"{2000 + i % 25:04d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+          types[i % len(types)],
+          levels[i % len(levels)],
+          f"Описание {i}") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def measure(func):
+    """Среднее время вызова в миллисекундах"""
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+
+# ========== СЦЕНАРИИ ==========
+
+def legacy_save():
+    """Сохранение с подключением на каждую операцию"""
+    conn = sqlite3.connect(journal.DB_NAME)
+    conn.execute("INSERT INTO достижения (название, дата, тип_id, уровень_id, описание) "
+                 "SELECT ?, ?, т.id, у.id, ? FROM типы т, уровни у WHERE т.название = ? AND у.название = ?",
+                 ("Бенчмарк", "2024-01-01", "", "Проект", "Локальный"))
+    conn.commit()
+    conn.close()
+
+
+def legacy_refresh():
+    """Загрузка списка с подключением на каждую операцию"""
+    conn = sqlite3.connect(journal.DB_NAME)
+    conn.execute("SELECT д.дата, д.название, т.название, у.название " + journal.RECORDS_FROM +
+                 "ORDER BY д.дата DESC").fetchall()
+    conn.close()
+
+
+def repository_save():
+    """Сохранение через общее подключение"""
+    journal.save_to_db("Бенчмарк", "2024-01-01", "Проект", "Локальный", "")
+
+
+def bench_save_and_refresh():
+    """Сохранение + обновление списка до и после общего подключения"""
+    print(f"\n⏱  Сохранение + обновление списка ({ROWS} записей)")
+    # Старый вариант работает в режиме журнала по умолчанию
+    journal.close_db()
+    conn = sqlite3.connect(journal.DB_NAME)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+    before = (measure(legacy_save), measure(legacy_refresh))
+    after = (measure(repository_save), measure(journal.load_records))
+
+    print(f"  {'':8}{'сохранение':>12}{'список':>12}{'итого':>12}")
+    for label, (save, refresh) in (("до:", before), ("после:", after)):
+        print(f"  {label:8}{save:10.2f}мс{refresh:10.2f}мс{save + refresh:10.2f}мс")
+
+
+def bench_first_page():
+    """Первый экран списка: полная загрузка против первой страницы"""
+    print(f"\n⏱  Первый экран списка ({ROWS} записей)")
+    full = measure(journal.load_records_with_id)
+    first_page = measure(journal.load_records_page)
+    last_key = journal.load_records_page(limit=ROWS // 2)[-1]
+    middle_page = measure(lambda: journal.load_records_page((last_key[1], last_key[0])))
+    print(f"  весь список:               {full:8.2f} мс")
+    print(f"  первая страница:           {first_page:8.2f} мс")
+    print(f"  страница в середине:       {middle_page:8.2f} мс")
+
+
+def bench_aggregates():
+    """Фильтр по периоду и сводка по индексам"""
+    print(f"\n⏱  Период и сводка ({ROWS} записей)")
+    period = measure(lambda: journal.load_records_page(date_from="2010-01-01", date_to="2010-12-31"))
+    print(f"  первая страница за год:    {period:8.2f} мс")
+    for group_by in journal.AGGREGATE_GROUPS:
+        elapsed = measure(lambda: journal.aggregate_records(group_by))
+        print(f"  сводка {group_by:19} {elapsed:8.2f} мс")
+
+
+def legacy_export(filename):
+    """Экспорт с загрузкой всех записей через fetchall()"""
+    doc = Document()
+    doc.add_heading("Личные учебные достижения", 0)
+    for i, (date, name, typ, level, desc) in enumerate(journal.load_records_with_desc(), 1):
+        p = doc.add_paragraph()
+        p.add_run(f"{i}. ").bold = True
+        p.add_run(name).bold = True
+        p.add_run(f" — {date}").italic = True
+        p.add_run(f" ({typ}, {level})")
+        if desc:
+            desc_para = doc.add_paragraph()
+            desc_para.add_run("Описание: ").italic = True
+            desc_para.add_run(desc)
+        doc.add_paragraph()
+    doc.save(filename)
+
+
+def run_export(variant, directory):
+    """Один экспорт в отдельном процессе, чтобы пики памяти не смешивались"""
+    os.chdir(directory)
+    export = legacy_export if variant == "legacy" else journal.build_word_report
+    try:
+        import resource
+    except ImportError:
+        # Без resource (Windows) учитываются только Python-объекты, узлы lxml не видны
+        resource = None
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    export(f"{variant}.docx")
+    elapsed = time.perf_counter() - started
+
+    if resource:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    else:
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    return elapsed, peak
+
+
+def bench_export():
+    """Экспорт в Word: fetchall() против порционного чтения"""
+    print(f"\n⏱  Экспорт в Word ({EXPORT_ROWS} записей)")
+    directory = os.path.abspath("export")
+    os.mkdir(directory)
+    os.chdir(directory)
+    try:
+        fill_database(EXPORT_ROWS)
+        journal.close_db()
+    finally:
+        os.chdir("..")
+
+    context = multiprocessing.get_context("spawn")
+    for label, variant in (("fetchall:", "legacy"), ("порциями:", "chunked")):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            elapsed, peak = executor.submit(run_export, variant, directory).result()
+        print(f"  {label:10} {elapsed:7.2f} с, пик памяти {peak:7.1f} МБ")
+
+
+def bench_search():
+    """Полнотекстовый поиск на большой базе"""
+    words = ["математика", "физика", "программирование", "победитель", "призер", "участник",
+             "диплом", "курс", "исследование", "конкурс", "олимпиада", "сертификат"]
+    project, local = journal.lookup_id("типы", "Проект"), journal.lookup_id("уровни", "Локальный")
+    conn = sqlite3.connect(journal.DB_NAME)
+    conn.executemany(
+        "INSERT INTO достижения (название, дата, тип_id, уровень_id, описание) VALUES (?, ?, ?, ?, ?)",
+        ((f"{words[i % len(words)]} {words[i // len(words) % len(words)]} тема{i % 5000}",
+          f"{2000 + i % 25:04d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+          project, local,
+          f"{words[i * 3 % len(words)]} {words[i * 5 % len(words)]}") for i in range(SEARCH_ROWS - ROWS)))
+    conn.commit()
+    conn.close()
+
+    print(f"\n⏱  Полнотекстовый поиск ({SEARCH_ROWS} записей)")
+    # Последний запрос совпадает с каждой двенадцатой записью: ранжируются все совпадения
+    for query in ("тема1234", "программ тема77", "несуществующее", "диплом"):
+        elapsed = measure(lambda: journal.search_records(query))
+        print(f"  {query!r:32} {elapsed:8.2f} мс, найдено {len(journal.search_records(query))}")
+
+
+def legacy_delete(selected_index):
+    """Удаление по позиции в списке через OFFSET"""
+    conn = sqlite3.connect(journal.DB_NAME)
+    record_id = conn.execute("SELECT id FROM достижения ORDER BY дата DESC LIMIT 1 OFFSET ?",
+                             (selected_index,)).fetchone()
+    if record_id:
+        conn.execute("DELETE FROM достижения WHERE id = ?", (record_id[0],))
+        conn.commit()
+    conn.close()
+
+
+def bench_delete():
+    """Удаление по позиции против удаления по ID"""
+    print(f"\n⏱  Удаление записи ({ROWS} записей)")
+
+    def load_ids():
+        return [row[0] for row in journal.load_records_with_id()]
+
+    for label in ("начало", "середина", "конец"):
+        count = len(load_ids())
+        selected_index = {"начало": 1, "середина": count // 2, "конец": count - REPEATS - 1}[label]
+        by_offset = measure(lambda: legacy_delete(selected_index))
+
+        # OFFSET удалил часть записей - список перечитывается, чтобы по ID удалялись существующие
+        ids = load_ids()
+        deleted = []
+        by_id = measure(lambda: deleted.append(journal.delete_record(ids.pop())))
+        assert all(deleted), "Удаление по ID не нашло запись"
+        print(f"  {label:10} OFFSET: {by_offset:8.2f} мс   по ID: {by_id:6.2f} мс")
+
+    selection = load_ids()[:REPEATS * 50]
+    started = time.perf_counter()
+    deleted = journal.delete_records(selection)
+    elapsed = (time.perf_counter() - started) * 1000
+    assert deleted == len(selection), "Пакет содержит уже удаленные записи"
+    print(f"  пакет из {len(selection)} записей одной транзакцией: {elapsed:.2f} мс")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            fill_database(ROWS)
+            bench_save_and_refresh()
+            bench_first_page()
+            bench_delete()
+            bench_aggregates()
+            bench_export()
+            bench_search()
+        finally:
+            journal.close_db()
+            os.chdir(original_dir)
@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+
+# Командная строка не загружает tkinter: используются только функции journal.py
+import journal
+
+
+def print_rows(rows):
+    """Вывод записей списка через табуляцию"""
+    for record_id, date, name, typ, level in rows:
+        print(f"{record_id}\t{date}\t{name}\t{typ}\t{level}")
+
+
+def cmd_list(args):
+    """Вывод записей постранично, без загрузки всей таблицы"""
+    after_key = None
+    left = args.limit
+    while left is None or left > 0:
+        page_size = journal.PAGE_SIZE if left is None else min(left, journal.PAGE_SIZE)
+        rows = journal.load_records_page(after_key, page_size, args.date_from, args.date_to)
+        print_rows(rows)
+        if len(rows) < page_size:
+            break
+        after_key = (rows[-1][1], rows[-1][0])
+        if left is not None:
+            left -= len(rows)
+    return 0
+
+
+def cmd_add(args):
+    """Добавление записи с той же проверкой даты, что и в форме"""
+    if not args.name.strip():
+        print("❌ Не указано название", file=sys.stderr)
+        return 1
+    if not journal.is_valid_date(args.date):
+        print("❌ Дата должна быть в формате ГГГГ-ММ-ДД", file=sys.stderr)
+        return 1
+    row = journal.save_to_db(args.name.strip(), args.date, args.type, args.level, args.desc.strip())
+    print_rows([row])
+    return 0
+
+
+def cmd_delete(args):
+    """Удаление записей по ID"""
+    deleted = journal.delete_records(args.ids)
+    print(f"Удалено записей: {deleted}")
+    return 0 if deleted == len(set(args.ids)) else 1
+
+
+def cmd_search(args):
+    """Полнотекстовый поиск"""
+    print_rows(journal.search_records(args.text, args.limit, args.date_from, args.date_to))
+    return 0
+
+
+def cmd_export_docx(args):
+    """Экспорт в Word"""
+    filename = args.output or f"достижения_{journal.get_current_date()}.docx"
+    journal.build_word_report(filename, os.path.abspath(journal.DB_NAME))
+    print(filename)
+    return 0
+
+
+def cmd_stats(args):
+    """Сводка по месяцам, годам, типам или уровням"""
+    for group, count in journal.aggregate_records(args.by, args.date_from, args.date_to):
+        print(f"{group}\t{count}")
+    return 0
+
+
+def cmd_import(args):
+    """Импорт файлов"""
+    failed = False
+    for path in args.files:
+        print(f"📥 {path}")
+        try:
+            result = journal.import_records(path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Ошибка импорта: {e}")
+            failed = True
+            continue
+        print(journal.format_import_report(result, max_rejected=len(result["rejected"])))
+    return 1 if failed else 0
+
+
+def date_argument(value):
+    """Дата периода: строки сравниваются в запросах, поэтому формат проверяется заранее"""
+    if not journal.is_valid_date(value):
+        raise argparse.ArgumentTypeError(f"дата должна быть в формате ГГГГ-ММ-ДД: {value}")
+    return value
+
+
+def add_period_arguments(parser):
+    """Параметры периода дат"""
+    parser.add_argument("--from", dest="date_from", type=date_argument, help="начало периода ГГГГ-ММ-ДД")
+    parser.add_argument("--to", dest="date_to", type=date_argument, help="окончание периода ГГГГ-ММ-ДД")
+
+
+def build_parser():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Журнал личных учебных достижений без графического интерфейса")
+    parser.add_argument("--db", default=journal.DB_NAME, help="файл базы данных")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="список записей, новые сверху")
+    list_parser.add_argument("--limit", type=int, help="максимальное количество записей")
+    add_period_arguments(list_parser)
+    list_parser.set_defaults(handler=cmd_list)
+
+    add_parser = commands.add_parser("add", help="добавить запись")
+    add_parser.add_argument("name", help="название")
+    add_parser.add_argument("date", help="дата ГГГГ-ММ-ДД")
+    add_parser.add_argument("type", help="тип")
+    add_parser.add_argument("level", choices=journal.LEVELS, help="уровень")
+    add_parser.add_argument("--desc", default="", help="описание")
+    add_parser.set_defaults(handler=cmd_add)
+
+    delete_parser = commands.add_parser("delete", help="удалить записи по ID")
+    delete_parser.add_argument("ids", type=int, nargs="+", help="ID записей")
+    delete_parser.set_defaults(handler=cmd_delete)
+
+    search_parser = commands.add_parser("search", help="полнотекстовый поиск")
+    search_parser.add_argument("text", help="строка поиска")
+    search_parser.add_argument("--limit", type=int, default=journal.PAGE_SIZE,
+                               help="максимальное количество записей")
+    add_period_arguments(search_parser)
+    search_parser.set_defaults(handler=cmd_search)
+
+    export_parser = commands.add_parser("export-docx", help="экспорт в Word")
+    export_parser.add_argument("--output", help="имя файла отчета")
+    export_parser.set_defaults(handler=cmd_export_docx)
+
+    stats_parser = commands.add_parser("stats", help="сводка по периодам, типам или уровням")
+    stats_parser.add_argument("--by", choices=list(journal.AGGREGATE_GROUPS), default="month",
+                              help="группировка")
+    add_period_arguments(stats_parser)
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    import_parser = commands.add_parser("import", help="импорт из CSV, JSON Lines или JSON")
+    import_parser.add_argument("files", nargs="+", help="файлы для импорта")
+    import_parser.set_defaults(handler=cmd_import)
+
+    return parser
+
+
+def run_cli(argv=None):
+    """Выполнение команды, возвращает код завершения"""
+    args = build_parser().parse_args(argv)
+    default_db = journal.DB_NAME
+    journal.DB_NAME = args.db
+    try:
+        journal.init_db()
+        return args.handler(args)
+    finally:
+        journal.close_db()
+        journal.DB_NAME = default_db
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli())
@@ -0,0 +1,621 @@
+import sqlite3
+import os
+import sys
+import csv
+import time
+import json
+
+# ========== ФУНКЦИИ БАЗЫ ДАННЫХ ==========
+
+DB_NAME = "достижения.db"
+
+
+class AchievementsRepository:
+    """Долгоживущее подключение к базе достижений"""
+
+    # Размер кэша подготовленных запросов sqlite3
+    STATEMENT_CACHE_SIZE = 128
+
+    def __init__(self, path):
+        self.path = path
+        # Кэш ID справочников: {таблица: {название: id}}
+        self.lookup_ids = {}
+        self.conn = sqlite3.connect(path, cached_statements=self.STATEMENT_CACHE_SIZE)
+        # WAL позволяет читать во время записи, NORMAL не делает fsync на каждый commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def execute(self, query, params=()):
+        """Выполнение запроса с немедленной фиксацией"""
+        with self.conn:
+            return self.conn.execute(query, params)
+
+    def fetchall(self, query, params=()):
+        """Выполнение запроса на чтение"""
+        return self.conn.execute(query, params).fetchall()
+
+    def fetchone(self, query, params=()):
+        """Чтение одной строки"""
+        return self.conn.execute(query, params).fetchone()
+
+    def iterate(self, query, params=(), chunk_size=500):
+        """Чтение результата запроса порциями без загрузки всех строк в память"""
+        cur = self.conn.execute(query, params)
+        try:
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cur.close()
+
+    def close(self):
+        """Закрытие подключения"""
+        self.conn.close()
+
+
+_repository = None
+
+
+def get_repository():
+    """Получение общего подключения к базе данных текущего каталога"""
+    global _repository
+    path = os.path.abspath(DB_NAME)
+    if _repository is None or _repository.path != path or not os.path.exists(path):
+        close_db()
+        _repository = AchievementsRepository(path)
+    return _repository
+
+
+def close_db():
+    """Закрытие общего подключения к базе данных"""
+    global _repository
+    if _repository is not None:
+        _repository.close()
+        _repository = None
+
+
+# Уровни достижений в порядке возрастания
+LEVELS = ["Локальный", "Региональный", "Национальный", "Международный"]
+
+# Таблица достижений: тип и уровень хранятся как ссылки на справочники
+ACHIEVEMENTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name}(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        название TEXT NOT NULL,
+        дата TEXT NOT NULL,
+        тип_id INTEGER NOT NULL REFERENCES типы(id),
+        уровень_id INTEGER NOT NULL REFERENCES уровни(id),
+        описание TEXT
+    )
+"""
+
+# Справочники типов и уровней
+LOOKUP_TABLES = ("типы", "уровни")
+
+
+def init_db():
+    """Инициализация базы данных"""
+    repo = get_repository()
+    for table in LOOKUP_TABLES:
+        repo.execute(f"CREATE TABLE IF NOT EXISTS {table}("
+                     "id INTEGER PRIMARY KEY, название TEXT NOT NULL UNIQUE)")
+    repo.execute(ACHIEVEMENTS_TABLE.format(name="достижения"))
+    migrate_db()
+    seed_lookups()
+    init_search_index()
+    # Индекс по дате (id входит в него неявно) для сортировки и постраничной загрузки
+    repo.execute("CREATE INDEX IF NOT EXISTS idx_достижения_дата ON достижения(дата)")
+    with repo.conn:
+        for statement in DATE_TRIGGERS + AGGREGATE_INDEXES:
+            repo.conn.execute(statement)
+
+
+# Триггеры, не пропускающие в базу несуществующие даты (date(julianday())
+# нормализует 2024-02-30 в 2024-03-01, поэтому такая дата тоже отклоняется)
+DATE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS достижения_дата_bi BEFORE INSERT ON достижения
+    WHEN date(julianday(new.дата)) IS NOT new.дата BEGIN
+        SELECT RAISE(ABORT, 'дата должна быть в формате ГГГГ-ММ-ДД');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS достижения_дата_bu BEFORE UPDATE OF дата ON достижения
+    WHEN date(julianday(new.дата)) IS NOT new.дата BEGIN
+        SELECT RAISE(ABORT, 'дата должна быть в формате ГГГГ-ММ-ДД');
+    END
+    """,
+)
+
+# Индексы для фильтра по периоду и группировки по месяцам, годам, типам и уровням
+AGGREGATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_достижения_месяц ON достижения(substr(дата, 1, 7))",
+    "CREATE INDEX IF NOT EXISTS idx_достижения_год ON достижения(substr(дата, 1, 4))",
+    "CREATE INDEX IF NOT EXISTS idx_достижения_тип ON достижения(тип_id)",
+    "CREATE INDEX IF NOT EXISTS idx_достижения_уровень ON достижения(уровень_id)",
+)
+
+# Версия схемы базы, хранится в PRAGMA user_version
+SCHEMA_VERSION = 2
+
+
+def migrate_db():
+    """Обновление схемы базы данных до текущей версии"""
+    repo = get_repository()
+    version = repo.fetchone("PRAGMA user_version")[0]
+    if version < 1:
+        # Даты хранятся как ISO-строки ГГГГ-ММ-ДД: такие строки сортируются
+        # и сравниваются как даты, поэтому индекс по дате работает и для периодов
+        repo.execute(
+            "UPDATE достижения SET дата = date(дата) "
+            "WHERE date(дата) IS NOT NULL AND date(дата) != дата")
+    if version < 2:
+        columns = [row[1] for row in repo.fetchall("PRAGMA table_info(достижения)")]
+        if "тип" in columns:
+            migrate_lookups(repo)
+    if version < SCHEMA_VERSION:
+        repo.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def migrate_lookups(repo):
+    """Перенос текстовых типов и уровней в справочники с пересозданием таблицы"""
+    conn = repo.conn
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute("INSERT OR IGNORE INTO типы (название) SELECT DISTINCT тип FROM достижения")
+        conn.execute("INSERT OR IGNORE INTO уровни (название) SELECT DISTINCT уровень FROM достижения")
+        conn.execute(ACHIEVEMENTS_TABLE.format(name="достижения_новая"))
+        # id сохраняются, поэтому полнотекстовый индекс остается верным
+        conn.execute("""
+        INSERT INTO достижения_новая (id, название, дата, тип_id, уровень_id, описание)
+        SELECT д.id, д.название, д.дата, т.id, у.id, д.описание
+        FROM достижения д
+        JOIN типы т ON т.название = д.тип
+        JOIN уровни у ON у.название = д.уровень
+        """)
+        # Вместе со старой таблицей удаляются ее индексы и триггеры, init_db создает их заново
+        conn.execute("DROP TABLE достижения")
+        conn.execute("ALTER TABLE достижения_новая RENAME TO достижения")
+
+
+def seed_lookups():
+    """Заполнение справочников типами из types.json и уровнями"""
+    with get_repository().conn as conn:
+        conn.executemany("INSERT OR IGNORE INTO типы (название) VALUES (?)",
+                         [(typ,) for typ in load_types()])
+        conn.executemany("INSERT OR IGNORE INTO уровни (название) VALUES (?)",
+                         [(level,) for level in LEVELS])
+
+
+def lookup_id(table, name, repo=None):
+    """ID значения справочника, новое значение добавляется в справочник"""
+    repo = repo or get_repository()
+    cache = repo.lookup_ids.setdefault(table, {})
+    if name not in cache:
+        row = repo.fetchone(f"SELECT id FROM {table} WHERE название = ?", (name,))
+        if row is None:
+            row = (repo.execute(f"INSERT INTO {table} (название) VALUES (?)", (name,)).lastrowid,)
+        cache[name] = row[0]
+    return cache[name]
+
+
+# Триггеры, поддерживающие полнотекстовый индекс в актуальном состоянии
+SEARCH_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS достижения_поиск_ai AFTER INSERT ON достижения BEGIN
+        INSERT INTO достижения_поиск(rowid, название, описание)
+        VALUES (new.id, new.название, new.описание);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS достижения_поиск_ad AFTER DELETE ON достижения BEGIN
+        INSERT INTO достижения_поиск(достижения_поиск, rowid, название, описание)
+        VALUES ('delete', old.id, old.название, old.описание);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS достижения_поиск_au AFTER UPDATE ON достижения BEGIN
+        INSERT INTO достижения_поиск(достижения_поиск, rowid, название, описание)
+        VALUES ('delete', old.id, old.название, old.описание);
+        INSERT INTO достижения_поиск(rowid, название, описание)
+        VALUES (new.id, new.название, new.описание);
+    END
+    """,
+)
+
+
+def init_search_index():
+    """Создание полнотекстового индекса FTS5 по названию и описанию"""
+    repo = get_repository()
+    exists = repo.fetchone(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'достижения_поиск'")
+    with repo.conn:
+        # Индекс хранит только токены, сами тексты берутся из таблицы достижения
+        repo.conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS достижения_поиск USING fts5(
+            название, описание, content='достижения', content_rowid='id'
+        )
+        """)
+        for trigger in SEARCH_TRIGGERS:
+            repo.conn.execute(trigger)
+        if not exists:
+            # Индексируем записи, сохранённые до появления поиска
+            repo.conn.execute("INSERT INTO достижения_поиск(достижения_поиск) VALUES ('rebuild')")
+
+
+def save_to_db(name, date, typ, level, desc):
+    """Сохранение записи в базу данных, возвращает строку списка (id, дата, название, тип, уровень)"""
+    cur = get_repository().execute(
+        "INSERT INTO достижения (название, дата, тип_id, уровень_id, описание) VALUES (?, ?, ?, ?, ?)",
+        (name, date, lookup_id("типы", typ), lookup_id("уровни", level), desc))
+    return cur.lastrowid, date, name, typ, level
+
+
+# Записи вместе с названиями типа и уровня из справочников
+RECORDS_FROM = ("FROM достижения д "
+                "JOIN типы т ON т.id = д.тип_id "
+                "JOIN уровни у ON у.id = д.уровень_id ")
+
+
+def load_records():
+    """Загрузка записей из базы данных"""
+    return get_repository().fetchall(
+        "SELECT д.дата, д.название, т.название, у.название "
+        f"{RECORDS_FROM}ORDER BY д.дата DESC, д.id DESC")
+
+
+def load_records_with_desc():
+    """Загрузка записей с описанием"""
+    return get_repository().fetchall(
+        "SELECT д.дата, д.название, т.название, у.название, д.описание "
+        f"{RECORDS_FROM}ORDER BY д.дата DESC, д.id DESC")
+
+
+def count_records(repo=None):
+    """Количество записей в базе"""
+    return (repo or get_repository()).fetchone("SELECT COUNT(*) FROM достижения")[0]
+
+
+# Количество записей, читаемых из базы за один раз при экспорте
+EXPORT_CHUNK_SIZE = 500
+
+
+def iter_records_with_desc(repo=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Порционная загрузка записей с описанием"""
+    return (repo or get_repository()).iterate(
+        "SELECT д.дата, д.название, т.название, у.название, д.описание "
+        f"{RECORDS_FROM}ORDER BY д.дата DESC, д.id DESC",
+        chunk_size=chunk_size)
+
+
+def load_records_with_id():
+    """Загрузка записей вместе с первичным ключом"""
+    return get_repository().fetchall(
+        "SELECT д.id, д.дата, д.название, т.название, у.название "
+        f"{RECORDS_FROM}ORDER BY д.дата DESC, д.id DESC")
+
+
+# Количество записей, подгружаемых в список за один раз
+PAGE_SIZE = 100
+
+
+def date_range_condition(date_from=None, date_to=None, column="д.дата"):
+    """Условие WHERE для периода дат (границы включаются) и его параметры"""
+    conditions, params = [], []
+    if date_from:
+        conditions.append(f"{column} >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append(f"{column} <= ?")
+        params.append(date_to)
+    return conditions, params
+
+
+def load_records_page(after_key=None, limit=PAGE_SIZE, date_from=None, date_to=None):
+    """Загрузка страницы записей, следующих за ключом (дата, id), в пределах периода"""
+    conditions, params = date_range_condition(date_from, date_to)
+    if after_key is not None:
+        conditions.append("(д.дата, д.id) < (?, ?)")
+        params.extend(after_key)
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    return get_repository().fetchall(
+        "SELECT д.id, д.дата, д.название, т.название, у.название "
+        f"{RECORDS_FROM}{where}ORDER BY д.дата DESC, д.id DESC LIMIT ?", (*params, limit))
+
+
+# Группировки сводки: подпись группы, выражение GROUP BY (по каждому есть индекс),
+# нужное для подписи соединение со справочником и порядок групп
+AGGREGATE_GROUPS = {
+    "month": ("substr(д.дата, 1, 7)", "substr(д.дата, 1, 7)", "", "1 DESC"),
+    "year": ("substr(д.дата, 1, 4)", "substr(д.дата, 1, 4)", "", "1 DESC"),
+    "type": ("т.название", "д.тип_id", "JOIN типы т ON т.id = д.тип_id ", "2 DESC, 1"),
+    "level": ("у.название", "д.уровень_id", "JOIN уровни у ON у.id = д.уровень_id ", "2 DESC, 1"),
+}
+
+
+def aggregate_records(group_by, date_from=None, date_to=None):
+    """Количество записей по месяцам, годам, типам или уровням в пределах периода"""
+    if group_by not in AGGREGATE_GROUPS:
+        raise ValueError(f"Неизвестная группировка: {group_by}")
+    label, expression, join, order = AGGREGATE_GROUPS[group_by]
+    conditions, params = date_range_condition(date_from, date_to)
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    return get_repository().fetchall(
+        f"SELECT {label}, COUNT(*) FROM достижения д {join}{where}"
+        f"GROUP BY {expression} ORDER BY {order}", params)
+
+
+def build_search_query(text):
+    """Преобразование строки поиска в запрос FTS5 с поиском по началу слов"""
+    words = text.replace('"', " ").split()
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_records(text, limit=PAGE_SIZE, date_from=None, date_to=None):
+    """Полнотекстовый поиск записей, наиболее релевантные сверху"""
+    query = build_search_query(text)
+    if not query:
+        return []
+    conditions, params = date_range_condition(date_from, date_to)
+    where = "".join(f"AND {condition} " for condition in conditions)
+    # Совпадение в названии весит больше, чем в описании
+    return get_repository().fetchall(
+        "SELECT д.id, д.дата, д.название, т.название, у.название "
+        "FROM достижения_поиск п JOIN достижения д ON д.id = п.rowid "
+        "JOIN типы т ON т.id = д.тип_id JOIN уровни у ON у.id = д.уровень_id "
+        f"WHERE достижения_поиск MATCH ? {where}"
+        "ORDER BY bm25(достижения_поиск, 10.0, 1.0) LIMIT ?", (query, *params, limit))
+
+
+# Ограничение SQLite на число параметров в одном запросе
+DELETE_CHUNK_SIZE = 500
+
+
+def delete_records(ids):
+    """Удаление записей по списку ID одной транзакцией"""
+    ids = [int(record_id) for record_id in ids]
+    if not ids:
+        return 0
+    conn = get_repository().conn
+    deleted = 0
+    with conn:
+        for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+            chunk = ids[start:start + DELETE_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            cur = conn.execute(f"DELETE FROM достижения WHERE id IN ({placeholders})", chunk)
+            deleted += cur.rowcount
+    return deleted
+
+
+def delete_record(record_id):
+    """Удаление записи из базы данных по ID"""
+    return delete_records([record_id]) == 1
+
+
+# ========== ФУНКЦИИ ДЛЯ РАБОТЫ С ФАЙЛАМИ ==========
+
+# Прочитанные types.json: {путь: ((mtime, размер), типы)}
+_types_cache = {}
+
+
+def load_types():
+    """Загрузка типов достижений из JSON файла"""
+    try:
+        path = os.path.abspath("types.json")
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _types_cache.get(path)
+        # Файл перечитывается только после изменения
+        if cached and cached[0] == version:
+            return list(cached[1])
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            # Фильтруем пустые строки и приводим к правильному формату
+            types = [item.strip().title() for item in data if item and str(item).strip()]
+        _types_cache[path] = (version, types)
+        return list(types)
+    except Exception as e:
+        print(f"Ошибка загрузки types.json: {e}", file=sys.stderr)
+        return ["Олимпиада", "Сертификат", "Проект", "Экзамен", "Конференция"]
+
+
+def is_valid_date(date):
+    """Проверка, что строка - существующая дата в формате ГГГГ-ММ-ДД"""
+    from datetime import datetime
+    if len(date) != 10 or date[4] != '-' or date[7] != '-':
+        return False
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+def read_import_file(path):
+    """Построчное чтение записей из CSV, JSON Lines или JSON файла"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        elif ext == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif ext == ".json":
+            # Стандартный json не умеет читать массив по частям
+            yield from json.load(f)
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {ext}")
+
+
+def validate_import_record(record):
+    """Проверка импортируемой записи, возвращает кортеж для вставки и причину отказа"""
+    if not isinstance(record, dict):
+        return None, "запись не является объектом"
+    name = str(record.get("название") or "").strip()
+    date = str(record.get("дата") or "").strip()
+    typ = str(record.get("тип") or "").strip()
+    level = str(record.get("уровень") or "").strip()
+    desc = str(record.get("описание") or "").strip()
+
+    if not name:
+        return None, "не указано название"
+    if not date:
+        return None, "не указана дата"
+    if not is_valid_date(date):
+        return None, f"дата '{date}' не в формате ГГГГ-ММ-ДД"
+    if not typ:
+        return None, "не указан тип"
+    if not level:
+        return None, "не указан уровень"
+    return (name, date, typ, level, desc), None
+
+
+# Количество записей в одной транзакции при импорте
+IMPORT_BATCH_SIZE = 1000
+
+
+def import_records(path, batch_size=IMPORT_BATCH_SIZE):
+    """Массовый импорт записей из файла пакетными транзакциями"""
+    conn = get_repository().conn
+    imported = 0
+    rejected = []
+    batch = []
+    started = time.perf_counter()
+
+    def flush():
+        with conn:
+            conn.executemany(
+                "INSERT INTO достижения (название, дата, тип_id, уровень_id, описание) VALUES (?, ?, ?, ?, ?)",
+                batch)
+        batch.clear()
+
+    for number, record in enumerate(read_import_file(path), 1):
+        row, reason = validate_import_record(record)
+        if reason:
+            rejected.append((number, reason))
+            continue
+        name, date, typ, level, desc = row
+        batch.append((name, date, lookup_id("типы", typ), lookup_id("уровни", level), desc))
+        if len(batch) >= batch_size:
+            imported += len(batch)
+            flush()
+    if batch:
+        imported += len(batch)
+        flush()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "imported": imported,
+        "rejected": rejected,
+        "seconds": elapsed,
+        "rows_per_second": imported / elapsed if elapsed else 0.0,
+    }
+
+
+def format_import_report(result, max_rejected=10):
+    """Текстовый отчет об импорте"""
+    lines = [f"Импортировано записей: {result['imported']} "
+             f"({result['rows_per_second']:.0f} записей/с)",
+             f"Отклонено записей: {len(result['rejected'])}"]
+    for number, reason in result["rejected"][:max_rejected]:
+        lines.append(f"  запись {number}: {reason}")
+    if len(result["rejected"]) > max_rejected:
+        lines.append(f"  ... и еще {len(result['rejected']) - max_rejected}")
+    return "\n".join(lines)
+
+
+# ========== ОТЧЕТ WORD ==========
+
+def get_current_date():
+    """Получение текущей даты в формате ГГГГ-ММ-ДД"""
+    from datetime import datetime
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def make_paragraph_appender(doc):
+    """Функция добавления абзацев в конец документа за постоянное время
+
+    doc.add_paragraph() при каждом вызове ищет sectPr среди всех элементов
+    тела документа, поэтому экспорт большого журнала становится квадратичным.
+    """
+    from docx.oxml import OxmlElement
+    from docx.text.paragraph import Paragraph
+
+    body = doc.element.body
+    sect_pr = body.sectPr
+
+    def add_paragraph():
+        p = OxmlElement("w:p")
+        if sect_pr is not None:
+            sect_pr.addprevious(p)
+        else:
+            body.append(p)
+        return Paragraph(p, doc)
+
+    return add_paragraph
+
+
+def build_word_report(filename, db_path=None, progress=None, cancel_event=None):
+    """Формирование Word отчета с порционным чтением записей
+
+    progress(сделано, всего) вызывается после каждой порции записей,
+    установленный cancel_event прерывает формирование. Возвращает имя
+    файла или None, если экспорт отменен.
+    """
+    # python-docx загружается только при экспорте
+    from docx import Document
+
+    # Отдельное подключение: функция выполняется в фоновом потоке
+    repo = AchievementsRepository(db_path or os.path.abspath(DB_NAME))
+    try:
+        doc = Document()
+
+        # Заголовок
+        title = doc.add_heading("Личные учебные достижения", 0)
+        title.alignment = 1  # Центрирование
+
+        # Подзаголовок
+        doc.add_paragraph(f"Отчет сформирован: {get_current_date()}")
+        doc.add_paragraph()
+
+        # Данные
+        total = count_records(repo)
+        done = 0
+
+        if not total:
+            doc.add_paragraph("Нет сохраненных достижений.")
+
+        add_paragraph = make_paragraph_appender(doc)
+
+        for chunk in iter_records_with_desc(repo):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+
+            for date, name, typ, level, desc in chunk:
+                done += 1
+                # Добавляем номер и основную информацию
+                p = add_paragraph()
+                p.add_run(f"{done}. ").bold = True
+                p.add_run(name).bold = True
+                p.add_run(f" — {date}").italic = True
+                p.add_run(f" ({typ}, {level})")
+
+                # Добавляем описание, если есть
+                if desc:
+                    desc_para = add_paragraph()
+                    desc_para.add_run("Описание: ").italic = True
+                    desc_para.add_run(desc)
+
+                add_paragraph()  # Пустая строка между записями
+
+            if progress:
+                progress(done, total)
+
+        # Сохраняем документ
+        doc.save(filename)
+        return filename
+    finally:
+        repo.close()
@@ -1,89 +1,28 @@
-import sqlite3
 import os
+import sys
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-from docx import Document
-import json
-
-# ========== ФУНКЦИИ БАЗЫ ДАННЫХ ==========
-
-def init_db():
-    """Инициализация базы данных"""
-    conn = sqlite3.connect("достижения.db")
-    cur = conn.cursor()
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS достижения(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        название TEXT NOT NULL,
-        дата TEXT NOT NULL,
-        тип TEXT NOT NULL,
-        уровень TEXT NOT NULL,
-        описание TEXT
-    )
-    """)
-    conn.commit()
-    conn.close()
-
-
-def save_to_db(name, date, typ, level, desc):
-    """Сохранение записи в базу данных"""
-    conn = sqlite3.connect("достижения.db")
-    cur = conn.cursor()
-    cur.execute("INSERT INTO достижения (название, дата, тип, уровень, описание) VALUES (?, ?, ?, ?, ?)",
-                (name, date, typ, level, desc))
-    conn.commit()
-    conn.close()
-
-
-def load_records():
-    """Загрузка записей из базы данных"""
-    conn = sqlite3.connect("достижения.db")
-    cur = conn.cursor()
-    cur.execute("SELECT дата, название, тип, уровень FROM достижения ORDER BY дата DESC")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def load_records_with_desc():
-    """Загрузка записей с описанием"""
-    conn = sqlite3.connect("достижения.db")
-    cur = conn.cursor()
-    cur.execute("SELECT дата, название, тип, уровень, описание FROM достижения ORDER BY дата DESC")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def delete_record(selected_index):
-    """Удаление записи из базы данных"""
-    if selected_index:
-        conn = sqlite3.connect("достижения.db")
-        cur = conn.cursor()
-        # Получаем ID записи для удаления
-        cur.execute("SELECT id FROM достижения ORDER BY дата DESC LIMIT 1 OFFSET ?", (selected_index,))
-        record_id = cur.fetchone()
-        if record_id:
-            cur.execute("DELETE FROM достижения WHERE id = ?", (record_id[0],))
-            conn.commit()
-        conn.close()
-        return True
-    return False
-
-
-# ========== ФУНКЦИИ ДЛЯ РАБОТЫ С ФАЙЛАМИ ==========
-
-def load_types():
-    """Загрузка типов достижений из JSON файла"""
-    try:
-        with open("types.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # Фильтруем пустые строки и приводим к правильному формату
-            return [item.strip().title() for item in data if item and str(item).strip()]
-    except Exception as e:
-        print(f"Ошибка загрузки types.json: {e}")
-        return ["Олимпиада", "Сертификат", "Проект", "Экзамен", "Конференция"]
-
+from tkinter import ttk, messagebox, filedialog
+# Функции работы с данными не зависят от tkinter и используются также в cli.py
+from journal import (
+    DB_NAME,
+    LEVELS,
+    PAGE_SIZE,
+    aggregate_records,
+    build_word_report,
+    close_db,
+    delete_records,
+    format_import_report,
+    get_current_date,
+    import_records,
+    init_db,
+    is_valid_date,
+    load_records_page,
+    load_types,
+    save_to_db,
+    search_records,
+)
 
 # ========== ФУНКЦИИ ГРАФИЧЕСКОГО ИНТЕРФЕЙСА ==========
 
@@ -125,10 +64,10 @@ def create_add_form(parent):
     tk.Label(main_frame, text="Уровень:", font=("Arial", 10, "bold"),
              bg="#f0f0f0", anchor="w").pack(fill="x", padx=5, pady=(0, 5))
     level_combo = ttk.Combobox(main_frame,
-                               values=["Локальный", "Региональный", "Национальный", "Международный"],
+                               values=LEVELS,
                                state="readonly", font=("Arial", 10), width=58)
     level_combo.pack(padx=5, pady=(0, 15))
-    level_combo.set("Локальный")
+    level_combo.set(LEVELS[0])
 
     # Поле "Описание"
     tk.Label(main_frame, text="Описание:", font=("Arial", 10, "bold"),
@@ -170,13 +109,42 @@ def create_list_tab(parent):
              font=("Arial", 14, "bold"), bg="#2c3e50", fg="white",
              padx=10, pady=10).pack()
 
+    # Строка поиска
+    search_frame = tk.Frame(main_frame)
+    search_frame.pack(fill="x", pady=(0, 10))
+
+    tk.Label(search_frame, text="Поиск:", font=("Arial", 10, "bold")).pack(side="left", padx=(0, 5))
+    search_var = tk.StringVar()
+    search_entry = tk.Entry(search_frame, textvariable=search_var, font=("Arial", 10),
+                            relief="solid", bd=1)
+    search_entry.pack(side="left", fill="x", expand=True)
+
+    # Фильтр по периоду
+    period_frame = tk.Frame(main_frame)
+    period_frame.pack(fill="x", pady=(0, 10))
+
+    tk.Label(period_frame, text="Период с:", font=("Arial", 10, "bold")).pack(side="left", padx=(0, 5))
+    date_from_entry = tk.Entry(period_frame, width=12, font=("Arial", 10), relief="solid", bd=1)
+    date_from_entry.pack(side="left")
+    tk.Label(period_frame, text="по:", font=("Arial", 10, "bold")).pack(side="left", padx=5)
+    date_to_entry = tk.Entry(period_frame, width=12, font=("Arial", 10), relief="solid", bd=1)
+    date_to_entry.pack(side="left", padx=(0, 10))
+
+    apply_period_btn = tk.Button(period_frame, text="Применить", font=("Arial", 9),
+                                 relief="raised", padx=8, cursor="hand2")
+    apply_period_btn.pack(side="left", padx=(0, 5))
+    reset_period_btn = tk.Button(period_frame, text="Сбросить", font=("Arial", 9),
+                                 relief="raised", padx=8, cursor="hand2")
+    reset_period_btn.pack(side="left")
+
     # Фрейм для списка с прокруткой
     list_frame = tk.Frame(main_frame)
     list_frame.pack(fill="both", expand=True, pady=(0, 15))
 
     # Создаем Treeview для отображения в табличном формате
     columns = ("Дата", "Название", "Тип", "Уровень")
-    tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=12)
+    tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=12,
+                        selectmode="extended")
 
     # Настройка колонок
     tree.heading("Дата", text="Дата", anchor="w")
@@ -189,9 +157,12 @@ def create_list_tab(parent):
     tree.column("Тип", width=120)
     tree.column("Уровень", width=120)
 
-    # Добавляем прокрутку
+    # Добавляем прокрутку, записи подгружаются по мере прокрутки
     scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
-    tree.configure(yscrollcommand=scrollbar.set)
+    records_view = PagedTreeview(tree, scrollbar)
+    search_var.trace_add("write", lambda *args: records_view.schedule_search(search_var.get()))
+    apply_period_btn.config(command=lambda: on_apply_period(date_from_entry, date_to_entry, records_view))
+    reset_period_btn.config(command=lambda: on_reset_period(date_from_entry, date_to_entry, records_view))
 
     tree.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
@@ -219,24 +190,228 @@ def create_list_tab(parent):
                            font=("Arial", 10, "bold"),
                            bg="#9b59b6", fg="white", relief="raised",
                            padx=15, pady=6, cursor="hand2")
-    export_btn.pack(side="left")
+    export_btn.pack(side="left", padx=(0, 10))
+
+    # Кнопка импорта
+    import_btn = tk.Button(button_frame, text="Импорт из файла",
+                           font=("Arial", 10, "bold"),
+                           bg="#16a085", fg="white", relief="raised",
+                           padx=15, pady=6, cursor="hand2")
+    import_btn.pack(side="left", padx=(0, 10))
+
+    # Кнопка сводки
+    stats_btn = tk.Button(button_frame, text="Сводка",
+                          font=("Arial", 10, "bold"),
+                          bg="#f39c12", fg="white", relief="raised",
+                          padx=15, pady=6, cursor="hand2")
+    stats_btn.pack(side="left")
+
+    return records_view, refresh_btn, delete_btn, export_btn, import_btn, stats_btn
+
+
+class PagedTreeview:
+    """Постраничная подгрузка записей в Treeview при прокрутке"""
+
+    # Доля списка до конца прокрутки, при которой подгружается следующая страница
+    PREFETCH_MARGIN = 0.2
+    # Задержка поиска после последнего нажатия клавиши, мс
+    SEARCH_DELAY = 300
+
+    def __init__(self, tree, scrollbar, page_size=PAGE_SIZE):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.page_size = page_size
+        # Ключи (дата, id) загруженных строк в порядке отображения (по убыванию)
+        self.keys = []
+        self.exhausted = False
+        self.loading = False
+        # Текущая строка поиска и отложенный запуск поиска
+        self.query = ""
+        self.pending_search = None
+        # Период дат, которым ограничен список (None - без границы)
+        self.date_from = None
+        self.date_to = None
+        tree.configure(yscrollcommand=self.on_scroll)
+
+    def reset(self):
+        """Очистка списка и загрузка первой страницы или результатов поиска"""
+        self.tree.delete(*self.tree.get_children())
+        self.keys = []
+        if self.query:
+            # Результаты поиска упорядочены по релевантности и не подгружаются
+            for record_id, *values in search_records(self.query, date_from=self.date_from,
+                                                     date_to=self.date_to):
+                self.tree.insert("", "end", iid=str(record_id), values=values)
+            self.exhausted = True
+        else:
+            self.exhausted = False
+            self.load_more()
+
+    def schedule_search(self, text):
+        """Поиск после паузы в наборе текста"""
+        if self.pending_search:
+            self.tree.after_cancel(self.pending_search)
+        self.pending_search = self.tree.after(self.SEARCH_DELAY, self.search, text)
+
+    def search(self, text):
+        """Показ результатов поиска, пустая строка возвращает полный список"""
+        self.pending_search = None
+        self.query = text.strip()
+        self.reset()
+
+    def set_date_range(self, date_from, date_to):
+        """Ограничение списка периодом дат"""
+        self.date_from = date_from or None
+        self.date_to = date_to or None
+        self.reset()
+
+    def in_date_range(self, date):
+        """Попадает ли дата в текущий период"""
+        return ((self.date_from is None or date >= self.date_from) and
+                (self.date_to is None or date <= self.date_to))
+
+    def load_more(self):
+        """Загрузка следующей страницы записей"""
+        if self.exhausted or self.loading:
+            return
+        self.loading = True
+        try:
+            last_key = self.keys[-1] if self.keys else None
+            rows = load_records_page(last_key, self.page_size, self.date_from, self.date_to)
+            # ID записи служит идентификатором строки
+            for record_id, *values in rows:
+                self.tree.insert("", "end", iid=str(record_id), values=values)
+                self.keys.append((values[0], record_id))
+            self.exhausted = len(rows) < self.page_size
+        finally:
+            self.loading = False
+
+    def key_position(self, key):
+        """Бинарный поиск позиции ключа в списке, отсортированном по убыванию"""
+        low, high = 0, len(self.keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self.keys[middle] > key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def insert_record(self, row):
+        """Вставка сохранённой записи на её место в списке"""
+        if self.query:
+            # Место записи среди результатов поиска определяет ранжирование
+            self.reset()
+            return
+        record_id, *values = row
+        if not self.in_date_range(values[0]):
+            return
+        key = (values[0], record_id)
+        position = self.key_position(key)
+        # Запись старше всех загруженных появится вместе со следующей страницей
+        if position == len(self.keys) and not self.exhausted:
+            return
+        self.keys.insert(position, key)
+        self.tree.insert("", position, iid=str(record_id), values=values)
+
+    def remove_records(self, item_ids):
+        """Удаление строк из списка без перезагрузки"""
+        for item_id in item_ids:
+            key = (self.tree.set(item_id, "Дата"), int(item_id))
+            position = self.key_position(key)
+            if position < len(self.keys) and self.keys[position] == key:
+                del self.keys[position]
+            self.tree.delete(item_id)
+
+    def on_scroll(self, first, last):
+        """Подгрузка страницы при приближении к концу списка"""
+        self.scrollbar.set(first, last)
+        if not self.exhausted and float(last) >= 1 - self.PREFETCH_MARGIN:
+            self.tree.after_idle(self.prefetch)
+
+    def prefetch(self):
+        """Подгрузка страницы, если конец списка всё ещё близко"""
+        # Пока список не показан на экране, хватает первой страницы
+        if self.tree.winfo_ismapped() and self.tree.yview()[1] >= 1 - self.PREFETCH_MARGIN:
+            self.load_more()
+
+
+def on_apply_period(date_from_entry, date_to_entry, records_view):
+    """Обработчик фильтра по периоду"""
+    date_from = date_from_entry.get().strip()
+    date_to = date_to_entry.get().strip()
+
+    for date, entry in ((date_from, date_from_entry), (date_to, date_to_entry)):
+        if date and not is_valid_date(date):
+            messagebox.showwarning("Внимание", "Дата должна быть в формате ГГГГ-ММ-ДД")
+            entry.focus_set()
+            return
+
+    if date_from and date_to and date_from > date_to:
+        messagebox.showwarning("Внимание", "Начало периода позже его окончания")
+        date_from_entry.focus_set()
+        return
 
-    return tree, refresh_btn, delete_btn, export_btn
+    records_view.set_date_range(date_from, date_to)
 
 
-def refresh_treeview(tree):
-    """Обновление Treeview данными из БД"""
-    # Очищаем текущие записи
-    for item in tree.get_children():
-        tree.delete(item)
+def on_reset_period(date_from_entry, date_to_entry, records_view):
+    """Обработчик сброса фильтра по периоду"""
+    date_from_entry.delete(0, tk.END)
+    date_to_entry.delete(0, tk.END)
+    records_view.set_date_range(None, None)
+
+
+# Подписи группировок сводки
+AGGREGATE_TITLES = {
+    "month": "По месяцам",
+    "year": "По годам",
+    "type": "По типам",
+    "level": "По уровням",
+}
+
+
+def show_statistics(root, records_view):
+    """Окно сводки по месяцам, годам и типам за выбранный период"""
+    dialog = tk.Toplevel(root)
+    dialog.title("Сводка достижений")
+    dialog.geometry("360x400")
+    dialog.transient(root)
+
+    if records_view.date_from or records_view.date_to:
+        period = f"Период: {records_view.date_from or '...'} — {records_view.date_to or '...'}"
+    else:
+        period = "Период: все записи"
+    tk.Label(dialog, text=period, font=("Arial", 10)).pack(pady=(10, 5))
+
+    group_combo = ttk.Combobox(dialog, values=list(AGGREGATE_TITLES.values()), state="readonly",
+                               font=("Arial", 10))
+    group_combo.pack(padx=10, pady=5, fill="x")
+
+    tree = ttk.Treeview(dialog, columns=("Группа", "Количество"), show="headings")
+    tree.heading("Группа", text="Группа", anchor="w")
+    tree.heading("Количество", text="Количество", anchor="w")
+    tree.column("Группа", width=200)
+    tree.column("Количество", width=100)
+    tree.pack(padx=10, pady=(5, 10), fill="both", expand=True)
+
+    def refresh(*args):
+        group_by = list(AGGREGATE_TITLES)[group_combo.current()]
+        tree.delete(*tree.get_children())
+        for group, count in aggregate_records(group_by, records_view.date_from, records_view.date_to):
+            tree.insert("", "end", values=(group, count))
+
+    group_combo.bind("<<ComboboxSelected>>", refresh)
+    group_combo.current(0)
+    refresh()
 
-    # Загружаем новые данные
-    records = load_records()
-    for record in records:
-        tree.insert("", "end", values=record)
+
+def refresh_treeview(records_view):
+    """Обновление Treeview данными из БД"""
+    records_view.reset()
 
 
-def on_save(name_entry, date_entry, type_combo, level_combo, desc_text, tree):
+def on_save(name_entry, date_entry, type_combo, level_combo, desc_text, records_view):
     """Обработчик сохранения записи"""
     name = name_entry.get().strip()
     date = date_entry.get().strip()
@@ -255,21 +430,21 @@ def on_save(name_entry, date_entry, type_combo, level_combo, desc_text, tree):
         return
 
     # Простая проверка формата даты
-    if len(date) != 10 or date[4] != '-' or date[7] != '-':
+    if not is_valid_date(date):
         messagebox.showwarning("Внимание", "Дата должна быть в формате ГГГГ-ММ-ДД")
         date_entry.focus_set()
         return
 
     try:
-        save_to_db(name, date, typ, level, desc)
+        row = save_to_db(name, date, typ, level, desc)
 
         # Очищаем поля формы
         name_entry.delete(0, tk.END)
         date_entry.delete(0, tk.END)
         desc_text.delete("1.0", tk.END)
 
-        # Обновляем список достижений
-        refresh_treeview(tree)
+        # Добавляем запись в список без полной перезагрузки
+        records_view.insert_record(row)
 
         messagebox.showinfo("Успех", f"Достижение '{name}' успешно сохранено!")
 
@@ -277,82 +452,108 @@ def on_save(name_entry, date_entry, type_combo, level_combo, desc_text, tree):
         messagebox.showerror("Ошибка", f"Не удалось сохранить данные: {e}")
 
 
-def on_delete(tree):
-    """Обработчик удаления записи"""
-    selected_item = tree.selection()
-    if not selected_item:
+def on_delete(records_view):
+    """Обработчик удаления записей"""
+    tree = records_view.tree
+    selected_items = tree.selection()
+    if not selected_items:
         messagebox.showwarning("Внимание", "Выберите запись для удаления")
         return
 
-    # Получаем данные выбранной записи
-    item_values = tree.item(selected_item[0], "values")
-
     # Подтверждение удаления
-    if messagebox.askyesno("Подтверждение",
-                           f"Вы уверены, что хотите удалить достижение:\n{item_values[1]}?"):
-
-        # Получаем индекс записи
-        all_items = tree.get_children()
-        selected_index = all_items.index(selected_item[0])
-
-        if delete_record(selected_index):
-            # Удаляем из Treeview
-            tree.delete(selected_item[0])
-            messagebox.showinfo("Успех", "Запись успешно удалена")
+    if len(selected_items) == 1:
+        question = f"Вы уверены, что хотите удалить достижение:\n{tree.item(selected_items[0], 'values')[1]}?"
+    else:
+        question = f"Вы уверены, что хотите удалить выбранные достижения ({len(selected_items)})?"
+
+    if messagebox.askyesno("Подтверждение", question):
+        # Идентификаторы строк Treeview совпадают с ID записей
+        deleted = delete_records(selected_items)
+        if deleted:
+            records_view.remove_records(selected_items)
+            messagebox.showinfo("Успех", f"Удалено записей: {deleted}")
         else:
             messagebox.showerror("Ошибка", "Не удалось удалить запись")
 
 
-def export_to_word():
-    """Экспорт данных в Word документ"""
-    try:
-        doc = Document()
-
-        # Заголовок
-        title = doc.add_heading("Личные учебные достижения", 0)
-        title.alignment = 1  # Центрирование
-
-        # Подзаголовок
-        doc.add_paragraph(f"Отчет сформирован: {get_current_date()}")
-        doc.add_paragraph()
-
-        # Данные
-        records = load_records_with_desc()
-
-        if not records:
-            doc.add_paragraph("Нет сохраненных достижений.")
-        else:
-            for i, (date, name, typ, level, desc) in enumerate(records, 1):
-                # Добавляем номер и основную информацию
-                p = doc.add_paragraph()
-                p.add_run(f"{i}. ").bold = True
-                p.add_run(name).bold = True
-                p.add_run(f" — {date}").italic = True
-                p.add_run(f" ({typ}, {level})")
-
-                # Добавляем описание, если есть
-                if desc:
-                    desc_para = doc.add_paragraph()
-                    desc_para.add_run("Описание: ").italic = True
-                    desc_para.add_run(desc)
-
-                doc.add_paragraph()  # Пустая строка между записями
-
-        # Сохраняем документ
-        filename = f"достижения_{get_current_date()}.docx"
-        doc.save(filename)
-
-        messagebox.showinfo("Экспорт завершен",
-                            f"Отчет успешно сохранен в файл:\n{filename}")
+def on_import(records_view):
+    """Обработчик импорта записей из файла"""
+    path = filedialog.askopenfilename(
+        title="Импорт достижений",
+        filetypes=[("CSV и JSON", "*.csv *.json *.jsonl"), ("Все файлы", "*.*")])
+    if not path:
+        return
 
+    try:
+        result = import_records(path)
     except Exception as e:
-        messagebox.showerror("Ошибка экспорта", f"Не удалось создать документ: {e}")
-
+        messagebox.showerror("Ошибка импорта", f"Не удалось импортировать файл: {e}")
+        return
 
-def get_current_date():
-    """Получение текущей даты в формате ГГГГ-ММ-ДД"""
-    from datetime import datetime
-    return datetime.now().strftime("%Y-%m-%d")
+    refresh_treeview(records_view)
+    messagebox.showinfo("Импорт завершен", format_import_report(result))
+
+
+def export_to_word(root):
+    """Экспорт данных в Word документ в фоновом потоке"""
+    filename = f"достижения_{get_current_date()}.docx"
+    db_path = os.path.abspath(DB_NAME)
+    events = queue.Queue()
+    cancel_event = threading.Event()
+
+    # Окно прогресса
+    dialog = tk.Toplevel(root)
+    dialog.title("Экспорт в Word")
+    dialog.geometry("400x140")
+    dialog.transient(root)
+    dialog.grab_set()
+
+    status_label = tk.Label(dialog, text="Подготовка...", font=("Arial", 10))
+    status_label.pack(pady=(15, 5))
+    progress_bar = ttk.Progressbar(dialog, maximum=1, length=360)
+    progress_bar.pack(padx=20, pady=5)
+    cancel_btn = tk.Button(dialog, text="Отмена", font=("Arial", 10),
+                           command=cancel_event.set)
+    cancel_btn.pack(pady=10)
+    dialog.protocol("WM_DELETE_WINDOW", cancel_event.set)
+
+    def worker():
+        # Окно обновляется только из главного потока, сюда передаются события
+        try:
+            result = build_word_report(filename, db_path,
+                                       progress=lambda done, total: events.put(("progress", done, total)),
+                                       cancel_event=cancel_event)
+            events.put(("done", result))
+        except Exception as e:
+            events.put(("error", e))
+
+    def poll():
+        try:
+            while True:
+                event = events.get_nowait()
+                if event[0] == "progress":
+                    _, done, total = event
+                    progress_bar.config(maximum=total, value=done)
+                    status_label.config(text=f"Обработано записей: {done} из {total}")
+                elif event[0] == "done":
+                    dialog.destroy()
+                    if event[1]:
+                        messagebox.showinfo("Экспорт завершен",
+                                            f"Отчет успешно сохранен в файл:\n{event[1]}")
+                    return
+                else:
+                    dialog.destroy()
+                    messagebox.showerror("Ошибка экспорта", f"Не удалось создать документ: {event[1]}")
+                    return
+        except queue.Empty:
+            pass
+        if cancel_event.is_set():
+            status_label.config(text="Отмена...")
+            cancel_btn.config(state="disabled")
+        dialog.after(100, poll)
+
+    threading.Thread(target=worker, daemon=True).start()
+    dialog.after(100, poll)
 
 
 # ========== ОСНОВНАЯ ЧАСТЬ ПРОГРАММЫ ==========
@@ -391,23 +592,31 @@ def main():
     name_entry, date_entry, type_combo, level_combo, desc_text, save_btn = create_add_form(tab_add)
 
     # Создаем список достижений
-    tree, refresh_btn, delete_btn, export_btn = create_list_tab(tab_list)
+    records_view, refresh_btn, delete_btn, export_btn, import_btn, stats_btn = create_list_tab(tab_list)
 
     # Привязываем обработчики событий
-    save_btn.config(command=lambda: on_save(name_entry, date_entry, type_combo, level_combo, desc_text, tree))
-    refresh_btn.config(command=lambda: refresh_treeview(tree))
-    delete_btn.config(command=lambda: on_delete(tree))
-    export_btn.config(command=export_to_word)
+    save_btn.config(command=lambda: on_save(name_entry, date_entry, type_combo, level_combo, desc_text,
+                                            records_view))
+    refresh_btn.config(command=lambda: refresh_treeview(records_view))
+    delete_btn.config(command=lambda: on_delete(records_view))
+    export_btn.config(command=lambda: export_to_word(root))
+    import_btn.config(command=lambda: on_import(records_view))
+    stats_btn.config(command=lambda: show_statistics(root, records_view))
 
     # Инициализируем базу данных
     init_db()
 
     # Загружаем начальные данные
-    refresh_treeview(tree)
+    refresh_treeview(records_view)
 
     # Запускаем главный цикл
     root.mainloop()
+    close_db()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python main.py import файл.csv [файл.jsonl ...] — импорт без окна
+    if len(sys.argv) > 2 and sys.argv[1] == "import":
+        from cli import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+    main()
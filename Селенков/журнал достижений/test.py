@@ -8,16 +8,25 @@ import tempfile
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-# Импортируем функции из main.py
+# Импортируем функции работы с данными из journal.py
 try:
-    from main import (
+    from journal import (
         init_db,
         save_to_db,
         load_records,
         load_records_with_desc,
+        load_records_with_id,
+        load_records_page,
+        aggregate_records,
+        lookup_id,
+        close_db,
+        search_records,
+        import_records,
+        build_word_report,
+        delete_records,
         load_types
     )
-    print("✅ Модуль main успешно импортирован")
+    print("✅ Модуль journal успешно импортирован")
 except ImportError as e:
     print(f"❌ Ошибка импорта: {e}")
     sys.exit(1)
@@ -122,9 +131,13 @@ def test_save_to_db():
             }
 
             # Сохраняем данные
-            save_to_db(**test_data)
+            row = save_to_db(**test_data)
             print("  ✅ Данные отправлены на сохранение")
 
+            # Возвращается строка в формате списка достижений
+            assert row == load_records_page()[0], f"Неверная строка сохранённой записи: {row}"
+            print("  ✅ Возвращена строка для вставки в список")
+
             # Проверяем, что данные сохранены
             conn = sqlite3.connect("достижения.db")
             cursor = conn.cursor()
@@ -165,17 +178,9 @@ def test_load_records():
                 ("Достижение 3", "2024-03-01", "Проект", "Национальный", "Описание 3")
             ]
 
-            conn = sqlite3.connect("достижения.db")
-            cursor = conn.cursor()
-
+            # Тип и уровень хранятся в справочниках, записи добавляются через save_to_db
             for record in test_records:
-                cursor.execute(
-                    "INSERT INTO достижения (название, дата, тип, уровень, описание) VALUES (?, ?, ?, ?, ?)",
-                    record
-                )
-
-            conn.commit()
-            conn.close()
+                save_to_db(*record)
             print("  ✅ Добавлено 3 тестовые записи")
 
             # Загружаем записи
@@ -209,14 +214,7 @@ def test_delete_record_invalid_index():
             init_db()
 
             # Добавляем одну запись
-            conn = sqlite3.connect("достижения.db")
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO достижения (название, дата, тип, уровень) VALUES (?, ?, ?, ?)",
-                ("Тест", "2024-01-01", "Олимпиада", "Локальный")
-            )
-            conn.commit()
-            conn.close()
+            save_to_db("Тест", "2024-01-01", "Олимпиада", "Локальный", "")
             print("  ✅ Добавлена одна тестовая запись")
 
             # Пытаемся удалить с неверным индексом (больше количества записей)
@@ -261,17 +259,9 @@ def test_delete_record_valid_index():
                 ("Достижение 3", "2024-03-01", "Проект", "Национальный", "")
             ]
 
-            conn = sqlite3.connect("достижения.db")
-            cursor = conn.cursor()
-
+            # Тип и уровень хранятся в справочниках, записи добавляются через save_to_db
             for record in test_records:
-                cursor.execute(
-                    "INSERT INTO достижения (название, дата, тип, уровень, описание) VALUES (?, ?, ?, ?, ?)",
-                    record
-                )
-
-            conn.commit()
-            conn.close()
+                save_to_db(*record)
             print("  ✅ Добавлено 3 тестовые записи")
 
             # Удаляем вторую запись (индекс 1)
@@ -309,6 +299,385 @@ def test_delete_record_valid_index():
             os.chdir(original_dir)
 
 
+def test_delete_records_by_id():
+    """Тест: удаление нескольких записей по ID"""
+    print("\n🔍 Тест: удаление нескольких записей по ID")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            init_db()
+
+            # Две записи с одинаковой датой — удаление по позиции путало их
+            save_to_db("Достижение 1", "2024-01-01", "Олимпиада", "Локальный", "")
+            save_to_db("Достижение 2", "2024-01-01", "Сертификат", "Региональный", "")
+            save_to_db("Достижение 3", "2024-03-01", "Проект", "Национальный", "")
+            print("  ✅ Добавлено 3 тестовые записи")
+
+            ids = {name: record_id for record_id, _, name, _, _ in load_records_with_id()}
+            assert len(ids) == 3, f"Ожидалось 3 записи, получено {len(ids)}"
+
+            deleted = delete_records([ids["Достижение 2"], ids["Достижение 3"]])
+            assert deleted == 2, f"Ожидалось удаление 2 записей, удалено {deleted}"
+            print("  ✅ Удалено 2 записи одной операцией")
+
+            remaining = [record[1] for record in load_records()]
+            assert remaining == ["Достижение 1"], f"Осталась неверная запись: {remaining}"
+            print("  ✅ Удалены именно выбранные записи")
+
+            # Повторное удаление и пустой список ничего не меняют
+            assert delete_records([ids["Достижение 2"]]) == 0
+            assert delete_records([]) == 0
+            print("  ✅ Удаление несуществующих ID возвращает 0")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            os.chdir(original_dir)
+
+
+def test_load_records_page():
+    """Тест: постраничная загрузка записей по ключу (дата, id)"""
+    print("\n🔍 Тест: постраничная загрузка записей")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            init_db()
+
+            # Несколько записей на одну дату, чтобы страницы делили одинаковые даты
+            for i in range(10):
+                save_to_db(f"Достижение {i}", f"2024-01-0{i // 3 + 1}", "Проект", "Локальный", "")
+            print("  ✅ Добавлено 10 тестовых записей")
+
+            pages = []
+            after_key = None
+            while True:
+                page = load_records_page(after_key, limit=3)
+                if not page:
+                    break
+                pages.append(page)
+                after_key = (page[-1][1], page[-1][0])
+
+            assert [len(page) for page in pages] == [3, 3, 3, 1], f"Неверные размеры страниц: {pages}"
+            print(f"  ✅ Получено {len(pages)} страниц")
+
+            paged = [row for page in pages for row in page]
+            assert paged == load_records_with_id(), "Порядок страниц не совпадает с полной выборкой"
+            assert len({row[0] for row in paged}) == 10, "Записи на страницах повторяются"
+            print("  ✅ Страницы идут без пропусков и повторов")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            os.chdir(original_dir)
+
+
+def test_date_range_and_aggregates():
+    """Тест: миграция дат, фильтр по периоду и сводка"""
+    print("\n🔍 Тест: фильтр по периоду и сводка")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            # База старой версии с датой, сохраненной с лишним пробелом
+            conn = sqlite3.connect("достижения.db")
+            conn.execute("""
+            CREATE TABLE достижения(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                название TEXT NOT NULL,
+                дата TEXT NOT NULL,
+                тип TEXT NOT NULL,
+                уровень TEXT NOT NULL,
+                описание TEXT
+            )
+            """)
+            conn.execute("INSERT INTO достижения (название, дата, тип, уровень, описание) "
+                         "VALUES ('Старое', '2023-12-31 ', 'Проект', 'Локальный', '')")
+            conn.commit()
+            conn.close()
+
+            init_db()
+            assert load_records()[0][0] == "2023-12-31", f"Дата не нормализована: {load_records()}"
+            print("  ✅ Даты существующих записей приведены к ГГГГ-ММ-ДД")
+
+            try:
+                save_to_db("Неверная дата", "2024-02-30", "Проект", "Локальный", "")
+                assert False, "Несуществующая дата сохранена"
+            except sqlite3.IntegrityError:
+                print("  ✅ Несуществующая дата отклонена базой")
+
+            save_to_db("Олимпиада", "2024-01-15", "Олимпиада", "Региональный", "")
+            save_to_db("Сертификат", "2024-01-20", "Сертификат", "Локальный", "")
+            save_to_db("Проект", "2024-03-01", "Проект", "Национальный", "")
+
+            page = load_records_page(date_from="2024-01-01", date_to="2024-01-31")
+            assert [row[2] for row in page] == ["Сертификат", "Олимпиада"], f"Неверный период: {page}"
+            page = load_records_page(after_key=(page[0][1], page[0][0]), date_from="2024-01-01")
+            assert [row[2] for row in page] == ["Олимпиада"], f"Неверная следующая страница: {page}"
+            print("  ✅ Фильтр по периоду работает вместе с постраничной загрузкой")
+
+            assert aggregate_records("month") == [("2024-03", 1), ("2024-01", 2), ("2023-12", 1)]
+            assert aggregate_records("year") == [("2024", 3), ("2023", 1)]
+            assert aggregate_records("type", date_from="2024-01-01") == [
+                ("Олимпиада", 1), ("Проект", 1), ("Сертификат", 1)]
+            print("  ✅ Сводка по месяцам, годам и типам")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            close_db()
+            os.chdir(original_dir)
+
+
+def test_lookup_tables():
+    """Тест: справочники типов и уровней"""
+    print("\n🔍 Тест: справочники типов и уровней")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            with open("types.json", "w", encoding="utf-8") as f:
+                json.dump(["Олимпиада", "Проект"], f)
+
+            init_db()
+            conn = sqlite3.connect("достижения.db")
+            types = [row[0] for row in conn.execute("SELECT название FROM типы ORDER BY id")]
+            assert types == ["Олимпиада", "Проект"], f"Справочник типов не заполнен: {types}"
+            print("  ✅ Справочник типов заполнен из types.json")
+
+            row = save_to_db("Хакатон", "2024-01-01", "Хакатон", "Локальный", "")
+            assert row[3:] == ("Хакатон", "Локальный"), f"Неверная строка: {row}"
+            stored = conn.execute("SELECT тип_id, уровень_id FROM достижения").fetchone()
+            assert stored == (lookup_id("типы", "Хакатон"), lookup_id("уровни", "Локальный"))
+            assert all(isinstance(value, int) for value in stored), f"Хранятся не ID: {stored}"
+            conn.close()
+            print("  ✅ В записи хранятся ID, новый тип добавлен в справочник")
+
+            assert load_records() == [("2024-01-01", "Хакатон", "Хакатон", "Локальный")]
+            print("  ✅ Названия типа и уровня подставляются при загрузке")
+
+            # После изменения файла типы перечитываются
+            with open("types.json", "w", encoding="utf-8") as f:
+                json.dump(["Олимпиада", "Проект", "Экзамен"], f)
+            assert load_types() == ["Олимпиада", "Проект", "Экзамен"]
+            print("  ✅ Измененный types.json перечитан")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            close_db()
+            os.chdir(original_dir)
+
+
+def test_search_records():
+    """Тест: полнотекстовый поиск по названию и описанию"""
+    print("\n🔍 Тест: полнотекстовый поиск")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            init_db()
+
+            save_to_db("Сертификат Python", "2024-01-01", "Сертификат", "Национальный", "Курс по математике")
+            save_to_db("Олимпиада по математике", "2024-02-01", "Олимпиада", "Региональный", "1 место")
+            save_to_db("Проект", "2024-03-01", "Проект", "Локальный", "")
+            print("  ✅ Добавлено 3 тестовые записи")
+
+            # Поиск по началу слова без учета регистра
+            names = [row[2] for row in search_records("МАТЕМ")]
+            assert names == ["Олимпиада по математике", "Сертификат Python"], f"Неверный результат: {names}"
+            print("  ✅ Найдены записи по началу слова, совпадение в названии выше")
+
+            # Несколько слов должны встречаться все
+            names = [row[2] for row in search_records("олимп 1")]
+            assert names == ["Олимпиада по математике"], f"Неверный результат: {names}"
+            print("  ✅ Поиск по нескольким словам")
+
+            # Индекс следует за удалением записей
+            conn = sqlite3.connect("достижения.db")
+            conn.execute("DELETE FROM достижения WHERE название = 'Олимпиада по математике'")
+            conn.commit()
+            conn.close()
+            names = [row[2] for row in search_records("математике")]
+            assert names == ["Сертификат Python"], f"Удаленная запись найдена: {names}"
+            print("  ✅ Индекс обновляется триггерами")
+
+            assert search_records('  " ') == [], "Пустой запрос должен возвращать пустой список"
+            print("  ✅ Пустой запрос не выполняется")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            os.chdir(original_dir)
+
+
+def test_import_records():
+    """Тест: массовый импорт из CSV и JSON Lines"""
+    print("\n🔍 Тест: массовый импорт записей")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            init_db()
+
+            with open("import.csv", "w", encoding="utf-8") as f:
+                f.write("название,дата,тип,уровень,описание\n")
+                f.write("Олимпиада,2024-01-01,Олимпиада,Локальный,1 место\n")
+                f.write("Без даты,,Проект,Локальный,\n")
+                f.write("Неверная дата,01.02.2024,Проект,Локальный,\n")
+                f.write("Сертификат,2024-02-01,Сертификат,Национальный,\n")
+
+            with open("import.jsonl", "w", encoding="utf-8") as f:
+                f.write(json.dumps({"название": "Проект", "дата": "2024-03-01",
+                                    "тип": "Проект", "уровень": "Региональный"}, ensure_ascii=False) + "\n")
+                f.write(json.dumps({"название": "Без уровня", "дата": "2024-03-02",
+                                    "тип": "Проект"}, ensure_ascii=False) + "\n")
+
+            result = import_records("import.csv", batch_size=1)
+            assert result["imported"] == 2, f"Ожидалось 2 записи, импортировано {result['imported']}"
+            assert [number for number, _ in result["rejected"]] == [2, 3], f"Неверные отказы: {result['rejected']}"
+            print("  ✅ CSV: 2 записи импортированы, 2 отклонены с причинами")
+
+            result = import_records("import.jsonl")
+            assert result["imported"] == 1
+            assert result["rejected"] == [(2, "не указан уровень")], f"Неверные отказы: {result['rejected']}"
+            print("  ✅ JSON Lines: 1 запись импортирована, 1 отклонена")
+
+            names = [record[1] for record in load_records()]
+            assert names == ["Проект", "Сертификат", "Олимпиада"], f"Неверные записи в базе: {names}"
+            print("  ✅ Импортированные записи сохранены в базе")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            os.chdir(original_dir)
+
+
+def test_build_word_report():
+    """Тест: порционный экспорт в Word с прогрессом и отменой"""
+    print("\n🔍 Тест: экспорт в Word")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            import threading
+            from docx import Document
+
+            init_db()
+            for i in range(12):
+                save_to_db(f"Достижение {i}", f"2024-01-{i + 1:02d}", "Проект", "Локальный",
+                           f"Описание {i}" if i % 2 else "")
+
+            calls = []
+            result = build_word_report("отчет.docx", progress=lambda done, total: calls.append((done, total)))
+            assert result == "отчет.docx" and os.path.exists("отчет.docx"), "Файл отчета не создан"
+            assert calls[-1] == (12, 12), f"Неверный прогресс: {calls}"
+            print(f"  ✅ Отчет создан, прогресс передан {len(calls)} раз(а)")
+
+            texts = [p.text for p in Document("отчет.docx").paragraphs]
+            assert "1. Достижение 11 — 2024-01-12 (Проект, Локальный)" in texts, "Нет первой записи в отчете"
+            assert "12. Достижение 0 — 2024-01-01 (Проект, Локальный)" in texts, "Нет последней записи в отчете"
+            assert texts.count("Описание: Описание 11") == 1, "Описание записи не выгружено"
+            print("  ✅ Записи выгружены в порядке списка")
+
+            cancel_event = threading.Event()
+            cancel_event.set()
+            assert build_word_report("отмена.docx", cancel_event=cancel_event) is None
+            assert not os.path.exists("отмена.docx"), "Отмененный отчет не должен сохраняться"
+            print("  ✅ Отмененный экспорт не создает файл")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            os.chdir(original_dir)
+
+
+def test_cli():
+    """Тест: командная строка без графического интерфейса"""
+    print("\n🔍 Тест: командная строка")
+
+    import io
+    import subprocess
+    from contextlib import redirect_stderr, redirect_stdout
+    from cli import run_cli
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+
+        try:
+            check = subprocess.run(
+                [sys.executable, "-c", "import sys, cli; print('tkinter' in sys.modules, 'docx' in sys.modules)"],
+                cwd=current_dir, capture_output=True, text=True, check=True)
+            assert check.stdout.split() == ["False", "False"], f"Загружены лишние модули: {check.stdout}"
+            print("  ✅ cli.py не загружает tkinter и python-docx")
+
+            db_path = os.path.join(temp_dir, "другая.db")
+            assert run_cli(["--db", db_path, "add", "Олимпиада", "2024-01-15", "Олимпиада", "Региональный"]) == 0
+            assert run_cli(["--db", db_path, "add", "Проект", "2024-02-01", "Проект", "Локальный",
+                            "--desc", "веб-приложение"]) == 0
+            assert run_cli(["--db", db_path, "add", "Ошибка", "2024-02-30", "Проект", "Локальный"]) == 1
+            assert not os.path.exists("достижения.db"), "Использована база текущего каталога вместо --db"
+            print("  ✅ Записи добавлены в базу из --db, неверная дата отклонена")
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                run_cli(["--db", db_path, "list"])
+                run_cli(["--db", db_path, "search", "веб"])
+                run_cli(["--db", db_path, "stats", "--by", "year"])
+            lines = output.getvalue().splitlines()
+            assert lines == ["2\t2024-02-01\tПроект\tПроект\tЛокальный",
+                             "1\t2024-01-15\tОлимпиада\tОлимпиада\tРегиональный",
+                             "2\t2024-02-01\tПроект\tПроект\tЛокальный",
+                             "2024\t2"], f"Неверный вывод: {lines}"
+            print("  ✅ Команды list, search и stats")
+
+            # Дата периода в другом формате - ошибка разбора аргументов, а не сравнение строк
+            with redirect_stderr(io.StringIO()):
+                for argv in (["list", "--from", "2024-1-5"], ["stats", "--to", "2024-02-30"]):
+                    try:
+                        run_cli(["--db", db_path] + argv)
+                    except SystemExit as e:
+                        assert e.code == 2
+                    else:
+                        raise AssertionError(f"Неверная дата принята: {argv}")
+            print("  ✅ Даты периода проверяются")
+
+            with redirect_stdout(io.StringIO()):
+                assert run_cli(["--db", db_path, "export-docx", "--output", "отчет.docx"]) == 0
+                assert run_cli(["--db", db_path, "delete", "1"]) == 0
+            assert os.path.exists("отчет.docx"), "Отчет не создан"
+            print("  ✅ Команды export-docx и delete")
+
+        except Exception as e:
+            print(f"  ❌ Ошибка: {e}")
+            raise
+        finally:
+            os.chdir(original_dir)
+
+
 def test_full_workflow():
     """Тест: полный рабочий процесс программы - ИСПРАВЛЕННЫЙ"""
     print("\n🔍 Тест: полный рабочий процесс программы")
@@ -1,8 +1,16 @@
 import psycopg2
-from psycopg2 import sql, OperationalError
+from psycopg2 import sql, pool, OperationalError, InterfaceError
+from collections import OrderedDict
+from contextlib import contextmanager
+import copy
 from datetime import datetime
 from pathlib import Path
 import os
+import threading
+import time
+
+import migrations
+from query_profiler import QueryProfiler, TimedConnection
 
 
 class DatabaseManager:
@@ -20,282 +28,631 @@ class DatabaseManager:
     # Типы записей
     ENTRY_TYPES = ['Публикация', 'Конференция', 'Грант', 'Преподавание', 'Достижение']
 
-    def __init__(self):
-        self.connection = None
+    # Размер пула соединений: два готовых соединения для интерфейса и потока отчетов
+    POOL_MIN_CONNECTIONS = 2
+    POOL_MAX_CONNECTIONS = 5
+
+    # Соединение, простоявшее в пуле дольше (секунды), проверяется перед выдачей
+    POOL_IDLE_CHECK = 30
+
+    # Максимальное ожидание свободного соединения (секунды)
+    POOL_TIMEOUT = 30
+
+    # Кэширование статистики до следующего изменения данных
+    STATISTICS_CACHE = True
+
+    # Замер времени запросов (включается переменной окружения PORTFOLIO_PROFILE_QUERIES=1)
+    PROFILE_QUERIES = os.environ.get('PORTFOLIO_PROFILE_QUERIES') == '1'
+
+    # Порог медленного запроса (секунды), такие запросы выводятся с планом EXPLAIN
+    SLOW_QUERY_THRESHOLD = 0.2
+    EXPLAIN_SLOW_QUERIES = True
+
+    # Количество записей на одной странице списка
+    PAGE_SIZE = 100
+
+    # Колонки, по которым сортируется список, и выражения сортировки (по каждому есть индекс).
+    # Название сравнивается без учета регистра, ё - как е; COLLATE "C" дает тот же
+    # порядок, что sort_index.title_key, поэтому загруженный список можно
+    # пересортировать без запроса
+    SORT_EXPRESSIONS = {
+        'created_at': sql.SQL('created_at'),
+        'title': sql.SQL("replace(lower(title), 'ё', 'е') COLLATE \"C\""),
+        'year': sql.SQL('year'),
+    }
+    SORT_COLUMNS = tuple(SORT_EXPRESSIONS)
+
+    # Количество последних просмотренных записей в кэше
+    DETAILS_CACHE_SIZE = 64
+
+    def __init__(self, profile_queries=None):
+        self.pool = None
+        if profile_queries is None:
+            profile_queries = self.PROFILE_QUERIES
+        self.profiler = None
+        if profile_queries:
+            self.profiler = QueryProfiler(self.SLOW_QUERY_THRESHOLD, explain=self.EXPLAIN_SLOW_QUERIES)
+        # ThreadedConnectionPool при исчерпании сразу выбрасывает PoolError,
+        # поэтому число выданных соединений ограничивается семафором с ожиданием
+        self._slots = threading.BoundedSemaphore(self.POOL_MAX_CONNECTIONS)
+        self._metrics_lock = threading.Lock()
+        # Время возврата соединений в пул: id соединения -> time.monotonic()
+        self._released = {}
+        self._metrics = {
+            'checkouts': 0,
+            'in_use': 0,
+            'peak_in_use': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0,
+            'reconnects': 0
+        }
+        self._statistics_lock = threading.Lock()
+        self._statistics_cache = None
+        self._statistics_version = 0
+        self._details_lock = threading.Lock()
+        self._details_cache = OrderedDict()
+        self._details_version = 0
+        self.trigram_search = False
         self.connect()
         self.ensure_tables_exist()
 
     def connect(self):
         """Подключение к базе данных"""
         try:
-            self.connection = psycopg2.connect(**self.DB_CONFIG)
+            self.pool = pool.ThreadedConnectionPool(
+                self.POOL_MIN_CONNECTIONS, self.POOL_MAX_CONNECTIONS, **self.DB_CONFIG)
             print("✓ Подключение к БД успешно")
             return True
         except OperationalError as e:
             print(f"✗ Ошибка подключения: {e}")
             return False
 
-    def ensure_tables_exist(self):
-        """Проверка и создание таблиц"""
+    @property
+    def connected(self):
+        """Есть ли подключение к базе данных"""
+        return self.pool is not None
+
+    @contextmanager
+    def checkout(self, method='checkout'):
+        """Соединение из пула на время одного вызова
+
+        method - публичный метод менеджера, под которым профилировщик
+        учитывает запросы этого соединения.
+        """
+        if self.pool is None:
+            raise OperationalError("Нет подключения к базе данных")
+
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.POOL_TIMEOUT):
+            raise pool.PoolError("Нет свободных соединений с базой данных")
+
         try:
-            cursor = self.connection.cursor()
+            connection = self.pool.getconn()
+            reconnected = False
+            if not self._is_alive(connection):
+                # Соединение разорвано сервером (в том числе пока простаивало в пуле) - заменяем новым
+                self._discard(connection)
+                connection = self.pool.getconn()
+                reconnected = True
+            self._record_checkout(time.perf_counter() - started, reconnected)
+
+            broken = False
+            try:
+                yield TimedConnection(connection, self.profiler, method) if self.profiler else connection
+            except (OperationalError, InterfaceError):
+                # После сетевой ошибки соединение в пул не возвращается
+                broken = True
+                raise
+            finally:
+                if broken or connection.closed:
+                    self._discard(connection)
+                else:
+                    self.pool.putconn(connection, close=False)
+                    with self._metrics_lock:
+                        self._released[id(connection)] = time.monotonic()
+                with self._metrics_lock:
+                    self._metrics['in_use'] -= 1
+        finally:
+            self._slots.release()
+
+    def _discard(self, connection):
+        """Закрытие соединения вместо возврата в пул"""
+        with self._metrics_lock:
+            self._released.pop(id(connection), None)
+        self.pool.putconn(connection, close=True)
+
+    def _is_alive(self, connection):
+        """Проверка соединения перед выдачей
+
+        Соединение, разорванное сервером во время простоя, сохраняет
+        closed == 0, пока по нему не выполнится запрос. Запрос SELECT 1
+        стоит лишнего обращения к серверу, поэтому он выполняется только
+        для соединений, простоявших в пуле дольше POOL_IDLE_CHECK.
+        """
+        if connection.closed:
+            return False
 
-            # Проверяем существование таблицы entries
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'entries'
-                )
-            """)
+        with self._metrics_lock:
+            released = self._released.get(id(connection))
+        idle = time.monotonic() - released if released is not None else 0.0
+        if idle < self.POOL_IDLE_CHECK:
+            return True
+
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+            # Проверка не должна оставлять открытую транзакцию
+            connection.rollback()
+            return True
+        except (OperationalError, InterfaceError):
+            return False
+
+    def _record_checkout(self, wait, reconnected):
+        """Учет выдачи соединения"""
+        with self._metrics_lock:
+            metrics = self._metrics
+            metrics['checkouts'] += 1
+            metrics['in_use'] += 1
+            metrics['peak_in_use'] = max(metrics['peak_in_use'], metrics['in_use'])
+            metrics['total_wait'] += wait
+            metrics['max_wait'] = max(metrics['max_wait'], wait)
+            if reconnected:
+                metrics['reconnects'] += 1
+
+    def get_pool_metrics(self):
+        """Размер пула и время ожидания соединений"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['min_connections'] = self.POOL_MIN_CONNECTIONS
+        metrics['max_connections'] = self.POOL_MAX_CONNECTIONS
+        metrics['avg_wait'] = metrics['total_wait'] / metrics['checkouts'] if metrics['checkouts'] else 0.0
+        return metrics
+
+    def ensure_tables_exist(self):
+        """Приведение схемы БД к текущей версии миграций"""
+        try:
+            with self.checkout('ensure_tables_exist') as connection:
+                applied = migrations.migrate(connection)
+                self.trigram_search = migrations.create_search_indexes(connection)
 
-            if not cursor.fetchone()[0]:
-                print("Создание таблиц...")
-                self.create_tables()
+            if applied:
+                print(f"✓ Схема обновлена до версии {applied[-1]}")
             else:
                 print("✓ Таблицы существуют")
-
-            cursor.close()
             return True
 
         except Exception as e:
             print(f"Ошибка проверки таблиц: {e}")
             return False
 
-    def create_tables(self):
-        """Создание всех таблиц"""
+    def get_entries(self, sort_by="created_at", sort_order="DESC"):
+        """Получение всех записей с сортировкой"""
         try:
-            cursor = self.connection.cursor()
-
-            cursor.execute("""
-                CREATE TABLE entries (
-                    id SERIAL PRIMARY KEY,
-                    title VARCHAR(255) NOT NULL,
-                    entry_type VARCHAR(100) NOT NULL,
-                    year INTEGER,
-                    file_path VARCHAR(500) UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            with self.checkout('get_entries') as connection:
+                cursor = connection.cursor()
+                query = sql.SQL("""
+                    SELECT id, title, entry_type, year, 
+                           TO_CHAR(created_at, 'DD.MM.YYYY HH24:MI') as created_at,
+                           file_path
+                    FROM entries
+                    ORDER BY {sort_by} {sort_order}
+                """).format(
+                    sort_by=sql.Identifier(sort_by),
+                    sort_order=sql.SQL(sort_order)
                 )
-            """)
 
-            cursor.execute("""
-                CREATE TABLE coauthors (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL UNIQUE
-                )
-            """)
+                cursor.execute(query)
+                entries = cursor.fetchall()
+                cursor.close()
+                return entries
 
-            cursor.execute("""
-                CREATE TABLE entry_coauthors (
-                    entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE,
-                    coauthor_id INTEGER REFERENCES coauthors(id) ON DELETE CASCADE,
-                    PRIMARY KEY (entry_id, coauthor_id)
-                )
-            """)
-
-            cursor.execute("""
-                CREATE TABLE activity_log (
-                    id SERIAL PRIMARY KEY,
-                    date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    description TEXT NOT NULL,
-                    entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE
-                )
-            """)
+        except Exception as e:
+            print(f"Ошибка получения записей: {e}")
+            return []
 
-            # Индексы для оптимизации
-            cursor.execute("CREATE INDEX idx_entries_type ON entries(entry_type)")
-            cursor.execute("CREATE INDEX idx_entries_year ON entries(year)")
-            cursor.execute("CREATE INDEX idx_entries_created ON entries(created_at)")
-            cursor.execute("CREATE INDEX idx_activity_date ON activity_log(date)")
+    def get_entries_page(self, sort_by="created_at", sort_order="DESC", after_key=None, limit=None):
+        """Страница записей после ключа (значение сортировки, id)
+
+        Возвращает записи в формате get_entries и ключ последней из них для
+        следующей страницы (None, если записей больше нет). Вместо OFFSET и
+        серверного курсора используется keyset-пагинация: каждая страница -
+        короткий запрос по индексу, а соединение не удерживается между страницами.
+        """
+        if sort_by not in self.SORT_COLUMNS or sort_order not in ('ASC', 'DESC'):
+            raise ValueError(f"Недопустимая сортировка: {sort_by} {sort_order}")
+        limit = limit or self.PAGE_SIZE
+
+        # NULL при ASC идут после остальных значений, при DESC - перед ними
+        phases = ['values', 'nulls'] if sort_order == 'ASC' else ['nulls', 'values']
+        if after_key is not None and after_key[0] is None:
+            # Страница закончилась на NULL: при DESC после них еще идут значения
+            phases = ['nulls'] if sort_order == 'ASC' else ['nulls', 'values']
+        elif after_key is not None and sort_order == 'DESC':
+            phases = ['values']
+
+        column = self.SORT_EXPRESSIONS[sort_by]
+        direction = sql.SQL(sort_order)
+        comparison = sql.SQL('>' if sort_order == 'ASC' else '<')
+        entries = []
 
-            self.connection.commit()
-            cursor.close()
-            print("✓ Все таблицы созданы")
+        try:
+            with self.checkout('get_entries_page') as connection:
+                cursor = connection.cursor()
+
+                for phase in phases:
+                    if phase == 'values':
+                        if after_key is not None and after_key[0] is not None:
+                            condition = sql.SQL("({column}, id) {comparison} (%s, %s)").format(
+                                column=column, comparison=comparison)
+                            params = list(after_key)
+                        else:
+                            condition = sql.SQL("{column} IS NOT NULL").format(column=column)
+                            params = []
+                        order = sql.SQL("{column} {direction}, id {direction}").format(
+                            column=column, direction=direction)
+                    else:
+                        if after_key is not None and after_key[0] is None:
+                            condition = sql.SQL("{column} IS NULL AND id {comparison} %s").format(
+                                column=column, comparison=comparison)
+                            params = [after_key[1]]
+                        else:
+                            condition = sql.SQL("{column} IS NULL").format(column=column)
+                            params = []
+                        order = sql.SQL("id {direction}").format(direction=direction)
+
+                    cursor.execute(sql.SQL("""
+                        SELECT id, title, entry_type, year, 
+                               TO_CHAR(created_at, 'DD.MM.YYYY HH24:MI') as created_at,
+                               file_path, {column}
+                        FROM entries
+                        WHERE {condition}
+                        ORDER BY {order}
+                        LIMIT %s
+                    """).format(column=column, condition=condition, order=order),
+                        params + [limit - len(entries)])
+                    entries.extend(cursor.fetchall())
+
+                    if len(entries) >= limit:
+                        break
+
+                cursor.close()
 
         except Exception as e:
-            self.connection.rollback()
-            raise
+            print(f"Ошибка получения записей: {e}")
+            return [], None
+
+        if len(entries) < limit:
+            next_key = None
+        else:
+            next_key = (entries[-1][-1], entries[-1][0])
+        return [entry[:-1] for entry in entries], next_key
+
+    def search_entries(self, text, limit=None):
+        """Поиск записей по названию и соавторам
+
+        Совпадение подстроки ранжируется выше нечеткого совпадения по триграммам
+        (word_similarity), так что опечатки тоже находят запись. Возвращает
+        записи в формате get_entries, лучшие совпадения первыми.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        limit = limit or self.PAGE_SIZE
+        params = {
+            'text': text,
+            'pattern': '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%',
+            'limit': limit
+        }
 
-    def get_entries(self, sort_by="created_at", sort_order="DESC"):
-        """Получение всех записей с сортировкой"""
-        try:
-            cursor = self.connection.cursor()
-            query = sql.SQL("""
-                SELECT id, title, entry_type, year, 
-                       TO_CHAR(created_at, 'DD.MM.YYYY HH24:MI') as created_at,
-                       file_path
+        if self.trigram_search:
+            # Операторы <% и ILIKE используют GIN-индексы gin_trgm_ops
+            matches = """
+                SELECT id, (title ILIKE %(pattern)s)::int + word_similarity(%(text)s, title) AS score
                 FROM entries
-                ORDER BY {sort_by} {sort_order}
-            """).format(
-                sort_by=sql.Identifier(sort_by),
-                sort_order=sql.SQL(sort_order)
-            )
+                WHERE %(text)s <%% title OR title ILIKE %(pattern)s
+                UNION ALL
+                SELECT ec.entry_id, (c.name ILIKE %(pattern)s)::int + word_similarity(%(text)s, c.name)
+                FROM coauthors c
+                JOIN entry_coauthors ec ON ec.coauthor_id = c.id
+                WHERE %(text)s <%% c.name OR c.name ILIKE %(pattern)s
+            """
+        else:
+            matches = """
+                SELECT id, 1 AS score FROM entries WHERE title ILIKE %(pattern)s
+                UNION ALL
+                SELECT ec.entry_id, 0
+                FROM coauthors c
+                JOIN entry_coauthors ec ON ec.coauthor_id = c.id
+                WHERE c.name ILIKE %(pattern)s
+            """
 
-            cursor.execute(query)
-            entries = cursor.fetchall()
-            cursor.close()
-            return entries
+        try:
+            with self.checkout('search_entries') as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"""
+                    WITH matches AS ({matches}
+                    ), ranked AS (
+                        SELECT id, MAX(score) AS score
+                        FROM matches
+                        GROUP BY id
+                        ORDER BY score DESC, id DESC
+                        LIMIT %(limit)s
+                    )
+                    SELECT e.id, e.title, e.entry_type, e.year,
+                           TO_CHAR(e.created_at, 'DD.MM.YYYY HH24:MI') as created_at,
+                           e.file_path
+                    FROM ranked r
+                    JOIN entries e ON e.id = r.id
+                    ORDER BY r.score DESC, e.id DESC
+                """, params)
+                entries = cursor.fetchall()
+                cursor.close()
+                return entries
 
         except Exception as e:
-            print(f"Ошибка получения записей: {e}")
+            print(f"Ошибка поиска: {e}")
             return []
 
-    def create_entry(self, title, entry_type, year, file_path):
-        """Создание новой записи"""
+    def get_entry_detail(self, entry_id):
+        """Запись вместе с соавторами одним запросом
+
+        Возвращает словарь с полями записи и списком соавторов или None, если
+        записи нет. Последние просмотренные записи хранятся в LRU-кэше до их
+        изменения, поэтому повторный выбор в списке не обращается к БД.
+        """
+        with self._details_lock:
+            if entry_id in self._details_cache:
+                self._details_cache.move_to_end(entry_id)
+                return dict(self._details_cache[entry_id])
+            version = self._details_version
+
         try:
-            cursor = self.connection.cursor()
+            row = self._fetch_entry_detail(entry_id)
+        except Exception as e:
+            print(f"Ошибка получения записи: {e}")
+            return None
+
+        if not row:
+            return None
+
+        detail = dict(zip(('id', 'title', 'entry_type', 'year', 'file_path', 'created_at'), row))
+        detail['coauthors'] = list(row[6])
+
+        with self._details_lock:
+            # Запись могла измениться, пока выполнялся запрос
+            if version == self._details_version:
+                self._details_cache[entry_id] = detail
+                while len(self._details_cache) > self.DETAILS_CACHE_SIZE:
+                    self._details_cache.popitem(last=False)
+        return dict(detail)
+
+    def _fetch_entry_detail(self, entry_id):
+        """Строка записи, последнее поле - список соавторов"""
+        with self.checkout('get_entry_detail') as connection:
+            cursor = connection.cursor()
             cursor.execute("""
-                INSERT INTO entries (title, entry_type, year, file_path)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id
-            """, (title, entry_type, year, file_path))
+                SELECT e.id, e.title, e.entry_type, e.year, e.file_path,
+                       TO_CHAR(e.created_at, 'DD.MM.YYYY HH24:MI'),
+                       COALESCE(array_agg(c.name ORDER BY c.name)
+                                FILTER (WHERE c.name IS NOT NULL), '{}')
+                FROM entries e
+                LEFT JOIN entry_coauthors ec ON ec.entry_id = e.id
+                LEFT JOIN coauthors c ON c.id = ec.coauthor_id
+                WHERE e.id = %s
+                GROUP BY e.id
+            """, (entry_id,))
+            row = cursor.fetchone()
+            cursor.close()
+            return row
+
+    def invalidate_entry(self, entry_id):
+        """Удаление записи из кэша после ее изменения"""
+        with self._details_lock:
+            self._details_cache.pop(entry_id, None)
+            self._details_version += 1
+
+    def create_entry(self, title, entry_type, year, file_path, coauthors=()):
+        """Создание новой записи вместе с соавторами одной транзакцией"""
+        with self.checkout('create_entry') as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    INSERT INTO entries (title, entry_type, year, file_path)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING id
+                """, (title, entry_type, year, file_path))
 
-            entry_id = cursor.fetchone()[0]
+                entry_id = cursor.fetchone()[0]
 
-            # Логируем действие
-            cursor.execute("""
-                INSERT INTO activity_log (description, entry_id)
-                VALUES (%s, %s)
-            """, (f"Создана запись: '{title}'", entry_id))
+                # Логируем действие
+                cursor.execute("""
+                    INSERT INTO activity_log (description, entry_id)
+                    VALUES (%s, %s)
+                """, (f"Создана запись: '{title}'", entry_id))
 
-            self.connection.commit()
-            cursor.close()
-            return entry_id
+                self._insert_coauthors(cursor, entry_id, coauthors)
 
-        except Exception as e:
-            self.connection.rollback()
-            raise
+                connection.commit()
+                self.invalidate_statistics()
+                cursor.close()
+                return entry_id
+
+            except Exception as e:
+                connection.rollback()
+                raise
 
     def update_entry(self, entry_id, title, entry_type, year):
         """Обновление записи"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                UPDATE entries 
-                SET title = %s, entry_type = %s, year = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-            """, (title, entry_type, year, entry_id))
+        with self.checkout('update_entry') as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    UPDATE entries 
+                    SET title = %s, entry_type = %s, year = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (title, entry_type, year, entry_id))
 
-            cursor.execute("""
-                INSERT INTO activity_log (description, entry_id)
-                VALUES (%s, %s)
-            """, (f"Обновлена запись: '{title}'", entry_id))
+                cursor.execute("""
+                    INSERT INTO activity_log (description, entry_id)
+                    VALUES (%s, %s)
+                """, (f"Обновлена запись: '{title}'", entry_id))
 
-            self.connection.commit()
-            cursor.close()
-            return True
+                connection.commit()
+                self.invalidate_statistics()
+                self.invalidate_entry(entry_id)
+                cursor.close()
+                return True
 
-        except Exception as e:
-            self.connection.rollback()
-            raise
+            except Exception as e:
+                connection.rollback()
+                raise
 
     def delete_entry(self, entry_id):
         """Удаление записи"""
-        try:
-            cursor = self.connection.cursor()
+        with self.checkout('delete_entry') as connection:
+            try:
+                cursor = connection.cursor()
 
-            cursor.execute("SELECT title FROM entries WHERE id = %s", (entry_id,))
-            title = cursor.fetchone()[0]
+                cursor.execute("SELECT title FROM entries WHERE id = %s", (entry_id,))
+                title = cursor.fetchone()[0]
 
-            cursor.execute("DELETE FROM entries WHERE id = %s", (entry_id,))
+                cursor.execute("DELETE FROM entries WHERE id = %s", (entry_id,))
 
-            cursor.execute("""
-                INSERT INTO activity_log (description)
-                VALUES (%s)
-            """, (f"Удалена запись: '{title}'",))
+                cursor.execute("""
+                    INSERT INTO activity_log (description)
+                    VALUES (%s)
+                """, (f"Удалена запись: '{title}'",))
 
-            self.connection.commit()
-            cursor.close()
-            return True
+                connection.commit()
+                self.invalidate_statistics()
+                self.invalidate_entry(entry_id)
+                cursor.close()
+                return True
 
-        except Exception as e:
-            self.connection.rollback()
-            raise
+            except Exception as e:
+                connection.rollback()
+                raise
 
     def get_coauthors(self, entry_id):
         """Получение соавторов записи"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT c.name 
-                FROM coauthors c
-                JOIN entry_coauthors ec ON c.id = ec.coauthor_id
-                WHERE ec.entry_id = %s
-                ORDER BY c.name
-            """, (entry_id,))
+            with self.checkout('get_coauthors') as connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    SELECT c.name 
+                    FROM coauthors c
+                    JOIN entry_coauthors ec ON c.id = ec.coauthor_id
+                    WHERE ec.entry_id = %s
+                    ORDER BY c.name
+                """, (entry_id,))
 
-            coauthors = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            return coauthors
+                coauthors = [row[0] for row in cursor.fetchall()]
+                cursor.close()
+                return coauthors
 
         except Exception as e:
             print(f"Ошибка получения соавторов: {e}")
             return []
 
-    def add_coauthor(self, entry_id, coauthor_name):
-        """Добавление соавтора"""
-        try:
-            cursor = self.connection.cursor()
-
-            cursor.execute("SELECT id FROM coauthors WHERE name = %s", (coauthor_name,))
-            result = cursor.fetchone()
-
-            if result:
-                coauthor_id = result[0]
-            else:
-                cursor.execute("INSERT INTO coauthors (name) VALUES (%s) RETURNING id", (coauthor_name,))
-                coauthor_id = cursor.fetchone()[0]
-
-            cursor.execute("""
+    def _insert_coauthors(self, cursor, entry_id, names):
+        """Добавление соавторов и связей с записью одним запросом в текущей транзакции"""
+        names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+        if not names:
+            return 0
+
+        # DO UPDATE вместо DO NOTHING, чтобы RETURNING вернул id и уже существующих соавторов
+        cursor.execute("""
+            WITH names AS (
+                SELECT unnest(%(names)s::varchar[]) AS name
+            ), ids AS (
+                INSERT INTO coauthors (name)
+                SELECT name FROM names
+                ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+                RETURNING id
+            ), linked AS (
                 INSERT INTO entry_coauthors (entry_id, coauthor_id)
-                VALUES (%s, %s)
+                SELECT %(entry_id)s, id FROM ids
                 ON CONFLICT DO NOTHING
-            """, (entry_id, coauthor_id))
-
-            cursor.execute("""
-                INSERT INTO activity_log (description, entry_id)
-                VALUES (%s, %s)
-            """, (f"Добавлен соавтор: '{coauthor_name}'", entry_id))
-
-            self.connection.commit()
-            cursor.close()
-            return True
+            )
+            INSERT INTO activity_log (description, entry_id)
+            SELECT 'Добавлен соавтор: ''' || name || '''', %(entry_id)s
+            FROM names
+        """, {'names': names, 'entry_id': entry_id})
+        return len(names)
+
+    def add_coauthors(self, entry_id, names):
+        """Добавление нескольких соавторов одной транзакцией"""
+        with self.checkout('add_coauthors') as connection:
+            try:
+                cursor = connection.cursor()
+                added = self._insert_coauthors(cursor, entry_id, names)
+
+                connection.commit()
+                self.invalidate_statistics()
+                self.invalidate_entry(entry_id)
+                cursor.close()
+                return added
+
+            except Exception as e:
+                connection.rollback()
+                raise
 
-        except Exception as e:
-            self.connection.rollback()
-            raise
+    def add_coauthor(self, entry_id, coauthor_name):
+        """Добавление соавтора"""
+        self.add_coauthors(entry_id, [coauthor_name])
+        return True
 
     def remove_coauthor(self, entry_id, coauthor_name):
         """Удаление соавтора"""
-        try:
-            cursor = self.connection.cursor()
+        with self.checkout('remove_coauthor') as connection:
+            try:
+                cursor = connection.cursor()
+
+                cursor.execute("SELECT id FROM coauthors WHERE name = %s", (coauthor_name,))
+                result = cursor.fetchone()
+
+                if result:
+                    coauthor_id = result[0]
+                    cursor.execute("""
+                        DELETE FROM entry_coauthors 
+                        WHERE entry_id = %s AND coauthor_id = %s
+                    """, (entry_id, coauthor_id))
+
+                    cursor.execute("""
+                        INSERT INTO activity_log (description, entry_id)
+                        VALUES (%s, %s)
+                    """, (f"Удален соавтор: '{coauthor_name}'", entry_id))
+
+                connection.commit()
+                self.invalidate_statistics()
+                self.invalidate_entry(entry_id)
+                cursor.close()
+                return True
+
+            except Exception as e:
+                connection.rollback()
+                raise
+
+    def invalidate_statistics(self):
+        """Сброс кэша статистики после изменения данных"""
+        with self._statistics_lock:
+            self._statistics_cache = None
+            self._statistics_version += 1
+
+    def get_statistics(self, use_cache=None):
+        """Получение статистики для отчетов одним запросом"""
+        if use_cache is None:
+            use_cache = self.STATISTICS_CACHE
+
+        with self._statistics_lock:
+            if use_cache and self._statistics_cache is not None:
+                # Глубокая копия: изменение вложенных словарей не должно менять кэш
+                return copy.deepcopy(self._statistics_cache)
+            version = self._statistics_version
 
-            cursor.execute("SELECT id FROM coauthors WHERE name = %s", (coauthor_name,))
-            result = cursor.fetchone()
-
-            if result:
-                coauthor_id = result[0]
-                cursor.execute("""
-                    DELETE FROM entry_coauthors 
-                    WHERE entry_id = %s AND coauthor_id = %s
-                """, (entry_id, coauthor_id))
-
-                cursor.execute("""
-                    INSERT INTO activity_log (description, entry_id)
-                    VALUES (%s, %s)
-                """, (f"Удален соавтор: '{coauthor_name}'", entry_id))
-
-            self.connection.commit()
-            cursor.close()
-            return True
-
-        except Exception as e:
-            self.connection.rollback()
-            raise
-
-    def get_statistics(self):
-        """Получение статистики для отчетов"""
         stats = {
             'type_distribution': {},
             'year_distribution': {},
@@ -305,53 +662,89 @@ class DatabaseManager:
         }
 
         try:
-            cursor = self.connection.cursor()
+            types, years, coauthors, total, recent = self._fetch_statistics()
 
-            # Распределение по типам
-            cursor.execute("""
-                SELECT entry_type, COUNT(*) 
-                FROM entries 
-                GROUP BY entry_type 
-                ORDER BY COUNT(*) DESC
-            """)
-            stats['type_distribution'] = dict(cursor.fetchall())
+            stats['type_distribution'] = dict(types)
+            stats['year_distribution'] = dict(years)
+            stats['unique_coauthors'] = coauthors or 0
+            stats['total_entries'] = total or 0
+            stats['recent_entries'] = [tuple(entry) for entry in recent]
 
-            # Распределение по годам
-            cursor.execute("""
-                SELECT year, COUNT(*) 
-                FROM entries 
-                WHERE year IS NOT NULL
-                GROUP BY year 
-                ORDER BY year
-            """)
-            stats['year_distribution'] = dict(cursor.fetchall())
+        except Exception as e:
+            print(f"Ошибка получения статистики: {e}")
+            return stats
 
-            # Уникальные соавторы
-            cursor.execute("SELECT COUNT(DISTINCT name) FROM coauthors")
-            stats['unique_coauthors'] = cursor.fetchone()[0] or 0
+        with self._statistics_lock:
+            # Данные могли измениться, пока выполнялся запрос
+            if version == self._statistics_version:
+                self._statistics_cache = stats
+        return copy.deepcopy(stats)
 
-            # Общее количество записей
-            cursor.execute("SELECT COUNT(*) FROM entries")
-            stats['total_entries'] = cursor.fetchone()[0] or 0
+    def get_query_stats(self):
+        """Статистика времени запросов по методам (пусто без замера)"""
+        return self.profiler.summary() if self.profiler else {}
 
-            # Последние 5 записей
+    def _fetch_statistics(self):
+        """Распределения по типам и годам, число соавторов и записей, последние записи"""
+        with self.checkout('get_statistics') as connection:
+            cursor = connection.cursor()
+
+            # Распределения и последние записи собираются в JSON на стороне сервера
             cursor.execute("""
-                SELECT title, entry_type, year, 
-                       TO_CHAR(created_at, 'DD.MM.YYYY') as created_date
-                FROM entries
-                ORDER BY created_at DESC
-                LIMIT 5
+                WITH type_counts AS (
+                    SELECT entry_type, COUNT(*) AS count
+                    FROM entries
+                    GROUP BY entry_type
+                ), year_counts AS (
+                    SELECT year, COUNT(*) AS count
+                    FROM entries
+                    WHERE year IS NOT NULL
+                    GROUP BY year
+                ), recent AS (
+                    SELECT title, entry_type, year, created_at,
+                           TO_CHAR(created_at, 'DD.MM.YYYY') as created_date
+                    FROM entries
+                    ORDER BY created_at DESC
+                    LIMIT 5
+                )
+                SELECT
+                    (SELECT COALESCE(json_agg(json_build_array(entry_type, count)
+                                              ORDER BY count DESC, entry_type), '[]')
+                     FROM type_counts),
+                    (SELECT COALESCE(json_agg(json_build_array(year, count)
+                                              ORDER BY year), '[]')
+                     FROM year_counts),
+                    (SELECT COUNT(DISTINCT name) FROM coauthors),
+                    (SELECT COUNT(*) FROM entries),
+                    (SELECT COALESCE(json_agg(json_build_array(title, entry_type, year, created_date)
+                                              ORDER BY created_at DESC), '[]')
+                     FROM recent)
             """)
-            stats['recent_entries'] = cursor.fetchall()
-
+            row = cursor.fetchone()
             cursor.close()
-
-        except Exception as e:
-            print(f"Ошибка получения статистики: {e}")
-
-        return stats
+            return row
 
     def close(self):
-        """Закрытие соединения"""
-        if self.connection:
-            self.connection.close()
\ No newline at end of file
+        """Закрытие всех соединений пула и вывод сводки по запросам"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+            self._released.clear()
+        if self.profiler:
+            print(self.profiler.format_summary())
+
+
+def create_database_manager(backend=None, **kwargs):
+    """Менеджер БД выбранного бэкенда
+
+    backend - 'postgresql' или 'sqlite', по умолчанию берется из переменной
+    окружения PORTFOLIO_DB_BACKEND (PostgreSQL, если она не задана).
+    """
+    backend = backend or os.environ.get('PORTFOLIO_DB_BACKEND', 'postgresql')
+    if backend == 'postgresql':
+        return DatabaseManager(**kwargs)
+    if backend == 'sqlite':
+        # Импорт здесь, так как sqlite_backend сам импортирует DatabaseManager
+        from sqlite_backend import SQLiteDatabaseManager
+        return SQLiteDatabaseManager(**kwargs)
+    raise ValueError(f"Неизвестный бэкенд БД: {backend}")
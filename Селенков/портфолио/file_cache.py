@@ -0,0 +1,124 @@
+from collections import OrderedDict
+import os
+import threading
+
+
+class FileContentCache:
+    """Кэш содержимого файлов описаний записей
+
+    Содержимое хранится по пути файла вместе с временем изменения и размером.
+    При чтении файл проверяется через os.stat и перечитывается, только если
+    он изменился, поэтому повторный выбор записи не читает файл заново.
+    """
+
+    # Количество файлов в кэше
+    MAX_FILES = 128
+
+    # Количество соседних записей, файлы которых читаются заранее
+    READ_AHEAD = 3
+
+    def __init__(self, max_files=None, encoding='utf-8'):
+        self.max_files = max_files or self.MAX_FILES
+        self.encoding = encoding
+        self._lock = threading.Lock()
+        self._files = OrderedDict()
+        self._read_ahead_generation = 0
+        self._metrics = {
+            'hits': 0,
+            'misses': 0,
+            'read_ahead': 0
+        }
+
+    @staticmethod
+    def _signature(path):
+        """Время изменения и размер файла или None, если файла нет"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _store(self, path, signature, content):
+        """Сохранение содержимого с вытеснением давно не использованных файлов"""
+        with self._lock:
+            self._files[path] = (signature, content)
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+
+    def read(self, path):
+        """Содержимое файла или None, если файла нет"""
+        return self._read(os.fspath(path), read_ahead=False)
+
+    def _read(self, path, read_ahead):
+        """Чтение файла с проверкой кэша и учетом в счетчиках"""
+        signature = self._signature(path)
+        if signature is None:
+            self.discard(path)
+            return None
+
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached[0] == signature:
+                self._files.move_to_end(path)
+                if not read_ahead:
+                    self._metrics['hits'] += 1
+                return cached[1]
+
+        try:
+            with open(path, 'r', encoding=self.encoding) as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        # Файл мог измениться во время чтения - тогда он перечитается в следующий раз
+        if self._signature(path) == signature:
+            self._store(path, signature, content)
+        with self._lock:
+            self._metrics['read_ahead' if read_ahead else 'misses'] += 1
+        return content
+
+    def write(self, path, content):
+        """Запись файла с обновлением кэша"""
+        path = os.fspath(path)
+        with open(path, 'w', encoding=self.encoding) as f:
+            f.write(content)
+
+        signature = self._signature(path)
+        if signature is not None:
+            self._store(path, signature, content)
+
+    def discard(self, path):
+        """Удаление файла из кэша"""
+        with self._lock:
+            self._files.pop(os.fspath(path), None)
+
+    def read_ahead(self, paths):
+        """Чтение файлов в кэш в фоновом потоке
+
+        Новый вызов отменяет чтение, оставшееся от предыдущего.
+        """
+        paths = [os.fspath(path) for path in paths if path]
+        if not paths:
+            return None
+
+        with self._lock:
+            self._read_ahead_generation += 1
+            generation = self._read_ahead_generation
+
+        def worker():
+            for path in paths:
+                if generation != self._read_ahead_generation:
+                    return
+                self._read(path, read_ahead=True)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
+
+    def get_metrics(self):
+        """Попадания, промахи и файлы, прочитанные заранее"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['files'] = len(self._files)
+        return metrics
@@ -0,0 +1,208 @@
+"""Версионные миграции схемы БД портфолио
+
+Используются и приложением (DatabaseManager), и скриптом setup_database.py.
+Номер примененной версии хранится в таблице schema_version (в SQLite - в
+PRAGMA user_version). Все шаги идемпотентны (IF NOT EXISTS), поэтому база,
+созданная любым из путей, приводится к текущей схеме без потери данных.
+"""
+
+# Ключ блокировки, чтобы два экземпляра приложения не мигрировали одновременно
+MIGRATION_LOCK_KEY = 20240501
+
+MIGRATIONS = [
+    (1, "Таблицы", [
+        """
+        CREATE TABLE IF NOT EXISTS entries (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            entry_type VARCHAR(100) NOT NULL,
+            year INTEGER,
+            file_path VARCHAR(500) UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS coauthors (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL UNIQUE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS entry_coauthors (
+            entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE,
+            coauthor_id INTEGER REFERENCES coauthors(id) ON DELETE CASCADE,
+            PRIMARY KEY (entry_id, coauthor_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id SERIAL PRIMARY KEY,
+            date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            description TEXT NOT NULL,
+            entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE
+        )
+        """,
+    ]),
+    (2, "Индексы сортировки и журнала", [
+        "CREATE INDEX IF NOT EXISTS idx_entries_type ON entries(entry_type)",
+        "CREATE INDEX IF NOT EXISTS idx_entries_year ON entries(year)",
+        "CREATE INDEX IF NOT EXISTS idx_entries_created ON entries(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_entries_title ON entries(title)",
+        "CREATE INDEX IF NOT EXISTS idx_activity_date ON activity_log(date)",
+    ]),
+    (3, "Индексы внешних ключей для соединений и каскадного удаления", [
+        "CREATE INDEX IF NOT EXISTS idx_entry_coauthors_coauthor ON entry_coauthors(coauthor_id)",
+        "CREATE INDEX IF NOT EXISTS idx_activity_entry ON activity_log(entry_id)",
+    ]),
+    (4, "Индекс сортировки по названию без учета регистра", [
+        """CREATE INDEX IF NOT EXISTS idx_entries_title_lower
+           ON entries ((replace(lower(title), 'ё', 'е')) COLLATE "C", id)""",
+        # Список больше не сортируется по title как есть
+        "DROP INDEX IF EXISTS idx_entries_title",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Для SQLite отличаются создание таблиц и индекс по названию: индекс по
+# функции приложения unicode_lower сделал бы файл БД нечитаемым без нее
+SQLITE_MIGRATIONS = [
+    (1, "Таблицы", [
+        """
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title VARCHAR(255) NOT NULL,
+            entry_type VARCHAR(100) NOT NULL,
+            year INTEGER,
+            file_path VARCHAR(500) UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+            updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS coauthors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(255) NOT NULL UNIQUE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS entry_coauthors (
+            entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE,
+            coauthor_id INTEGER REFERENCES coauthors(id) ON DELETE CASCADE,
+            PRIMARY KEY (entry_id, coauthor_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+            description TEXT NOT NULL,
+            entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE
+        )
+        """,
+    ]),
+] + MIGRATIONS[1:3] + [
+    (4, "Индекс сортировки по названию без учета регистра", [
+        "DROP INDEX IF EXISTS idx_entries_title",
+    ]),
+]
+
+# Триграммный поиск зависит от расширения pg_trgm, на создание которого
+# может не быть прав, поэтому он не входит в обязательные миграции
+SEARCH_INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_entries_title_trgm ON entries USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_coauthors_name_trgm ON coauthors USING gin (name gin_trgm_ops)",
+]
+
+
+def get_schema_version(cursor):
+    """Номер последней примененной миграции (0 для новой БД)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def migrate(connection):
+    """Применение недостающих миграций одной транзакцией
+
+    Возвращает список примененных версий. При ошибке транзакция
+    откатывается и схема остается в прежнем состоянии.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_KEY,))
+        current = get_schema_version(cursor)
+
+        applied = []
+        for version, description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description))
+            applied.append(version)
+
+        connection.commit()
+        return applied
+
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def migrate_sqlite(connection):
+    """Применение недостающих миграций SQLite одной транзакцией"""
+    cursor = connection.cursor()
+    try:
+        # BEGIN IMMEDIATE сразу берет блокировку записи, как pg_advisory_xact_lock
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("PRAGMA user_version")
+        current = cursor.fetchone()[0]
+
+        applied = []
+        for version, description, statements in SQLITE_MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+            applied.append(version)
+
+        if applied:
+            cursor.execute(f"PRAGMA user_version = {applied[-1]}")
+        connection.commit()
+        return applied
+
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def create_search_indexes(connection):
+    """Создание индексов pg_trgm, возвращает False, если расширение недоступно"""
+    cursor = connection.cursor()
+    try:
+        for statement in SEARCH_INDEXES:
+            cursor.execute(statement)
+        connection.commit()
+        return True
+
+    except Exception as e:
+        connection.rollback()
+        print(f"⚠ Поиск без индексов pg_trgm: {e}")
+        return False
+    finally:
+        cursor.close()
@@ -4,28 +4,24 @@ from datetime import datetime
 from pathlib import Path
 import os
 import sys
-import threading
 import webbrowser
-import matplotlib
-
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as ExcelImage
-from openpyxl.styles import Font as ExcelFont, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Импортируем менеджер БД
-from database_manager import DatabaseManager
+from database_manager import create_database_manager
+from file_cache import FileContentCache
+from sort_index import EntrySortIndex
+from report_jobs import ReportJobQueue
+import reports
 
 
 class ResearchPortfolioApp:
     """Главное приложение электронного портфолио"""
 
+    # Ожидание остановки потока отчетов при выходе (секунды)
+    REPORT_SHUTDOWN_TIMEOUT = 5
+
     def __init__(self, root):
         self.root = root
         self.root.title("Электронный портфолио исследователя")
@@ -33,8 +29,8 @@ class ResearchPortfolioApp:
         self.center_window()
 
         # Инициализация БД
-        self.db = DatabaseManager()
-        if not self.db.connection:
+        self.db = create_database_manager()
+        if not self.db.connected:
             messagebox.showerror("Ошибка", "Не удалось подключиться к базе данных!")
             sys.exit(1)
 
@@ -42,6 +38,31 @@ class ResearchPortfolioApp:
         self.current_entry_id = None
         self.current_file_path = None
 
+        # Кэш файлов описаний записей
+        self.files = FileContentCache()
+
+        # Пул процессов для построения отчетов (создается при первом отчете)
+        self.report_pool = None
+
+        # Очередь заданий на отчеты и окна их хода выполнения
+        self.report_jobs = ReportJobQueue(self.db, self.get_report_pool)
+        self.report_dialogs = {}
+        self.report_poll_id = None
+
+        # Постраничная загрузка списка: сортировка и ключ следующей страницы
+        self.sort_by = "created_at"
+        self.sort_order = "DESC"
+        self.next_page_key = None
+        self.loading_page = False
+
+        # Ключи сортировки загруженных записей для смены порядка без запроса к БД
+        self.entry_index = EntrySortIndex()
+
+        # Отложенный поиск: запрос выполняется после паузы в наборе текста
+        self.search_delay = 300
+        self.search_after_id = None
+        self.shown_search = ""
+
         # Цвета
         self.colors = {
             'primary': '#2C3E50',
@@ -51,12 +72,10 @@ class ResearchPortfolioApp:
             'light': '#ECF0F1'
         }
 
-        # Создание интерфейса
+        # Создание интерфейса (записи загружаются при первом открытии вкладки редактирования)
+        self.tree = None
         self.create_interface()
 
-        # Загрузка записей
-        self.load_entries()
-
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def center_window(self):
@@ -74,19 +93,37 @@ class ResearchPortfolioApp:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
 
-        # Вкладки
-        self.create_tab()
-        self.edit_tab()
-        self.analytics_tab()
+        # Вкладки: до первого открытия добавляется только пустая рамка,
+        # сразу строится лишь первая, видимая при запуске
+        self.tab_builders = {}
+        first_tab = self.add_tab(self.create_tab, '➕ Создание')
+        self.add_tab(self.edit_tab, '✏️ Редактирование')
+        self.analytics_frame = self.add_tab(self.analytics_tab, '📊 Аналитика')
+        self.build_tab(first_tab)
+
+        # Вкладка строится при первом открытии, статистика обновляется при каждом
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
 
         # Статус бар
         self.status_bar = tk.Label(self.root, text="Готово", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
-    def create_tab(self):
-        """Вкладка создания записей"""
+    def add_tab(self, builder, text):
+        """Пустая вкладка, содержимое которой строит builder при первом открытии"""
         tab = ttk.Frame(self.notebook)
-
+        self.notebook.add(tab, text=text)
+        self.tab_builders[str(tab)] = (builder, tab)
+        return tab
+
+    def build_tab(self, tab):
+        """Построение содержимого вкладки, если оно еще не построено"""
+        pending = self.tab_builders.pop(str(tab), None)
+        if pending:
+            builder, frame = pending
+            builder(frame)
+
+    def create_tab(self, tab):
+        """Вкладка создания записей"""
         # Заголовок
         tk.Label(tab, text="Создание новой записи", font=('Arial', 14, 'bold'),
                  fg=self.colors['primary']).pack(pady=20)
@@ -177,12 +214,8 @@ class ResearchPortfolioApp:
                                padx=20, pady=10, cursor='hand2')
         create_btn.pack(pady=20)
 
-        self.notebook.add(tab, text='➕ Создание')
-
-    def edit_tab(self):
+    def edit_tab(self, tab):
         """Вкладка редактирования"""
-        tab = ttk.Frame(self.notebook)
-
         # Панель с разделителем
         paned = ttk.PanedWindow(tab, orient=tk.HORIZONTAL)
         paned.pack(fill='both', expand=True, padx=10, pady=10)
@@ -199,6 +232,17 @@ class ResearchPortfolioApp:
         ttk.Button(toolbar, text="Сортировка",
                    command=self.sort_entries).pack(side=tk.LEFT)
 
+        # Поиск по названию и соавторам
+        search_frame = ttk.Frame(left_panel)
+        search_frame.pack(fill='x', pady=(0, 10))
+
+        tk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT, padx=(0, 10))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, fill='x', expand=True)
+        search_entry.bind('<KeyRelease>', self.on_search_changed)
+        search_entry.bind('<Escape>', self.clear_search)
+
         # Treeview
         tree_frame = ttk.Frame(left_panel)
         tree_frame.pack(fill='both', expand=True)
@@ -206,7 +250,8 @@ class ResearchPortfolioApp:
         scrollbar = ttk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.tree = ttk.Treeview(tree_frame, yscrollcommand=scrollbar.set,
+        self.tree_scrollbar = scrollbar
+        self.tree = ttk.Treeview(tree_frame, yscrollcommand=self.on_tree_scroll,
                                  selectmode='browse', height=20)
         scrollbar.config(command=self.tree.yview)
 
@@ -252,6 +297,12 @@ class ResearchPortfolioApp:
         self.edit_year.grid(row=row, column=1, pady=10, padx=(10, 0))
         row += 1
 
+        tk.Label(edit_frame, text="Соавторы:").grid(row=row, column=0, sticky='nw', pady=10)
+        self.edit_coauthors = tk.Label(edit_frame, text="", anchor='w', justify=tk.LEFT,
+                                       wraplength=350)
+        self.edit_coauthors.grid(row=row, column=1, sticky='w', pady=10, padx=(10, 0))
+        row += 1
+
         tk.Label(edit_frame, text="Описание:").grid(row=row, column=0, sticky='nw', pady=(10, 0))
 
         # Текстовое поле с скроллбаром
@@ -288,12 +339,11 @@ class ResearchPortfolioApp:
 
         paned.add(right_panel, weight=1)
 
-        self.notebook.add(tab, text='✏️ Редактирование')
+        # Загрузка записей
+        self.load_entries()
 
-    def analytics_tab(self):
+    def analytics_tab(self, tab):
         """Вкладка аналитики"""
-        tab = ttk.Frame(self.notebook)
-
         tk.Label(tab, text="Аналитика и отчётность",
                  font=('Arial', 14, 'bold'), fg=self.colors['primary']).pack(pady=30)
 
@@ -322,19 +372,80 @@ class ResearchPortfolioApp:
                                "• Список последних записей")
         self.stats_text.config(state='disabled')
 
-        self.notebook.add(tab, text='📊 Аналитика')
+    def on_tab_changed(self, event):
+        """Обработка переключения вкладок"""
+        self.build_tab(self.notebook.select())
+        if self.notebook.select() == str(self.analytics_frame):
+            self.refresh_statistics()
+
+    def refresh_statistics(self):
+        """Обновление статистики на вкладке аналитики"""
+        self.display_statistics(self.db.get_statistics())
 
     def load_entries(self):
-        """Загрузка записей"""
+        """Загрузка первой страницы записей в текущей сортировке или результатов поиска"""
+        if self.tree is None:
+            # Вкладка редактирования еще не открывалась - записи загрузятся при открытии
+            return
+
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self.entry_index.clear()
+
+        self.next_page_key = None
+        query = self.search_var.get().strip()
+        self.shown_search = query
+        if query:
+            entries = self.db.search_entries(query)
+            for entry in entries:
+                self.entry_index.add(self.tree.insert('', 'end', values=entry), entry)
+            self.update_status(f"Найдено записей: {len(entries)}")
+        else:
+            self.load_more_entries(first_page=True)
+
+    def on_search_changed(self, event=None):
+        """Изменение строки поиска: запрос откладывается до паузы в наборе"""
+        if self.search_after_id:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(self.search_delay, self.run_search)
+
+    def run_search(self):
+        """Выполнение отложенного поиска"""
+        self.search_after_id = None
+        # Клавиши без изменения текста (стрелки, Shift) не повторяют запрос
+        if self.search_var.get().strip() != self.shown_search:
+            self.load_entries()
+
+    def clear_search(self, event=None):
+        """Сброс поиска и возврат к списку записей"""
+        self.search_var.set("")
+        self.on_search_changed()
+
+    def load_more_entries(self, first_page=False):
+        """Догрузка следующей страницы записей в конец списка"""
+        if self.loading_page or (not first_page and self.next_page_key is None):
+            return
 
-        entries = self.db.get_entries()
+        self.loading_page = True
+        try:
+            entries, self.next_page_key = self.db.get_entries_page(
+                self.sort_by, self.sort_order, self.next_page_key)
+        finally:
+            self.loading_page = False
 
         for entry in entries:
-            self.tree.insert('', 'end', values=entry)
+            self.entry_index.add(self.tree.insert('', 'end', values=entry), entry)
+
+        loaded = len(self.entry_index)
+        more = " (прокрутите вниз, чтобы загрузить еще)" if self.next_page_key else ""
+        self.update_status(f"Загружено записей: {loaded}{more}")
 
-        self.update_status(f"Загружено записей: {len(entries)}")
+    def on_tree_scroll(self, first, last):
+        """Прокрутка списка: догрузка страницы при приближении к концу"""
+        self.tree_scrollbar.set(first, last)
+        if self.next_page_key is not None and float(last) > 0.9:
+            # Догрузка после обработки текущего события прокрутки
+            self.root.after_idle(self.load_more_entries)
 
     def on_tree_select(self, event):
         """Обработка выбора записи"""
@@ -348,33 +459,52 @@ class ResearchPortfolioApp:
         if values:
             self.current_entry_id = int(values[0])
 
+            # Поля записи и соавторы одним запросом (или из кэша)
+            detail = self.db.get_entry_detail(self.current_entry_id)
+            if not detail:
+                return
+
             self.edit_title.delete(0, tk.END)
-            self.edit_title.insert(0, values[1])
+            self.edit_title.insert(0, detail['title'])
 
-            self.edit_type.set(values[2])
+            self.edit_type.set(detail['entry_type'])
 
             self.edit_year.delete(0, tk.END)
-            self.edit_year.insert(0, values[3])
+            self.edit_year.insert(0, detail['year'] if detail['year'] is not None else '')
+
+            self.edit_coauthors.config(text=", ".join(detail['coauthors']) or "—")
 
-            # Получаем путь к файлу
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT file_path FROM entries WHERE id = %s", (self.current_entry_id,))
-            result = cursor.fetchone()
-            cursor.close()
+            file_path = detail['file_path']
 
-            if result:
-                self.current_file_path = result[0]
+            if file_path:
+                self.current_file_path = file_path
 
-                if os.path.exists(self.current_file_path):
-                    with open(self.current_file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        self.edit_description.delete('1.0', tk.END)
-                        self.edit_description.insert('1.0', content)
+                content = self.files.read(self.current_file_path)
+                self.edit_description.delete('1.0', tk.END)
+                if content is not None:
+                    self.edit_description.insert('1.0', content)
+
+            # Файлы соседних записей читаются заранее для быстрого перехода стрелками
+            self.files.read_ahead(self.neighbour_file_paths(item))
 
             self.save_btn.config(state='normal')
             self.delete_btn.config(state='normal')
             self.open_file_btn.config(state='normal')
 
+    def neighbour_file_paths(self, item):
+        """Пути к файлам записей рядом с выбранной в списке"""
+        paths = []
+        for step in (self.tree.next, self.tree.prev):
+            neighbour = item
+            for _ in range(self.files.READ_AHEAD):
+                neighbour = step(neighbour)
+                if not neighbour:
+                    break
+                values = self.tree.item(neighbour, 'values')
+                if len(values) > 5:
+                    paths.append(values[5])
+        return paths
+
     def create_entry(self):
         """Создание записи"""
         title = self.title_entry.get().strip()
@@ -411,13 +541,9 @@ class ResearchPortfolioApp:
         file_path = files_dir / filename
 
         try:
-            entry_id = self.db.create_entry(title, entry_type, year_int, str(file_path))
-
-            # Добавляем соавторов
-            for i in range(self.coauthors_listbox.size()):
-                coauthor = self.coauthors_listbox.get(i)
-                if coauthor.strip():
-                    self.db.add_coauthor(entry_id, coauthor)
+            # Запись и соавторы сохраняются одной транзакцией
+            coauthors = self.coauthors_listbox.get(0, tk.END)
+            entry_id = self.db.create_entry(title, entry_type, year_int, str(file_path), coauthors)
 
             # Сохраняем файл
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -500,8 +626,7 @@ class ResearchPortfolioApp:
             self.db.update_entry(self.current_entry_id, title, entry_type, year_int)
 
             if self.current_file_path and os.path.exists(self.current_file_path):
-                with open(self.current_file_path, 'w', encoding='utf-8') as f:
-                    f.write(description)
+                self.files.write(self.current_file_path, description)
 
             self.load_entries()
             messagebox.showinfo("Успех", "Изменения сохранены!")
@@ -521,11 +646,13 @@ class ResearchPortfolioApp:
         try:
             if self.current_file_path and os.path.exists(self.current_file_path):
                 os.remove(self.current_file_path)
+                self.files.discard(self.current_file_path)
 
             self.db.delete_entry(self.current_entry_id)
 
             self.edit_title.delete(0, tk.END)
             self.edit_year.delete(0, tk.END)
+            self.edit_coauthors.config(text="")
             self.edit_description.delete('1.0', tk.END)
 
             self.save_btn.config(state='disabled')
@@ -592,14 +719,12 @@ class ResearchPortfolioApp:
             }
 
             if selected in sort_map:
-                sort_by, sort_order = sort_map[selected]
-
-                for item in self.tree.get_children():
-                    self.tree.delete(item)
-
-                entries = self.db.get_entries(sort_by, sort_order)
-                for entry in entries:
-                    self.tree.insert('', 'end', values=entry)
+                self.sort_by, self.sort_order = sort_map[selected]
+                if self.next_page_key is None:
+                    # Загружен весь список - строки переставляются без запроса к БД
+                    self.reorder_entries()
+                else:
+                    self.load_entries()
 
                 self.update_status(f"Сортировка: {selected}")
 
@@ -613,27 +738,38 @@ class ResearchPortfolioApp:
         ttk.Button(button_frame, text="Отмена",
                    command=sort_dialog.destroy).pack(side=tk.LEFT)
 
+    def reorder_entries(self):
+        """Перестановка загруженных строк списка в текущей сортировке"""
+        ordered = self.entry_index.ordered(self.sort_by, self.sort_order)
+        for position, item in enumerate(ordered):
+            self.tree.move(item, '', position)
+
     def generate_report(self):
         """Генерация отчетов"""
-        entries = self.db.get_entries()
+        entries, _ = self.db.get_entries_page(limit=1)
         if not entries:
             if not messagebox.askyesno("Нет данных",
                                        "В базе нет записей. Создать отчет с нулевыми данными?"):
                 return
 
-        # Создаем диалог прогресса
+        # Отчет ставится в очередь: задания выполняются по одному
+        job = self.report_jobs.submit()
+        self.create_progress_dialog(job)
+        self.poll_report_events()
+
+    def create_progress_dialog(self, job):
+        """Окно хода выполнения задания с кнопкой отмены"""
         progress = tk.Toplevel(self.root)
-        progress.title("Генерация отчетов")
-        progress.geometry("400x150")
+        progress.title(f"Генерация отчетов #{job.id}")
+        progress.geometry("400x170")
         progress.transient(self.root)
-        progress.grab_set()
 
         progress.update_idletasks()
         x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (400 // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (150 // 2)
+        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (170 // 2)
         progress.geometry(f"+{x}+{y}")
 
-        tk.Label(progress, text="Идет генерация отчетов...").pack(pady=20)
+        tk.Label(progress, text="Идет генерация отчетов...").pack(pady=(20, 10))
 
         progress_var = tk.IntVar()
         progress_bar = ttk.Progressbar(progress, variable=progress_var, maximum=100)
@@ -642,260 +778,87 @@ class ResearchPortfolioApp:
         status_label = tk.Label(progress, text="Подготовка...")
         status_label.pack()
 
-        def update_progress(value, status):
-            progress_var.set(value)
-            status_label.config(text=status)
-            progress.update()
+        def cancel():
+            job.cancel()
+            status_label.config(text="Отмена после текущего этапа...")
+            cancel_button.config(state='disabled')
 
-        def generate_in_thread():
-            try:
-                update_progress(10, "Получение статистики...")
+        cancel_button = ttk.Button(progress, text="Отмена", command=cancel)
+        cancel_button.pack(pady=10)
+        progress.protocol("WM_DELETE_WINDOW", cancel)
 
-                # Получаем статистику
-                stats = self.db.get_statistics()
+        self.report_dialogs[job.id] = (progress, progress_var, status_label)
 
-                update_progress(30, "Создание папок...")
+    def poll_report_events(self):
+        """Разбор событий заданий в потоке Tk
 
-                # Создаем папки
-                reports_dir = Path("reports")
-                reports_dir.mkdir(exist_ok=True)
-
-                update_progress(40, "Создание графиков...")
-
-                # Создаем графики
-                self.create_charts(stats)
-
-                update_progress(60, "Генерация Excel...")
-
-                # Генерируем Excel
-                excel_path = self.generate_excel(stats)
-
-                update_progress(80, "Генерация Word...")
-
-                # Генерируем Word
-                word_path = self.generate_word(stats)
-
-                update_progress(100, "Завершение...")
-
-                # Обновляем статистику в интерфейсе
-                self.display_statistics(stats)
-
-                progress.destroy()
-
-                messagebox.showinfo("Успех",
-                                    f"✅ Отчеты созданы!\n\n"
-                                    f"Excel: {excel_path}\n"
-                                    f"Word: {word_path}")
-
-                self.update_status("Отчеты сгенерированы")
-
-            except Exception as e:
-                progress.destroy()
-                messagebox.showerror("Ошибка", f"Ошибка:\n{str(e)}")
-
-        thread = threading.Thread(target=generate_in_thread)
-        thread.daemon = True
-        thread.start()
-
-        self.root.after(100, lambda: self.check_thread(thread, progress))
-
-    def check_thread(self, thread, progress):
-        """Проверка потока"""
-        if thread.is_alive():
-            self.root.after(100, lambda: self.check_thread(thread, progress))
-
-    def create_charts(self, stats):
-        """Создание графиков"""
-        reports_dir = Path("reports")
-
-        # График распределения по типам
-        if stats['type_distribution']:
-            plt.figure(figsize=(10, 6))
-            types = list(stats['type_distribution'].keys())
-            counts = list(stats['type_distribution'].values())
-
-            colors = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#F44336']
-            bars = plt.bar(types, counts, color=colors[:len(types)], edgecolor='black')
-
-            plt.title('Распределение записей по типам', fontsize=14, fontweight='bold')
-            plt.xlabel('Тип записи')
-            plt.ylabel('Количество')
-            plt.xticks(rotation=45, ha='right')
-            plt.grid(axis='y', alpha=0.3)
-
-            for bar, count in zip(bars, counts):
-                plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                         str(count), ha='center', va='bottom')
-
-            plt.tight_layout()
-            plt.savefig(reports_dir / 'type_distribution.png', dpi=300)
-            plt.close()
-
-        # График распределения по годам
-        if stats['year_distribution']:
-            plt.figure(figsize=(12, 6))
-            years = sorted(stats['year_distribution'].keys())
-            counts = [stats['year_distribution'][y] for y in years]
-
-            plt.bar([str(y) for y in years], counts, color='#2196F3', edgecolor='black')
-            plt.title('Динамика по годам', fontsize=14, fontweight='bold')
-            plt.xlabel('Год')
-            plt.ylabel('Количество записей')
-            plt.grid(axis='y', alpha=0.3)
-
-            plt.tight_layout()
-            plt.savefig(reports_dir / 'year_distribution.png', dpi=300)
-            plt.close()
-
-    def generate_excel(self, stats):
-        """Генерация Excel отчета"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Статистика"
-
-        # Заголовок
-        ws.merge_cells('A1:D1')
-        title_cell = ws['A1']
-        title_cell.value = "Отчет по портфолио исследователя"
-        title_cell.font = ExcelFont(bold=True, size=16)
-        title_cell.alignment = Alignment(horizontal='center')
-
-        ws['A2'] = f"Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-
-        # Ключевые показатели
-        ws['A4'] = "Ключевые показатели:"
-        ws['A4'].font = ExcelFont(bold=True)
-
-        data = [
-            ["Показатель", "Значение"],
-            ["Всего записей", stats['total_entries']],
-            ["Уникальных соавторов", stats['unique_coauthors']],
-            ["Типов записей", len(stats['type_distribution'])],
-        ]
-
-        for i, row in enumerate(data, start=5):
-            for j, value in enumerate(row, start=1):
-                cell = ws.cell(row=i, column=j, value=value)
-                if i == 5:
-                    cell.font = ExcelFont(bold=True)
-                    cell.fill = PatternFill(start_color="DDDDDD", fill_type="solid")
-
-        # Распределение по типам
-        start_row = 10
-        ws.cell(row=start_row, column=1, value="Распределение по типам:").font = ExcelFont(bold=True)
-
-        if stats['type_distribution']:
-            row = start_row + 1
-            for entry_type, count in stats['type_distribution'].items():
-                ws.cell(row=row, column=1, value=entry_type)
-                ws.cell(row=row, column=2, value=count)
-                row += 1
-
-        # Лист с графиками
-        ws2 = wb.create_sheet("Графики")
-
-        if os.path.exists("reports/type_distribution.png"):
-            img = ExcelImage("reports/type_distribution.png")
-            img.width = 500
-            img.height = 300
-            ws2.add_image(img, 'A1')
-
-        if os.path.exists("reports/year_distribution.png"):
-            img = ExcelImage("reports/year_distribution.png")
-            img.width = 500
-            img.height = 300
-            ws2.add_image(img, 'A20')
-
-        # Сохраняем
-        excel_path = "reports/portfolio_report.xlsx"
-        wb.save(excel_path)
-
-        return excel_path
-
-    def generate_word(self, stats):
-        """Генерация Word отчета"""
-        doc = Document()
-
-        # Стили
-        style = doc.styles['Normal']
-        style.font.name = 'Times New Roman'
-        style.font.size = Pt(12)
-
-        # Титульный лист
-        title = doc.add_paragraph()
-        title_run = title.add_run('ОТЧЕТ\nпо портфолио исследователя')
-        title_run.font.name = 'Times New Roman'
-        title_run.font.size = Pt(20)
-        title_run.font.bold = True
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        doc.add_paragraph('\n')
-
-        date_para = doc.add_paragraph()
-        date_run = date_para.add_run(f'Дата: {datetime.now().strftime("%d.%m.%Y %H:%M")}')
-        date_run.font.name = 'Times New Roman'
-        date_run.font.size = Pt(14)
-        date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        doc.add_page_break()
-
-        # Ключевые показатели
-        doc.add_heading('Ключевые показатели', level=1)
-
-        table_data = [
-            ['Показатель', 'Значение'],
-            ['Всего записей', str(stats['total_entries'])],
-            ['Уникальных соавторов', str(stats['unique_coauthors'])],
-            ['Типов записей', str(len(stats['type_distribution']))],
-        ]
-
-        table = doc.add_table(rows=4, cols=2)
-        table.style = 'LightShading'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-        for i, row_data in enumerate(table_data):
-            row = table.rows[i]
-            for j, cell_data in enumerate(row_data):
-                cell = row.cells[j]
-                cell.text = str(cell_data)
-
-        # Графики
-        doc.add_heading('Визуализация данных', level=1)
-
-        if os.path.exists("reports/type_distribution.png"):
-            doc.add_paragraph('Распределение по типам:')
-            doc.add_picture("reports/type_distribution.png", width=Inches(6))
-            doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        doc.add_page_break()
+        Рабочий поток только кладет события в очередь, а окна обновляются
+        здесь; опрос продолжается, пока есть открытые окна заданий.
+        """
+        if self.report_poll_id is not None:
+            return
 
-        if os.path.exists("reports/year_distribution.png"):
-            doc.add_paragraph('Динамика по годам:')
-            doc.add_picture("reports/year_distribution.png", width=Inches(6))
-            doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        def poll():
+            self.report_poll_id = None
+            for kind, job_id, data in self.report_jobs.get_events():
+                self.handle_report_event(kind, job_id, data)
+            if self.report_dialogs:
+                self.report_poll_id = self.root.after(100, poll)
 
-        # Последние записи
-        doc.add_page_break()
-        doc.add_heading('Последние записи', level=1)
+        poll()
 
-        if stats['recent_entries']:
-            table = doc.add_table(rows=len(stats['recent_entries']) + 1, cols=4)
-            table.style = 'LightShading'
+    def handle_report_event(self, kind, job_id, data):
+        """Обновление окна задания по событию из очереди"""
+        dialog = self.report_dialogs.get(job_id)
+        if dialog is None:
+            return
+        progress, progress_var, status_label = dialog
 
-            headers = ['Название', 'Тип', 'Год', 'Дата создания']
-            for i, header in enumerate(headers):
-                table.cell(0, i).text = header
-                table.cell(0, i).paragraphs[0].runs[0].font.bold = True
+        if kind == 'queued':
+            if data['position'] > 1:
+                status_label.config(text=f"В очереди: {data['position'] - 1} задание(й) впереди")
+            return
+        if kind == 'progress':
+            progress_var.set(data['value'])
+            status_label.config(text=data['status'])
+            return
 
-            for i, entry in enumerate(stats['recent_entries'], start=1):
-                for j, value in enumerate(entry):
-                    table.cell(i, j).text = str(value) if value is not None else ""
+        # Задание завершено
+        del self.report_dialogs[job_id]
+        progress.destroy()
+
+        if kind == 'done':
+            result = data['result']
+            timings = ", ".join(f"{reports.STAGE_TITLES[stage]} {seconds:.1f} с"
+                                for stage, seconds in result['timings'].items())
+            cache = result['chart_cache']
+
+            # Обновляем статистику в интерфейсе
+            self.display_statistics(data['stats'])
+
+            messagebox.showinfo("Успех",
+                                f"✅ Отчеты созданы!\n\n"
+                                f"Excel: {result['excel']}\n"
+                                f"Word: {result['word']}\n\n"
+                                f"Время этапов: {timings}\n"
+                                f"Графики из кэша: {cache['hits']}, построено: {cache['misses']}")
+
+            self.update_status("Отчеты сгенерированы")
+        elif kind == 'cancelled':
+            self.update_status("Генерация отчетов отменена")
+        else:
+            messagebox.showerror("Ошибка", f"Ошибка:\n{data['message']}")
 
-        # Сохраняем
-        word_path = "reports/portfolio_report.docx"
-        doc.save(word_path)
+    def get_report_pool(self):
+        """Пул процессов для графиков и документов
 
-        return word_path
+        Процессы запускаются через spawn: fork из многопоточного процесса
+        с Tk небезопасен.
+        """
+        if self.report_pool is None:
+            self.report_pool = ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context('spawn'))
+        return self.report_pool
 
     def display_statistics(self, stats):
         """Отображение статистики"""
@@ -933,8 +896,13 @@ class ResearchPortfolioApp:
     def on_closing(self):
         """Обработка закрытия"""
         if messagebox.askokcancel("Выход", "Вы уверены, что хотите выйти?"):
+            # Поток отчетов может быть внутри запроса к БД - ждем его до закрытия пула
+            if not self.report_jobs.shutdown(wait=True, timeout=self.REPORT_SHUTDOWN_TIMEOUT):
+                print("⚠ Генерация отчета не завершилась до закрытия БД")
             if hasattr(self, 'db'):
                 self.db.close()
+            if self.report_pool:
+                self.report_pool.shutdown(wait=False, cancel_futures=True)
             self.root.destroy()
 
 
@@ -0,0 +1,170 @@
+from collections import deque
+import math
+import re
+import sys
+import threading
+import time
+
+
+# Запросы, для которых строится план
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+# Запросы, которые EXPLAIN ANALYZE не должен выполнять повторно
+MODIFYING_QUERY = re.compile(r"\b(INSERT|UPDATE|DELETE|CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
+
+class QueryProfiler:
+    """Время выполнения запросов DatabaseManager
+
+    Для каждого метода считаются количество запросов, суммарное время и
+    95-й перцентиль. Запросы дольше порога печатаются вместе с планом
+    EXPLAIN (ANALYZE, BUFFERS).
+    """
+
+    # Количество последних замеров метода для расчета перцентиля
+    SAMPLES = 1000
+
+    def __init__(self, slow_threshold=0.2, explain=True, log_file=None):
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self.log_file = log_file or sys.stderr
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def record(self, method, seconds):
+        """Учет одного запроса"""
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    'count': 0,
+                    'total': 0.0,
+                    'max': 0.0,
+                    'samples': deque(maxlen=self.SAMPLES)
+                }
+            stats['count'] += 1
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['samples'].append(seconds)
+
+    def log_slow_query(self, method, seconds, query, plan):
+        """Запись медленного запроса в журнал"""
+        lines = [f"🐢 Медленный запрос {method}: {seconds * 1000:.1f} мс", query.strip()]
+        if plan:
+            lines.append("План:")
+            lines.extend(f"    {line}" for line in plan)
+        print("\n".join(lines), file=self.log_file)
+
+    def summary(self):
+        """Статистика по методам: количество, время (с) и p95 (с)"""
+        with self._lock:
+            result = {}
+            for method, stats in self._methods.items():
+                samples = sorted(stats['samples'])
+                p95 = samples[math.ceil(len(samples) * 0.95) - 1]
+                result[method] = {
+                    'count': stats['count'],
+                    'total': stats['total'],
+                    'avg': stats['total'] / stats['count'],
+                    'p95': p95,
+                    'max': stats['max']
+                }
+            return result
+
+    def format_summary(self):
+        """Сводка в виде таблицы, самые затратные методы первыми"""
+        summary = self.summary()
+        if not summary:
+            return "Запросы не выполнялись"
+
+        lines = [f"{'Метод':<28}{'Запросов':>10}{'Всего, мс':>12}{'p95, мс':>10}{'Макс, мс':>10}"]
+        for method, stats in sorted(summary.items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{method:<28}{stats['count']:>10}{stats['total'] * 1000:>12.1f}"
+                         f"{stats['p95'] * 1000:>10.1f}{stats['max'] * 1000:>10.1f}")
+        return "\n".join(lines)
+
+
+class TimedConnection:
+    """Соединение, курсоры которого замеряют время запросов
+
+    Запросы учитываются под именем method - публичного метода
+    DatabaseManager, выдавшего соединение, а не вспомогательной функции,
+    которая вызвала execute.
+    """
+
+    def __init__(self, connection, profiler, method):
+        self._connection = connection
+        self._profiler = profiler
+        self._method = method
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._connection, self._connection.cursor(*args, **kwargs),
+                           self._profiler, self._method)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class TimedCursor:
+    """Курсор с замером времени execute"""
+
+    def __init__(self, connection, cursor, profiler, method):
+        self._connection = connection
+        self._cursor = cursor
+        self._profiler = profiler
+        self._method = method
+
+    def execute(self, query, params=None):
+        method = self._method
+        started = time.perf_counter()
+        try:
+            result = self._cursor.execute(query, params)
+        finally:
+            seconds = time.perf_counter() - started
+            self._profiler.record(method, seconds)
+
+        if seconds >= self._profiler.slow_threshold:
+            self._log_slow_query(method, seconds, query, params)
+        return result
+
+    def _log_slow_query(self, method, seconds, query, params):
+        """Журнал медленного запроса с планом выполнения"""
+        text = self._cursor.mogrify(query, params)
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', errors='replace')
+
+        plan = None
+        if self._profiler.explain and text.lstrip().upper().startswith(EXPLAINABLE):
+            plan = self._explain(text)
+        self._profiler.log_slow_query(method, seconds, text, plan)
+
+    def _explain(self, text):
+        """План запроса внутри точки сохранения, чтобы ошибка не прервала транзакцию
+
+        ANALYZE повторно выполняет запрос, поэтому для изменяющих запросов
+        выводится только план без выполнения.
+        """
+        read_only = text.lstrip().upper().startswith(('SELECT', 'WITH')) and not MODIFYING_QUERY.search(text)
+        options = "ANALYZE, BUFFERS" if read_only else "COSTS"
+
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT query_profiler_explain")
+            try:
+                cursor.execute(f"EXPLAIN ({options}) {text}")
+                plan = [row[0] for row in cursor.fetchall()]
+                cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+                return plan
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+                return [f"План недоступен: {e}"]
+        except Exception as e:
+            return [f"План недоступен: {e}"]
+        finally:
+            cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,142 @@
+from itertools import count
+import queue
+import threading
+
+import reports
+
+
+class ReportJob:
+    """Задание на генерацию отчетов"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Отмена: задание в очереди пропускается, выполняемое
+        останавливается после текущего этапа"""
+        self.cancel_event.set()
+
+
+class ReportJobQueue:
+    """Очередь заданий на генерацию отчетов
+
+    Задания выполняются по одному в единственном рабочем потоке, поэтому
+    повторный запрос отчета не запускает параллельный поток, а ждет своей
+    очереди. Рабочий поток не обращается к Tk: о ходе выполнения он
+    сообщает событиями (kind, job_id, data) в очереди events, которую
+    интерфейс разбирает через after().
+
+    События: 'queued' (position), 'progress' (value, status),
+    'done' (stats, result), 'cancelled', 'error' (message).
+    """
+
+    def __init__(self, db, get_executor, reports_dir=reports.REPORTS_DIR):
+        self.db = db
+        self.get_executor = get_executor
+        self.reports_dir = reports_dir
+        self.events = queue.Queue()
+        self._jobs = queue.Queue()
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._active = 0
+        self._current = None
+
+    def submit(self):
+        """Постановка задания в очередь"""
+        job = ReportJob(next(self._ids))
+        with self._lock:
+            self._active += 1
+            position = self._active
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+        self.events.put(('queued', job.id, {'position': position}))
+        self._jobs.put(job)
+        return job
+
+    def get_events(self):
+        """Все накопившиеся события без ожидания"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self, wait=False, timeout=None):
+        """Отмена всех заданий и остановка рабочего потока
+
+        Задания из очереди пропускаются, выполняемое останавливается после
+        текущего этапа, после чего поток завершается. С wait=True вызов ждет
+        завершения потока (не дольше timeout секунд), чтобы после него можно
+        было закрыть БД. Возвращает True, если поток остановлен.
+        """
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            # None - признак остановки от предыдущего вызова shutdown
+            if job is not None:
+                job.cancel()
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+            thread = self._thread
+        self._jobs.put(None)
+
+        if thread is None:
+            return True
+        if wait:
+            thread.join(timeout)
+        return not thread.is_alive()
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            with self._lock:
+                self._current = job
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    self._current = None
+                    self._active -= 1
+
+    def _run(self, job):
+        """Выполнение задания с отправкой событий в очередь"""
+        def post(kind, **data):
+            self.events.put((kind, job.id, data))
+
+        def on_stage(stage, done, total, seconds):
+            post('progress', value=20 + 80 * done // total,
+                 status=f"{reports.STAGE_TITLES[stage]}: {seconds:.1f} с")
+
+        try:
+            if job.cancelled:
+                raise reports.ReportCancelled()
+
+            post('progress', value=10, status="Получение статистики...")
+
+            # Статистика получается один раз и передается всем этапам
+            stats = self.db.get_statistics()
+
+            post('progress', value=20, status="Создание графиков...")
+
+            # Графики строятся параллельно, документы - как только готовы графики
+            result = reports.build_reports(stats, self.get_executor(), self.reports_dir,
+                                           on_stage=on_stage, cancel_event=job.cancel_event)
+            post('done', stats=stats, result=result)
+
+        except reports.ReportCancelled:
+            post('cancelled')
+        except Exception as e:
+            post('error', message=str(e))
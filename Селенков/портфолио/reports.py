@@ -0,0 +1,380 @@
+"""Отчеты по портфолио: графики, Excel и Word
+
+Функции модуля не зависят от интерфейса, поэтому выполняются в пуле
+процессов: графики строятся параллельно, а документы собираются, как только
+готовы графики, которые в них вставляются.
+
+matplotlib, openpyxl и python-docx импортируются внутри функций, которые их
+используют: приложение импортирует модуль при запуске, а библиотеки нужны
+только процессам, строящим отчеты.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import time
+
+REPORTS_DIR = Path("reports")
+
+TYPE_CHART = 'type_distribution.png'
+YEAR_CHART = 'year_distribution.png'
+
+# Кэш графиков рядом с отчетами: файл называется по хэшу данных и параметров
+CHART_CACHE_DIR = 'chart_cache'
+
+# Сколько последних вариантов каждого графика хранить в кэше
+CHART_CACHE_SIZE = 5
+
+# Параметры графиков входят в ключ кэша: их изменение перестраивает график
+CHART_OPTIONS = {
+    'type_chart': {'figsize': [10, 6], 'dpi': 300, 'version': 1},
+    'year_chart': {'figsize': [12, 6], 'dpi': 300, 'version': 1},
+}
+
+# Названия этапов для окна прогресса
+STAGE_TITLES = {
+    'type_chart': "График по типам",
+    'year_chart': "График по годам",
+    'excel': "Excel",
+    'word': "Word"
+}
+
+
+class ReportCancelled(Exception):
+    """Генерация отчетов отменена пользователем"""
+
+
+def load_pyplot():
+    """matplotlib.pyplot без оконного бэкенда"""
+    import matplotlib
+
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render_type_chart(type_distribution, path, options=CHART_OPTIONS['type_chart']):
+    """График распределения по типам"""
+    plt = load_pyplot()
+    plt.figure(figsize=options['figsize'])
+    types = list(type_distribution.keys())
+    counts = list(type_distribution.values())
+
+    colors = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#F44336']
+    bars = plt.bar(types, counts, color=colors[:len(types)], edgecolor='black')
+
+    plt.title('Распределение записей по типам', fontsize=14, fontweight='bold')
+    plt.xlabel('Тип записи')
+    plt.ylabel('Количество')
+    plt.xticks(rotation=45, ha='right')
+    plt.grid(axis='y', alpha=0.3)
+
+    for bar, count in zip(bars, counts):
+        plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
+                 str(count), ha='center', va='bottom')
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=options['dpi'], format='png')
+    plt.close()
+    return path
+
+
+def render_year_chart(year_distribution, path, options=CHART_OPTIONS['year_chart']):
+    """График распределения по годам"""
+    plt = load_pyplot()
+    plt.figure(figsize=options['figsize'])
+    years = sorted(year_distribution.keys())
+    counts = [year_distribution[y] for y in years]
+
+    plt.bar([str(y) for y in years], counts, color='#2196F3', edgecolor='black')
+    plt.title('Динамика по годам', fontsize=14, fontweight='bold')
+    plt.xlabel('Год')
+    plt.ylabel('Количество записей')
+    plt.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=options['dpi'], format='png')
+    plt.close()
+    return path
+
+
+def chart_cache_key(stage, series, options):
+    """Хэш данных графика и его параметров"""
+    payload = json.dumps([stage, [[str(key), value] for key, value in series.items()], options],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def render_cached_chart(func, series, options, cache_path):
+    """Построение графика в файл кэша
+
+    График сначала пишется во временный файл, чтобы прерванная запись
+    не попала в кэш.
+    """
+    tmp_path = cache_path + '.tmp'
+    func(series, tmp_path, options)
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def prune_chart_cache(cache_dir, stage):
+    """Удаление старых вариантов графика сверх CHART_CACHE_SIZE"""
+    files = sorted(cache_dir.glob(f"{stage}_*.png"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in files[CHART_CACHE_SIZE:]:
+        path.unlink(missing_ok=True)
+
+
+def generate_excel(stats, charts, reports_dir=REPORTS_DIR):
+    """Генерация Excel отчета"""
+    from openpyxl import Workbook
+    from openpyxl.drawing.image import Image as ExcelImage
+    from openpyxl.styles import Font as ExcelFont, Alignment, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Статистика"
+
+    # Заголовок
+    ws.merge_cells('A1:D1')
+    title_cell = ws['A1']
+    title_cell.value = "Отчет по портфолио исследователя"
+    title_cell.font = ExcelFont(bold=True, size=16)
+    title_cell.alignment = Alignment(horizontal='center')
+
+    ws['A2'] = f"Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+
+    # Ключевые показатели
+    ws['A4'] = "Ключевые показатели:"
+    ws['A4'].font = ExcelFont(bold=True)
+
+    data = [
+        ["Показатель", "Значение"],
+        ["Всего записей", stats['total_entries']],
+        ["Уникальных соавторов", stats['unique_coauthors']],
+        ["Типов записей", len(stats['type_distribution'])],
+    ]
+
+    for i, row in enumerate(data, start=5):
+        for j, value in enumerate(row, start=1):
+            cell = ws.cell(row=i, column=j, value=value)
+            if i == 5:
+                cell.font = ExcelFont(bold=True)
+                cell.fill = PatternFill(start_color="DDDDDD", fill_type="solid")
+
+    # Распределение по типам
+    start_row = 10
+    ws.cell(row=start_row, column=1, value="Распределение по типам:").font = ExcelFont(bold=True)
+
+    if stats['type_distribution']:
+        row = start_row + 1
+        for entry_type, count in stats['type_distribution'].items():
+            ws.cell(row=row, column=1, value=entry_type)
+            ws.cell(row=row, column=2, value=count)
+            row += 1
+
+    # Лист с графиками
+    ws2 = wb.create_sheet("Графики")
+
+    for chart, anchor in (('type_chart', 'A1'), ('year_chart', 'A20')):
+        if charts.get(chart):
+            img = ExcelImage(charts[chart])
+            img.width = 500
+            img.height = 300
+            ws2.add_image(img, anchor)
+
+    # Сохраняем
+    excel_path = str(Path(reports_dir) / "portfolio_report.xlsx")
+    wb.save(excel_path)
+
+    return excel_path
+
+
+def generate_word(stats, charts, reports_dir=REPORTS_DIR):
+    """Генерация Word отчета"""
+    from docx import Document
+    from docx.shared import Inches, Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.table import WD_TABLE_ALIGNMENT
+
+    doc = Document()
+
+    # Стили
+    style = doc.styles['Normal']
+    style.font.name = 'Times New Roman'
+    style.font.size = Pt(12)
+
+    # Титульный лист
+    title = doc.add_paragraph()
+    title_run = title.add_run('ОТЧЕТ\nпо портфолио исследователя')
+    title_run.font.name = 'Times New Roman'
+    title_run.font.size = Pt(20)
+    title_run.font.bold = True
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_paragraph('\n')
+
+    date_para = doc.add_paragraph()
+    date_run = date_para.add_run(f'Дата: {datetime.now().strftime("%d.%m.%Y %H:%M")}')
+    date_run.font.name = 'Times New Roman'
+    date_run.font.size = Pt(14)
+    date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_page_break()
+
+    # Ключевые показатели
+    doc.add_heading('Ключевые показатели', level=1)
+
+    table_data = [
+        ['Показатель', 'Значение'],
+        ['Всего записей', str(stats['total_entries'])],
+        ['Уникальных соавторов', str(stats['unique_coauthors'])],
+        ['Типов записей', str(len(stats['type_distribution']))],
+    ]
+
+    table = doc.add_table(rows=4, cols=2)
+    table.style = 'LightShading'
+    table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+    for i, row_data in enumerate(table_data):
+        row = table.rows[i]
+        for j, cell_data in enumerate(row_data):
+            cell = row.cells[j]
+            cell.text = str(cell_data)
+
+    # Графики
+    doc.add_heading('Визуализация данных', level=1)
+
+    if charts.get('type_chart'):
+        doc.add_paragraph('Распределение по типам:')
+        doc.add_picture(charts['type_chart'], width=Inches(6))
+        doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_page_break()
+
+    if charts.get('year_chart'):
+        doc.add_paragraph('Динамика по годам:')
+        doc.add_picture(charts['year_chart'], width=Inches(6))
+        doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    # Последние записи
+    doc.add_page_break()
+    doc.add_heading('Последние записи', level=1)
+
+    if stats['recent_entries']:
+        table = doc.add_table(rows=len(stats['recent_entries']) + 1, cols=4)
+        table.style = 'LightShading'
+
+        headers = ['Название', 'Тип', 'Год', 'Дата создания']
+        for i, header in enumerate(headers):
+            table.cell(0, i).text = header
+            table.cell(0, i).paragraphs[0].runs[0].font.bold = True
+
+        for i, entry in enumerate(stats['recent_entries'], start=1):
+            for j, value in enumerate(entry):
+                table.cell(i, j).text = str(value) if value is not None else ""
+
+    # Сохраняем
+    word_path = str(Path(reports_dir) / "portfolio_report.docx")
+    doc.save(word_path)
+
+    return word_path
+
+
+def run_stage(stage, func, *args):
+    """Выполнение этапа в процессе пула с замером времени"""
+    started = time.perf_counter()
+    result = func(*args)
+    return stage, result, time.perf_counter() - started
+
+
+def build_reports(stats, executor, reports_dir=REPORTS_DIR, on_stage=None, cancel_event=None):
+    """Построение графиков и документов в пуле процессов
+
+    Оба графика строятся параллельно; Excel и Word ставятся в пул, как только
+    готовы графики. График, данные и параметры которого не изменились с
+    прошлого отчета, берется из кэша. on_stage(stage, done, total, seconds)
+    вызывается после каждого этапа. Если установлен cancel_event, после
+    очередного этапа оставшиеся снимаются с пула и выбрасывается
+    ReportCancelled; отмена после последнего этапа уже ничего не отменяет. Возвращает пути к отчетам, попадания и промахи кэша
+    графиков и время этапов.
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise ReportCancelled()
+
+    reports_dir = Path(reports_dir)
+    reports_dir.mkdir(exist_ok=True)
+
+    cache_dir = reports_dir / CHART_CACHE_DIR
+    cache_dir.mkdir(exist_ok=True)
+
+    chart_jobs = {
+        'type_chart': (render_type_chart, stats['type_distribution'], reports_dir / TYPE_CHART),
+        'year_chart': (render_year_chart, stats['year_distribution'], reports_dir / YEAR_CHART),
+    }
+
+    charts = {}
+    cache = {'hits': 0, 'misses': 0}
+    pending = set()
+    for stage, (func, series, path) in chart_jobs.items():
+        if not series:
+            # Нет данных - старый график не должен попасть в отчет
+            path.unlink(missing_ok=True)
+            charts[stage] = None
+            continue
+
+        options = CHART_OPTIONS[stage]
+        cache_path = cache_dir / f"{stage}_{chart_cache_key(stage, series, options)}.png"
+        if cache_path.exists():
+            # Данные не изменились - график берется из кэша без построения
+            cache['hits'] += 1
+            os.utime(cache_path)
+            shutil.copyfile(cache_path, path)
+            charts[stage] = str(path)
+        else:
+            cache['misses'] += 1
+            pending.add(executor.submit(run_stage, stage, render_cached_chart,
+                                        func, series, options, str(cache_path)))
+
+    timings = {}
+    results = {}
+    total = len(pending) + 2
+    documents_submitted = False
+
+    while pending or not documents_submitted:
+        if not documents_submitted and len(charts) == len(chart_jobs):
+            for stage, func in (('excel', generate_excel), ('word', generate_word)):
+                pending.add(executor.submit(run_stage, stage, func, stats, charts, str(reports_dir)))
+            documents_submitted = True
+
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage, result, seconds = future.result()
+            timings[stage] = seconds
+            if stage in chart_jobs:
+                path = chart_jobs[stage][2]
+                shutil.copyfile(result, path)
+                prune_chart_cache(cache_dir, stage)
+                charts[stage] = str(path)
+            else:
+                results[stage] = result
+            if on_stage:
+                on_stage(stage, len(timings), total, seconds)
+
+        # Отмена после последнего этапа не выбрасывает уже готовые отчеты
+        work_left = pending or not documents_submitted
+        if work_left and cancel_event is not None and cancel_event.is_set():
+            # Уже запущенный этап доработает в пуле, но его результат не нужен
+            for future in pending:
+                future.cancel()
+            raise ReportCancelled()
+
+    return {
+        'excel': results['excel'],
+        'word': results['word'],
+        'charts': charts,
+        'chart_cache': cache,
+        'timings': timings
+    }
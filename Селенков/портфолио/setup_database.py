@@ -2,6 +2,8 @@ import psycopg2
 from psycopg2 import OperationalError
 import sys
 
+import migrations
+
 
 def create_database():
     """Создание БД и таблиц"""
@@ -34,12 +36,14 @@ def create_database():
             if response.lower() == 'y':
                 cursor.execute("DROP DATABASE research_portfolio")
                 print("Старая БД удалена.")
+                exists = None
             else:
-                print("Используем существующую БД.")
+                print("Используем существующую БД, схема будет обновлена.")
 
         # Создаем БД
-        cursor.execute("CREATE DATABASE research_portfolio")
-        print("БД создана.")
+        if not exists:
+            cursor.execute("CREATE DATABASE research_portfolio")
+            print("БД создана.")
 
         cursor.close()
         conn.close()
@@ -54,50 +58,15 @@ def create_database():
         )
         cursor = conn.cursor()
 
-        # Создаем таблицы
+        # Создаем таблицы и индексы теми же миграциями, что и приложение
         print("\nСоздание таблиц...")
 
-        cursor.execute("""
-            CREATE TABLE entries (
-                id SERIAL PRIMARY KEY,
-                title VARCHAR(255) NOT NULL,
-                entry_type VARCHAR(100) NOT NULL,
-                year INTEGER,
-                file_path VARCHAR(500) UNIQUE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        print("✓ Таблица 'entries'")
-
-        cursor.execute("""
-            CREATE TABLE coauthors (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL UNIQUE
-            )
-        """)
-        print("✓ Таблица 'coauthors'")
-
-        cursor.execute("""
-            CREATE TABLE entry_coauthors (
-                entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE,
-                coauthor_id INTEGER REFERENCES coauthors(id) ON DELETE CASCADE,
-                PRIMARY KEY (entry_id, coauthor_id)
-            )
-        """)
-        print("✓ Таблица 'entry_coauthors'")
-
-        cursor.execute("""
-            CREATE TABLE activity_log (
-                id SERIAL PRIMARY KEY,
-                date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                description TEXT NOT NULL,
-                entry_id INTEGER REFERENCES entries(id) ON DELETE CASCADE
-            )
-        """)
-        print("✓ Таблица 'activity_log'")
-
-        conn.commit()
+        for version in migrations.migrate(conn):
+            print(f"✓ Миграция {version}")
+
+        if migrations.create_search_indexes(conn):
+            print("✓ Индексы поиска")
+
         print("\n✓ Все таблицы созданы!")
 
         # Проверяем
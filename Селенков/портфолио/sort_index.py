@@ -0,0 +1,69 @@
+from array import array
+from datetime import datetime
+
+# Ключ для отсутствующего значения: при ASC такие записи идут последними,
+# при DESC - первыми, как NULL в PostgreSQL
+MISSING = 2 ** 63 - 1
+
+
+def title_key(title):
+    """Ключ сравнения названий без учета регистра, ё сортируется как е
+
+    Совпадает с выражением сортировки DatabaseManager.SORT_EXPRESSIONS
+    (replace(lower(title), 'ё', 'е') COLLATE "C"), поэтому порядок не
+    зависит от того, отсортирован список на сервере или в памяти.
+    """
+    return title.lower().replace('ё', 'е')
+
+
+def created_key(created_at):
+    """Дата создания в виде ГГГГММДДЧЧММ из строки 'ДД.ММ.ГГГГ ЧЧ:ММ'"""
+    if not created_at:
+        return MISSING
+    return int(datetime.strptime(created_at, '%d.%m.%Y %H:%M').strftime('%Y%m%d%H%M'))
+
+
+class EntrySortIndex:
+    """Загруженные записи списка с готовыми ключами сортировки
+
+    Ключи каждой колонки хранятся отдельным массивом, порядок для колонки
+    вычисляется один раз и используется для обоих направлений: DESC - это
+    обратный порядок ASC. Смена сортировки уже загруженного списка не
+    требует запроса к БД. При равных значениях записи упорядочиваются по id,
+    как в DatabaseManager.get_entries_page.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.items = []
+        self.ids = array('q')
+        self.years = array('q')
+        self.created = array('q')
+        self.titles = []
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item, entry):
+        """Запись в формате get_entries и идентификатор ее строки в списке"""
+        entry_id, title, _, year, created_at = entry[:5]
+        self.items.append(item)
+        self.ids.append(entry_id)
+        self.titles.append(title_key(title))
+        self.years.append(MISSING if year is None else year)
+        self.created.append(created_key(created_at))
+        self._orders.clear()
+
+    def ordered(self, sort_by, sort_order):
+        """Идентификаторы строк в порядке сортировки"""
+        order = self._orders.get(sort_by)
+        if order is None:
+            keys = {'created_at': self.created, 'title': self.titles, 'year': self.years}[sort_by]
+            order = self._orders[sort_by] = array(
+                'q', sorted(range(len(self.items)), key=lambda i: (keys[i], self.ids[i])))
+
+        positions = reversed(order) if sort_order == 'DESC' else order
+        return [self.items[i] for i in positions]
@@ -0,0 +1,310 @@
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from psycopg2 import sql
+
+import migrations
+from database_manager import DatabaseManager
+from sort_index import title_key
+from query_profiler import TimedConnection
+
+# Параметры в стиле psycopg2 (%s, %(name)s) и экранированный знак процента
+PARAMETER = re.compile(r"%\((\w+)\)s|%s|%%")
+
+# Шаблоны TO_CHAR PostgreSQL, которые используют запросы портфолио
+TO_CHAR_PATTERNS = [('YYYY', '%Y'), ('HH24', '%H'), ('MI', '%M'), ('MM', '%m'), ('DD', '%d')]
+
+
+def render_query(query):
+    """Текст запроса из объектов psycopg2.sql без соединения с PostgreSQL"""
+    if isinstance(query, sql.Composed):
+        return "".join(render_query(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return ".".join('"' + name.replace('"', '""') + '"' for name in query.strings)
+    if isinstance(query, sql.SQL):
+        return query.string
+    return query
+
+
+def convert_parameters(query):
+    """Замена параметров %s и %(name)s на ? и :name"""
+    def replace(match):
+        if match.group(1):
+            return ":" + match.group(1)
+        return "?" if match.group(0) == "%s" else "%"
+    return PARAMETER.sub(replace, query)
+
+
+def to_char(value, pattern):
+    """Аналог TO_CHAR PostgreSQL для дат, хранящихся строками ISO"""
+    if value is None:
+        return None
+    for token, directive in TO_CHAR_PATTERNS:
+        pattern = pattern.replace(token, directive)
+    return datetime.fromisoformat(value).strftime(pattern)
+
+
+def unicode_lower(value):
+    """Нижний регистр с учетом кириллицы и ё как е (встроенный lower SQLite знает только ASCII)
+
+    Тот же ключ, что у сортировки загруженного списка в памяти.
+    """
+    return title_key(value) if value is not None else None
+
+
+class SQLiteCursor:
+    """Курсор SQLite, принимающий запросы в стиле psycopg2"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=None):
+        query = render_query(query)
+        if params is None:
+            return self._cursor.execute(query)
+        return self._cursor.execute(convert_parameters(query), params)
+
+    def mogrify(self, query, params=None):
+        return render_query(query)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SQLiteConnection:
+    """Соединение SQLite с интерфейсом, который ожидает DatabaseManager"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self):
+        return SQLiteCursor(self._connection.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """Менеджер БД портфолио на встроенной SQLite
+
+    Тот же интерфейс, что у DatabaseManager, но без сервера: одно соединение
+    с файлом (или с ':memory:'), доступ к которому разделяется блокировкой.
+    Общие запросы выполняются как есть, отличаются только запросы с
+    функциями PostgreSQL (array_agg, json_agg, unnest, pg_trgm).
+    """
+
+    # Файл базы данных (переменная окружения PORTFOLIO_SQLITE_PATH)
+    SQLITE_PATH = os.environ.get('PORTFOLIO_SQLITE_PATH', 'portfolio.db')
+
+    # Одно соединение вместо пула
+    POOL_MIN_CONNECTIONS = 1
+    POOL_MAX_CONNECTIONS = 1
+
+    # EXPLAIN (ANALYZE, BUFFERS) в SQLite нет
+    EXPLAIN_SLOW_QUERIES = False
+
+    # Встроенный lower SQLite не знает кириллицу, сравнение строк и так побайтное
+    SORT_EXPRESSIONS = dict(DatabaseManager.SORT_EXPRESSIONS, title=sql.SQL('unicode_lower(title)'))
+
+    def __init__(self, path=None, profile_queries=None):
+        self.path = path or self.SQLITE_PATH
+        self.connection = None
+        self._connection_lock = threading.RLock()
+        super().__init__(profile_queries=profile_queries)
+
+    @property
+    def connected(self):
+        return self.connection is not None
+
+    def connect(self):
+        """Открытие файла базы данных"""
+        try:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA foreign_keys = ON")
+            if self.path != ':memory:':
+                connection.execute("PRAGMA journal_mode = WAL")
+            connection.create_function("TO_CHAR", 2, to_char, deterministic=True)
+            connection.create_function("unicode_lower", 1, unicode_lower, deterministic=True)
+            self.connection = SQLiteConnection(connection)
+            print(f"✓ База данных SQLite: {self.path}")
+            return True
+        except sqlite3.Error as e:
+            print(f"✗ Ошибка открытия БД: {e}")
+            return False
+
+    @contextmanager
+    def checkout(self, method='checkout'):
+        """Единственное соединение на время одного вызова"""
+        if self.connection is None:
+            raise sqlite3.OperationalError("Нет подключения к базе данных")
+
+        started = time.perf_counter()
+        if not self._connection_lock.acquire(timeout=self.POOL_TIMEOUT):
+            raise sqlite3.OperationalError("База данных занята")
+
+        try:
+            self._record_checkout(time.perf_counter() - started, False)
+            try:
+                yield TimedConnection(self.connection, self.profiler, method) if self.profiler else self.connection
+            finally:
+                with self._metrics_lock:
+                    self._metrics['in_use'] -= 1
+        finally:
+            self._connection_lock.release()
+
+    def ensure_tables_exist(self):
+        """Приведение схемы БД к текущей версии миграций"""
+        try:
+            with self.checkout('ensure_tables_exist') as connection:
+                applied = migrations.migrate_sqlite(connection)
+
+            if applied:
+                print(f"✓ Схема обновлена до версии {applied[-1]}")
+            else:
+                print("✓ Таблицы существуют")
+            return True
+
+        except Exception as e:
+            print(f"Ошибка проверки таблиц: {e}")
+            return False
+
+    def search_entries(self, text, limit=None):
+        """Поиск записей по подстроке в названии и именах соавторов
+
+        Совпадение в названии ранжируется выше совпадения в соавторах.
+        """
+        text = text.strip()
+        if not text:
+            return []
+
+        try:
+            with self.checkout('search_entries') as connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    WITH matches AS (
+                        SELECT id, 1 AS score
+                        FROM entries
+                        WHERE instr(unicode_lower(title), %(text)s) > 0
+                        UNION ALL
+                        SELECT ec.entry_id, 0
+                        FROM coauthors c
+                        JOIN entry_coauthors ec ON ec.coauthor_id = c.id
+                        WHERE instr(unicode_lower(c.name), %(text)s) > 0
+                    ), ranked AS (
+                        SELECT id, MAX(score) AS score
+                        FROM matches
+                        GROUP BY id
+                        ORDER BY score DESC, id DESC
+                        LIMIT %(limit)s
+                    )
+                    SELECT e.id, e.title, e.entry_type, e.year,
+                           TO_CHAR(e.created_at, 'DD.MM.YYYY HH24:MI') as created_at,
+                           e.file_path
+                    FROM ranked r
+                    JOIN entries e ON e.id = r.id
+                    ORDER BY r.score DESC, e.id DESC
+                """, {'text': unicode_lower(text), 'limit': limit or self.PAGE_SIZE})
+                entries = cursor.fetchall()
+                cursor.close()
+                return entries
+
+        except Exception as e:
+            print(f"Ошибка поиска: {e}")
+            return []
+
+    def _fetch_entry_detail(self, entry_id):
+        """Строка записи, последнее поле - список соавторов"""
+        with self.checkout('get_entry_detail') as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT e.id, e.title, e.entry_type, e.year, e.file_path,
+                       TO_CHAR(e.created_at, 'DD.MM.YYYY HH24:MI'),
+                       (SELECT json_group_array(name)
+                        FROM (SELECT c.name
+                              FROM coauthors c
+                              JOIN entry_coauthors ec ON c.id = ec.coauthor_id
+                              WHERE ec.entry_id = e.id
+                              ORDER BY c.name))
+                FROM entries e
+                WHERE e.id = %s
+            """, (entry_id,))
+            row = cursor.fetchone()
+            cursor.close()
+
+        if row is None:
+            return None
+        return row[:-1] + (json.loads(row[-1]),)
+
+    def _insert_coauthors(self, cursor, entry_id, names):
+        """Добавление соавторов и связей с записью в текущей транзакции"""
+        names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+        if not names:
+            return 0
+
+        # Список имен передается одним параметром JSON и разворачивается json_each
+        params = {'names': json.dumps(names, ensure_ascii=False), 'entry_id': entry_id}
+        cursor.execute("""
+            INSERT INTO coauthors (name)
+            SELECT value FROM json_each(%(names)s)
+            WHERE true
+            ON CONFLICT (name) DO NOTHING
+        """, params)
+        cursor.execute("""
+            INSERT INTO entry_coauthors (entry_id, coauthor_id)
+            SELECT %(entry_id)s, c.id
+            FROM coauthors c
+            JOIN json_each(%(names)s) n ON n.value = c.name
+            WHERE true
+            ON CONFLICT DO NOTHING
+        """, params)
+        cursor.execute("""
+            INSERT INTO activity_log (description, entry_id)
+            SELECT 'Добавлен соавтор: ''' || value || '''', %(entry_id)s
+            FROM json_each(%(names)s)
+        """, params)
+        return len(names)
+
+    def _fetch_statistics(self):
+        """Распределения по типам и годам, число соавторов и записей, последние записи"""
+        with self.checkout('get_statistics') as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT
+                    (SELECT json_group_array(json_array(entry_type, count))
+                     FROM (SELECT entry_type, COUNT(*) AS count
+                           FROM entries
+                           GROUP BY entry_type
+                           ORDER BY count DESC, entry_type)),
+                    (SELECT json_group_array(json_array(year, count))
+                     FROM (SELECT year, COUNT(*) AS count
+                           FROM entries
+                           WHERE year IS NOT NULL
+                           GROUP BY year
+                           ORDER BY year)),
+                    (SELECT COUNT(DISTINCT name) FROM coauthors),
+                    (SELECT COUNT(*) FROM entries),
+                    (SELECT json_group_array(json_array(title, entry_type, year,
+                                                        TO_CHAR(created_at, 'DD.MM.YYYY')))
+                     FROM (SELECT title, entry_type, year, created_at
+                           FROM entries
+                           ORDER BY created_at DESC, id DESC
+                           LIMIT 5))
+            """)
+            types, years, coauthors, total, recent = cursor.fetchone()
+            cursor.close()
+
+        return json.loads(types), json.loads(years), coauthors, total, json.loads(recent)
+
+    def close(self):
+        """Закрытие базы данных и вывод сводки по запросам"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+        if self.profiler:
+            print(self.profiler.format_summary())
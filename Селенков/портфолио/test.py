@@ -5,18 +5,29 @@
 """
 
 import pytest
+import io
 import os
 import tempfile
+import subprocess
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Добавляем путь для импорта модулей
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Импортируем модули
 try:
-    from database_manager import DatabaseManager
+    from database_manager import DatabaseManager, create_database_manager
+    from sqlite_backend import SQLiteDatabaseManager
+    from file_cache import FileContentCache
+    from sort_index import EntrySortIndex
+    import migrations
+    import reports
+    import report_jobs
     import portfolio_app
 
     MODULES_AVAILABLE = True
@@ -24,6 +35,12 @@ except ImportError as e:
     print(f"Warning: Cannot import modules: {e}")
     MODULES_AVAILABLE = False
     DatabaseManager = None
+    SQLiteDatabaseManager = None
+    FileContentCache = None
+    EntrySortIndex = None
+    migrations = None
+    reports = None
+    report_jobs = None
     portfolio_app = None
 
 
@@ -107,12 +124,17 @@ class TestIntegrationWithMock:
 
         # Настраиваем цепочку вызовов
         mock_conn.cursor.return_value = mock_cursor
+        mock_conn.closed = 0
         mock_cursor.fetchone.return_value = (1,)  # Mock для RETURNING id
         mock_cursor.fetchall.return_value = []  # Mock для пустых результатов
 
-        # Создаем менеджер и подменяем соединение
+        # Создаем менеджер и подменяем пул соединений
         db = DatabaseManager()
-        db.connection = mock_conn
+        db.pool = mocker.Mock()
+        db.pool.getconn.return_value = mock_conn
+
+        # Проверка соединения SELECT 1 не входит в считаемые запросы
+        mocker.patch.object(db, '_is_alive', return_value=True)
 
         return db, mock_conn, mock_cursor
 
@@ -137,6 +159,27 @@ class TestIntegrationWithMock:
         # Проверяем, что вернулся ID
         assert entry_id == 1
 
+    def test_create_entry_with_coauthors_mock(self, mock_db):
+        """Запись с соавторами создается одной транзакцией"""
+        db, mock_conn, mock_cursor = mock_db
+        coauthors = [f"Соавтор {i}" for i in range(20)] + ["Соавтор 0", " "]
+
+        db.create_entry("Статья", "Публикация", 2023, "/path/to/file.md", coauthors)
+
+        # Запись, журнал и все соавторы - три запроса и один commit
+        assert mock_cursor.execute.call_count == 3
+        assert mock_conn.commit.call_count == 1
+        params = mock_cursor.execute.call_args_list[-1][0][1]
+        assert params['names'] == [f"Соавтор {i}" for i in range(20)]
+        assert params['entry_id'] == 1
+
+    def test_add_coauthors_empty_mock(self, mock_db):
+        """Пустой список соавторов не выполняет запросов"""
+        db, mock_conn, mock_cursor = mock_db
+
+        assert db.add_coauthors(1, []) == 0
+        assert not mock_cursor.execute.called
+
     def test_get_entries_mock(self, mock_db):
         """Тест получения записей с моком"""
         db, mock_conn, mock_cursor = mock_db
@@ -160,6 +203,534 @@ class TestIntegrationWithMock:
         assert entries[0][1] == 'Test Title'
         assert entries[0][2] == 'Публикация'
 
+    def test_get_entries_page_mock(self, mock_db):
+        """Страница записей и ключ для следующей страницы"""
+        db, mock_conn, mock_cursor = mock_db
+        mock_cursor.fetchall.return_value = [
+            (5, 'Статья', 'Публикация', 2023, '01.02.2023 10:00', '/path/5.md', 'Статья'),
+            (3, 'Тезисы', 'Публикация', 2022, '01.01.2023 10:00', '/path/3.md', 'Тезисы'),
+        ]
+
+        entries, next_key = db.get_entries_page("title", "ASC", limit=2)
+
+        # Запрос только непустых значений, NULL идут отдельной фазой в конце
+        assert mock_cursor.execute.call_count == 1
+        assert entries[1] == (3, 'Тезисы', 'Публикация', 2022, '01.01.2023 10:00', '/path/3.md')
+        assert next_key == ('Тезисы', 3)
+
+        # Следующая страница продолжается после ключа
+        mock_cursor.fetchall.side_effect = [
+            [(7, 'Тезисы', 'Публикация', 2021, '01.03.2023 10:00', '/path/7.md', 'Тезисы')],
+            [],
+        ]
+        entries, next_key = db.get_entries_page("title", "ASC", after_key=next_key, limit=2)
+
+        # Короткая страница - добираются записи с NULL, после чего записи кончаются
+        assert mock_cursor.execute.call_count == 3
+        assert mock_cursor.execute.call_args_list[1][0][1] == ['Тезисы', 3, 2]
+        assert mock_cursor.execute.call_args_list[2][0][1] == [1]
+        assert [entry[0] for entry in entries] == [7]
+        assert next_key is None
+
+    def test_get_entries_page_invalid_sort(self, mock_db):
+        """Сортировка только по разрешенным колонкам"""
+        db, mock_conn, mock_cursor = mock_db
+
+        with pytest.raises(ValueError):
+            db.get_entries_page("file_path; DROP TABLE entries", "ASC")
+        with pytest.raises(ValueError):
+            db.get_entries_page("title", "RANDOM")
+        assert not mock_cursor.execute.called
+
+    def test_search_entries_mock(self, mock_db):
+        """Поиск по триграммам с экранированием шаблона LIKE"""
+        db, mock_conn, mock_cursor = mock_db
+        db.trigram_search = True
+        mock_cursor.fetchall.return_value = [
+            (1, 'Анализ 100% данных', 'Публикация', 2023, '01.01.2023 10:00', '/path/1.md')
+        ]
+
+        entries = db.search_entries(" 100% ")
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert "word_similarity" in query
+        assert params['text'] == "100%"
+        assert params['pattern'] == "%100\\%%"
+        assert entries[0][1] == 'Анализ 100% данных'
+
+        # Пустая строка поиска не выполняет запрос
+        assert db.search_entries("   ") == []
+        assert mock_cursor.execute.call_count == 1
+
+    def test_search_entries_without_trigram(self, mock_db):
+        """Без pg_trgm поиск выполняется через ILIKE"""
+        db, mock_conn, mock_cursor = mock_db
+        db.trigram_search = False
+
+        db.search_entries("Иванов")
+
+        query = mock_cursor.execute.call_args[0][0]
+        assert "ILIKE" in query
+        assert "word_similarity" not in query
+
+    def test_get_entry_detail_cached(self, mock_db):
+        """Запись с соавторами одним запросом, кэш сбрасывается при изменении"""
+        db, mock_conn, mock_cursor = mock_db
+        mock_cursor.fetchone.return_value = (
+            1, 'Статья', 'Публикация', 2023, '/path/1.md', '01.02.2023 10:00', ['Иванов', 'Петров']
+        )
+
+        detail = db.get_entry_detail(1)
+
+        assert mock_cursor.execute.call_count == 1
+        assert detail['title'] == 'Статья'
+        assert detail['file_path'] == '/path/1.md'
+        assert detail['coauthors'] == ['Иванов', 'Петров']
+
+        # Повторный выбор записи берется из кэша
+        assert db.get_entry_detail(1) == detail
+        assert mock_cursor.execute.call_count == 1
+
+        # Изменение записи удаляет ее из кэша
+        db.update_entry(1, 'Статья 2', 'Публикация', 2024)
+        calls = mock_cursor.execute.call_count
+        db.get_entry_detail(1)
+        assert mock_cursor.execute.call_count == calls + 1
+
+    def test_entry_detail_cache_size(self, mock_db):
+        """Кэш хранит только последние просмотренные записи"""
+        db, mock_conn, mock_cursor = mock_db
+        db.DETAILS_CACHE_SIZE = 2
+        mock_cursor.fetchone.return_value = (1, 'Статья', 'Публикация', 2023, None, None, [])
+
+        for entry_id in (1, 2, 1, 3):
+            db.get_entry_detail(entry_id)
+
+        assert list(db._details_cache) == [1, 3]
+
+    def test_get_statistics_single_query(self, mock_db):
+        """Статистика получается одним запросом и кэшируется до изменения данных"""
+        db, mock_conn, mock_cursor = mock_db
+        mock_cursor.fetchone.return_value = (
+            [['Публикация', 2], ['Грант', 1]],
+            [[2022, 1], [2023, 2]],
+            4,
+            3,
+            [['Статья', 'Публикация', 2023, '01.02.2023']]
+        )
+
+        stats = db.get_statistics()
+
+        assert mock_cursor.execute.call_count == 1
+        assert stats['type_distribution'] == {'Публикация': 2, 'Грант': 1}
+        assert list(stats['type_distribution']) == ['Публикация', 'Грант']
+        assert stats['year_distribution'] == {2022: 1, 2023: 2}
+        assert stats['unique_coauthors'] == 4
+        assert stats['total_entries'] == 3
+        assert stats['recent_entries'] == [('Статья', 'Публикация', 2023, '01.02.2023')]
+
+        # Повторный вызов берет данные из кэша
+        assert db.get_statistics() == stats
+        assert mock_cursor.execute.call_count == 1
+
+        # Изменение данных сбрасывает кэш
+        mock_cursor.fetchone.return_value = (1,)
+        db.add_coauthor(1, "Иван Иванов")
+        calls = mock_cursor.execute.call_count
+        mock_cursor.fetchone.return_value = ([], [], 5, 3, [])
+        assert db.get_statistics()['unique_coauthors'] == 5
+        assert mock_cursor.execute.call_count == calls + 1
+
+
+# ============================================================================
+# ТЕСТЫ НА ВСТРОЕННОЙ БД SQLITE (В ПАМЯТИ)
+# ============================================================================
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestSQLiteBackend:
+    """Те же операции DatabaseManager на SQLite без сервера"""
+
+    @pytest.fixture
+    def sqlite_db(self):
+        """Менеджер БД на базе в памяти"""
+        db = SQLiteDatabaseManager(':memory:')
+        yield db
+        db.close()
+
+    def test_backend_selection(self, monkeypatch):
+        """Бэкенд выбирается параметром или переменной окружения"""
+        monkeypatch.setenv('PORTFOLIO_DB_BACKEND', 'sqlite')
+        db = create_database_manager(path=':memory:')
+        assert isinstance(db, SQLiteDatabaseManager)
+        assert db.connected
+        db.close()
+        assert not db.connected
+
+        with pytest.raises(ValueError):
+            create_database_manager('oracle')
+
+    def test_create_and_get_entries(self, sqlite_db):
+        """Создание, изменение и удаление записи"""
+        entry_id = sqlite_db.create_entry("Статья", "Публикация", 2023, "/path/1.md")
+        sqlite_db.create_entry("Грант", "Грант", 2021, "/path/2.md")
+
+        entries = sqlite_db.get_entries("title", "ASC")
+        assert [entry[1] for entry in entries] == ["Грант", "Статья"]
+        assert entries[1][:4] == (entry_id, "Статья", "Публикация", 2023)
+        assert len(entries[1][4]) == len("01.01.2023 10:00")
+
+        sqlite_db.update_entry(entry_id, "Статья 2", "Публикация", 2024)
+        assert sqlite_db.get_entry_detail(entry_id)['title'] == "Статья 2"
+
+        sqlite_db.delete_entry(entry_id)
+        assert sqlite_db.get_entry_detail(entry_id) is None
+        assert len(sqlite_db.get_entries()) == 1
+
+    def test_coauthors(self, sqlite_db):
+        """Соавторы добавляются без дублей и удаляются каскадно"""
+        entry_id = sqlite_db.create_entry("Статья", "Публикация", 2023, "/path/1.md",
+                                          ["Петров", "Иванов", "Петров", " "])
+        other_id = sqlite_db.create_entry("Доклад", "Конференция", 2022, "/path/2.md", ["Иванов"])
+
+        assert sqlite_db.get_coauthors(entry_id) == ["Иванов", "Петров"]
+        assert sqlite_db.get_entry_detail(other_id)['coauthors'] == ["Иванов"]
+
+        sqlite_db.add_coauthor(other_id, "Сидоров")
+        sqlite_db.remove_coauthor(entry_id, "Петров")
+        assert sqlite_db.get_coauthors(entry_id) == ["Иванов"]
+        assert sqlite_db.get_entry_detail(other_id)['coauthors'] == ["Иванов", "Сидоров"]
+
+        sqlite_db.delete_entry(other_id)
+        with sqlite_db.checkout() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT COUNT(*) FROM entry_coauthors WHERE entry_id = %s", (other_id,))
+            assert cursor.fetchone()[0] == 0
+
+    def test_statistics(self, sqlite_db):
+        """Статистика и ее кэш"""
+        sqlite_db.create_entry("Статья 1", "Публикация", 2023, "/path/1.md", ["Иванов"])
+        sqlite_db.create_entry("Статья 2", "Публикация", 2022, "/path/2.md", ["Петров"])
+        sqlite_db.create_entry("Грант", "Грант", None, "/path/3.md")
+
+        stats = sqlite_db.get_statistics()
+        assert stats['type_distribution'] == {'Публикация': 2, 'Грант': 1}
+        assert list(stats['type_distribution']) == ['Публикация', 'Грант']
+        assert stats['year_distribution'] == {2022: 1, 2023: 1}
+        assert stats['unique_coauthors'] == 2
+        assert stats['total_entries'] == 3
+        assert stats['recent_entries'][0][0] == "Грант"
+
+        # Изменение полученной статистики не затрагивает кэш
+        stats['type_distribution']['Грант'] = 100
+        stats['recent_entries'].clear()
+        cached = sqlite_db.get_statistics()
+        assert cached['type_distribution']['Грант'] == 1
+        assert len(cached['recent_entries']) == 3
+
+        sqlite_db.create_entry("Доклад", "Конференция", 2021, "/path/4.md")
+        stats = sqlite_db.get_statistics()
+        assert stats['total_entries'] == 4
+
+        # Типы с равным количеством упорядочены по названию
+        assert list(stats['type_distribution']) == ['Публикация', 'Грант', 'Конференция']
+
+    def test_entries_pages(self, sqlite_db):
+        """Постраничная загрузка обходит все записи, включая год NULL"""
+        for i in range(7):
+            sqlite_db.create_entry(f"Запись {i}", "Публикация", 2020 + i % 3 if i != 3 else None,
+                                   f"/path/{i}.md")
+
+        for sort_order in ('ASC', 'DESC'):
+            expected = sqlite_db.get_entries_page("year", sort_order, limit=100)[0]
+            loaded, key = [], None
+            while True:
+                page, key = sqlite_db.get_entries_page("year", sort_order, key, limit=3)
+                loaded.extend(page)
+                if key is None:
+                    break
+            assert loaded == expected
+            assert len(loaded) == 7
+
+        # NULL при ASC в конце, при DESC в начале
+        assert sqlite_db.get_entries_page("year", "ASC")[0][-1][3] is None
+        assert sqlite_db.get_entries_page("year", "DESC")[0][0][3] is None
+
+    def test_entries_pages_many_nulls(self, sqlite_db):
+        """Записей без года больше страницы: страница заканчивается на NULL"""
+        for i in range(12):
+            sqlite_db.create_entry(f"Запись {i}", "Публикация", None if i < 7 else 2020 + i,
+                                   f"/path/{i}.md")
+
+        for sort_order in ('ASC', 'DESC'):
+            loaded, key = [], None
+            while True:
+                page, key = sqlite_db.get_entries_page("year", sort_order, key, limit=3)
+                loaded.extend(entry[0] for entry in page)
+                if key is None:
+                    break
+
+            nulls, dated = list(range(1, 8)), list(range(8, 13))
+            if sort_order == 'ASC':
+                assert loaded == dated + nulls
+            else:
+                assert loaded == nulls[::-1] + dated[::-1]
+
+    def test_search_entries(self, sqlite_db):
+        """Поиск без учета регистра, название выше соавторов"""
+        by_title = sqlite_db.create_entry("Нейросети в медицине", "Публикация", 2023, "/path/1.md")
+        by_coauthor = sqlite_db.create_entry("Доклад", "Конференция", 2022, "/path/2.md",
+                                             ["Нейронов"])
+        sqlite_db.create_entry("Грант", "Грант", 2021, "/path/3.md")
+
+        results = sqlite_db.search_entries("НЕЙРО")
+        assert [entry[0] for entry in results] == [by_title, by_coauthor]
+        assert sqlite_db.search_entries("нет такого") == []
+
+        # ё и е не различаются, как и при сортировке
+        tree = sqlite_db.create_entry("Ёлочные игрушки", "Достижение", 2020, "/path/4.md")
+        assert [entry[0] for entry in sqlite_db.search_entries("ёлоч")] == [tree]
+        assert [entry[0] for entry in sqlite_db.search_entries("ЕЛОЧ")] == [tree]
+
+
+# ============================================================================
+# ТЕСТЫ ЗАМЕРА ВРЕМЕНИ ЗАПРОСОВ
+# ============================================================================
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestQueryProfiler:
+    """Тесты журнала медленных запросов"""
+
+    @pytest.fixture
+    def profiled_db(self, mocker):
+        """Менеджер с замером времени на мок-соединении"""
+        mock_conn = mocker.Mock()
+        mock_cursor = mocker.Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.closed = 0
+        mock_cursor.fetchone.return_value = (1,)
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.mogrify.return_value = "SELECT 1".encode('utf-8')
+
+        db = DatabaseManager(profile_queries=True)
+        db.pool = mocker.Mock()
+        db.pool.getconn.return_value = mock_conn
+        db.profiler.log_file = io.StringIO()
+        return db, mock_conn, mock_cursor
+
+    def test_query_stats_per_method(self, profiled_db):
+        """Запросы учитываются по вызвавшим их методам"""
+        db, mock_conn, mock_cursor = profiled_db
+        db.profiler.slow_threshold = 10
+
+        db.get_entries()
+        db.get_entries()
+        db.create_entry("Статья", "Публикация", 2023, "/path/to/file.md")
+
+        stats = db.get_query_stats()
+        assert stats['get_entries']['count'] == 2
+        assert stats['create_entry']['count'] == 2
+        assert stats['get_entries']['p95'] <= stats['get_entries']['max']
+        assert "get_entries" in db.profiler.format_summary()
+        assert db.profiler.log_file.getvalue() == ""
+
+    def test_helper_queries_counted_under_public_method(self, profiled_db):
+        """Запросы вспомогательных методов учитываются под публичным методом"""
+        db, mock_conn, mock_cursor = profiled_db
+        db.profiler.slow_threshold = 10
+
+        db.create_entry("Статья", "Публикация", 2023, "/path/to/file.md", ["Иванов"])
+        mock_cursor.fetchone.return_value = ([], [], 0, 0, [])
+        db.get_statistics(use_cache=False)
+
+        stats = db.get_query_stats()
+        assert set(stats) == {'create_entry', 'get_statistics'}
+        # Вставка записи, журнал и соавторы (запрос из _insert_coauthors)
+        assert stats['create_entry']['count'] == 3
+
+    def test_slow_query_logged_with_plan(self, profiled_db):
+        """Медленный запрос выводится с планом в точке сохранения"""
+        db, mock_conn, mock_cursor = profiled_db
+        db.profiler.slow_threshold = 0
+        mock_cursor.fetchall.return_value = [("Seq Scan on entries",)]
+
+        db.get_entries()
+
+        executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert "EXPLAIN (ANALYZE, BUFFERS) SELECT 1" in executed
+        assert "SAVEPOINT query_profiler_explain" in executed
+        log = db.profiler.log_file.getvalue()
+        assert "get_entries" in log
+        assert "Seq Scan on entries" in log
+
+    def test_modifying_query_not_analyzed(self, profiled_db):
+        """Изменяющие запросы не выполняются повторно через EXPLAIN ANALYZE"""
+        db, mock_conn, mock_cursor = profiled_db
+        db.profiler.slow_threshold = 0
+        mock_cursor.mogrify.return_value = b"UPDATE entries SET title = 'x' WHERE id = 1"
+
+        db.update_entry(1, "x", "Публикация", 2023)
+
+        executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert not any(query.startswith("EXPLAIN (ANALYZE") for query in executed if isinstance(query, str))
+        assert any(query.startswith("EXPLAIN (COSTS)") for query in executed if isinstance(query, str))
+
+
+# ============================================================================
+# ТЕСТЫ МИГРАЦИЙ СХЕМЫ
+# ============================================================================
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestMigrations:
+    """Тесты версионных миграций"""
+
+    def test_migrate_applies_missing_versions(self, mocker):
+        """Применяются только миграции новее версии БД"""
+        mock_conn = mocker.Mock()
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.fetchone.return_value = (1,)
+
+        applied = migrations.migrate(mock_conn)
+
+        assert applied == [version for version, _, _ in migrations.MIGRATIONS if version > 1]
+        executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert not any("CREATE TABLE IF NOT EXISTS entries" in query for query in executed)
+        assert any("entry_coauthors(coauthor_id)" in query for query in executed)
+        assert any("activity_log(entry_id)" in query for query in executed)
+        assert mock_conn.commit.call_count == 1
+
+    def test_migrate_up_to_date(self, mocker):
+        """Актуальная схема не меняется"""
+        mock_conn = mocker.Mock()
+        mock_conn.cursor.return_value.fetchone.return_value = (migrations.SCHEMA_VERSION,)
+
+        assert migrations.migrate(mock_conn) == []
+
+    def test_migrate_rollback_on_error(self, mocker):
+        """Ошибка миграции откатывает всю транзакцию"""
+        mock_conn = mocker.Mock()
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.fetchone.return_value = (0,)
+        mock_cursor.execute.side_effect = [None, None, None, Exception("нет прав")]
+
+        with pytest.raises(Exception):
+            migrations.migrate(mock_conn)
+
+        assert mock_conn.rollback.called
+        assert not mock_conn.commit.called
+
+
+# ============================================================================
+# ТЕСТЫ ПУЛА СОЕДИНЕНИЙ
+# ============================================================================
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestConnectionPool:
+    """Тесты выдачи соединений из пула"""
+
+    @pytest.fixture
+    def pooled_db(self, mocker):
+        """Менеджер с подмененным пулом"""
+        db = DatabaseManager()
+        db.pool = mocker.Mock()
+        return db
+
+    def test_connection_returned_to_pool(self, pooled_db, mocker):
+        """Соединение возвращается в пул после вызова"""
+        conn = mocker.Mock(closed=0)
+        pooled_db.pool.getconn.return_value = conn
+
+        pooled_db.get_entries()
+
+        pooled_db.pool.putconn.assert_called_once_with(conn, close=False)
+        metrics = pooled_db.get_pool_metrics()
+        assert metrics['checkouts'] == 1
+        assert metrics['in_use'] == 0
+        assert metrics['max_connections'] == DatabaseManager.POOL_MAX_CONNECTIONS
+
+    def test_reconnect_closed_connection(self, pooled_db, mocker):
+        """Закрытое соединение заменяется новым"""
+        dropped = mocker.Mock(closed=2)
+        fresh = mocker.Mock(closed=0)
+        fresh.cursor.return_value.fetchall.return_value = [('Иванов',)]
+        pooled_db.pool.getconn.side_effect = [dropped, fresh]
+
+        assert pooled_db.get_coauthors(1) == ['Иванов']
+
+        pooled_db.pool.putconn.assert_any_call(dropped, close=True)
+        pooled_db.pool.putconn.assert_any_call(fresh, close=False)
+        assert pooled_db.get_pool_metrics()['reconnects'] == 1
+
+    def test_reconnect_connection_dropped_while_idle(self, pooled_db, mocker):
+        """Соединение, разорванное во время простоя (closed == 0), заменяется до запроса"""
+        from psycopg2 import OperationalError
+
+        dropped = mocker.Mock(closed=0)
+        dropped.cursor.return_value.execute.side_effect = OperationalError("server closed the connection")
+        fresh = mocker.Mock(closed=0)
+        fresh.cursor.return_value.fetchall.return_value = [('Иванов',)]
+        pooled_db.pool.getconn.side_effect = [dropped, fresh]
+        pooled_db._released[id(dropped)] = time.monotonic() - pooled_db.POOL_IDLE_CHECK - 1
+
+        assert pooled_db.get_coauthors(1) == ['Иванов']
+
+        dropped.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+        pooled_db.pool.putconn.assert_any_call(dropped, close=True)
+        pooled_db.pool.putconn.assert_any_call(fresh, close=False)
+        assert pooled_db.get_pool_metrics()['reconnects'] == 1
+
+    def test_recently_used_connection_not_pinged(self, pooled_db, mocker):
+        """Соединение, недавно вернувшееся в пул, выдается без SELECT 1"""
+        conn = mocker.Mock(closed=0)
+        conn.cursor.return_value.fetchall.return_value = []
+        pooled_db.pool.getconn.return_value = conn
+
+        pooled_db.get_coauthors(1)
+        pooled_db.get_coauthors(1)
+
+        executed = [call[0][0] for call in conn.cursor.return_value.execute.call_args_list]
+        assert "SELECT 1" not in executed
+        assert len(executed) == 2
+        conn.rollback.assert_not_called()
+
+    def test_broken_connection_discarded(self, pooled_db, mocker):
+        """Соединение с сетевой ошибкой не возвращается в пул"""
+        from psycopg2 import OperationalError
+
+        conn = mocker.Mock(closed=0)
+        conn.cursor.return_value.execute.side_effect = OperationalError("server closed the connection")
+        pooled_db.pool.getconn.return_value = conn
+
+        assert pooled_db.get_entries() == []
+        pooled_db.pool.putconn.assert_called_once_with(conn, close=True)
+
+    def test_checkout_waits_for_free_slot(self, pooled_db, mocker):
+        """При исчерпании пула вызов ждет освобождения соединения"""
+        import threading
+        import time
+
+        pooled_db.pool.getconn.side_effect = lambda: mocker.Mock(closed=0)
+        pooled_db._slots = threading.BoundedSemaphore(1)
+        released = threading.Event()
+
+        def hold_connection():
+            with pooled_db.checkout():
+                released.wait(1)
+
+        holder = threading.Thread(target=hold_connection)
+        holder.start()
+        while pooled_db.get_pool_metrics()['in_use'] == 0:
+            time.sleep(0.01)
+
+        threading.Timer(0.1, released.set).start()
+        with pooled_db.checkout():
+            pass
+        holder.join()
+
+        metrics = pooled_db.get_pool_metrics()
+        assert metrics['checkouts'] == 2
+        assert metrics['peak_in_use'] == 1
+        assert metrics['max_wait'] >= 0.05
+
 
 # ============================================================================
 # ТЕСТЫ ДЛЯ portfolio_app (без GUI)
@@ -210,6 +781,86 @@ class TestPortfolioAppLogic:
             assert isinstance(entry_type, str)
 
 
+# Замер запуска в отдельном интерпретаторе: время от начала процесса до первой
+# отрисовки окна (код 3 - нет дисплея для Tk)
+STARTUP_SCRIPT = """
+import time
+started = time.perf_counter()
+import sys
+import tkinter as tk
+import portfolio_app
+imported = time.perf_counter() - started
+try:
+    root = tk.Tk()
+except tk.TclError:
+    sys.exit(3)
+app = portfolio_app.ResearchPortfolioApp(root)
+root.update()
+print(imported, time.perf_counter() - started)
+app.db.close()
+root.destroy()
+"""
+
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestStartup:
+    """Бенчмарк запуска приложения"""
+
+    # Допустимое время импорта portfolio_app и первой отрисовки окна, с
+    IMPORT_BUDGET = 0.5
+    COLD_START_BUDGET = 2.0
+    WARM_START_BUDGET = 1.0
+
+    def run_startup(self, tmp_path):
+        """Время импорта и первой отрисовки на SQLite во временном каталоге"""
+        project_dir = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ,
+                   PYTHONPATH=project_dir,
+                   PORTFOLIO_DB_BACKEND='sqlite',
+                   PORTFOLIO_SQLITE_PATH=str(tmp_path / 'portfolio.db'))
+        return subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=tmp_path, env=env,
+                              capture_output=True, text=True, timeout=60)
+
+    def test_report_libraries_not_imported(self):
+        """matplotlib, openpyxl и python-docx не загружаются при запуске"""
+        code = ("import sys, time; started = time.perf_counter(); import portfolio_app; "
+                "print(time.perf_counter() - started); "
+                "print(','.join(m for m in ('matplotlib', 'openpyxl', 'docx') if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+
+        assert result.returncode == 0, result.stderr
+        seconds, loaded = result.stdout.splitlines()[-2:]
+        assert loaded == ""
+        assert float(seconds) < self.IMPORT_BUDGET
+
+    def test_time_to_first_paint(self, tmp_path):
+        """Холодный (новая БД) и теплый запуск укладываются в бюджет
+
+        Tk нужен дисплей. На Linux без дисплея тесты запускаются под
+        виртуальным: PORTFOLIO_REQUIRE_DISPLAY=1 xvfb-run -a python -m pytest test.py
+        С PORTFOLIO_REQUIRE_DISPLAY=1 отсутствие дисплея - ошибка, а не пропуск,
+        чтобы бюджет запуска не перестал проверяться незаметно.
+        """
+        timings = []
+        for _ in range(2):
+            result = self.run_startup(tmp_path)
+            if result.returncode == 3:
+                message = "Нет дисплея для Tk (запустите под xvfb-run)"
+                if os.environ.get('PORTFOLIO_REQUIRE_DISPLAY') == '1':
+                    pytest.fail(message)
+                pytest.skip(message)
+            assert result.returncode == 0, result.stderr
+            imported, painted = map(float, result.stdout.split()[-2:])
+            timings.append(painted)
+            assert imported < self.IMPORT_BUDGET
+
+        cold, warm = timings
+        print(f"\nПервая отрисовка: холодный запуск {cold:.2f} с, теплый {warm:.2f} с")
+        assert cold < self.COLD_START_BUDGET
+        assert warm < self.WARM_START_BUDGET
+
+
 # ============================================================================
 # ТЕСТЫ ДЛЯ ПРОВЕРКИ СТРУКТУРЫ ФАЙЛОВ
 # ============================================================================
@@ -222,6 +873,13 @@ def test_project_structure():
     required_files = [
         'database_manager.py',
         'portfolio_app.py',
+        'file_cache.py',
+        'sort_index.py',
+        'migrations.py',
+        'query_profiler.py',
+        'sqlite_backend.py',
+        'reports.py',
+        'report_jobs.py',
         'setup_database.py'
     ]
 
@@ -309,6 +967,324 @@ class TestWithTempFiles:
             # Проверяем расширение
             assert file_path.suffix == ext
 
+    @pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+    def test_file_cache_validation(self, tmp_path):
+        """Файл читается повторно только после изменения"""
+        md_file = tmp_path / "entry.md"
+        md_file.write_text("Первая версия", encoding='utf-8')
+        cache = FileContentCache()
+
+        assert cache.read(md_file) == "Первая версия"
+        assert cache.read(md_file) == "Первая версия"
+        assert cache.get_metrics()['hits'] == 1
+        assert cache.get_metrics()['misses'] == 1
+
+        # Изменение файла в обход кэша меняет размер и время изменения
+        md_file.write_text("Вторая, более длинная версия", encoding='utf-8')
+        assert cache.read(md_file) == "Вторая, более длинная версия"
+        assert cache.get_metrics()['misses'] == 2
+
+        # Запись через кэш сразу обновляет его содержимое
+        cache.write(md_file, "Сохранено")
+        assert cache.read(md_file) == "Сохранено"
+        assert cache.get_metrics()['misses'] == 2
+
+        md_file.unlink()
+        assert cache.read(md_file) is None
+        assert cache.get_metrics()['files'] == 0
+
+    @pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+    def test_file_cache_read_ahead(self, tmp_path):
+        """Файлы соседних записей читаются заранее, старые вытесняются"""
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"entry_{i}.md"
+            path.write_text(f"Запись {i}", encoding='utf-8')
+            paths.append(path)
+        cache = FileContentCache(max_files=3)
+
+        cache.read_ahead(paths).join()
+
+        assert cache.get_metrics()['read_ahead'] == 4
+        assert cache.get_metrics()['files'] == 3
+        assert cache.read(paths[3]) == "Запись 3"
+        assert cache.get_metrics()['hits'] == 1
+        assert cache.read(paths[0]) == "Запись 0"
+        assert cache.get_metrics()['misses'] == 1
+
+
+# ============================================================================
+# ТЕСТЫ ПОСТРОЕНИЯ ОТЧЕТОВ
+# ============================================================================
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestReports:
+    """Тесты конвейера отчетов"""
+
+    STATS = {
+        'type_distribution': {'Публикация': 3, 'Грант': 1},
+        'year_distribution': {2022: 1, 2023: 3},
+        'unique_coauthors': 2,
+        'total_entries': 4,
+        'recent_entries': [('Статья', 'Публикация', 2023, '01.02.2023')]
+    }
+
+    def test_build_reports(self, tmp_path):
+        """Графики, Excel и Word с временем каждого этапа"""
+        stages = []
+
+        # Пул потоков из одного потока вместо процессов, чтобы тест был быстрым
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = reports.build_reports(self.STATS, executor, tmp_path,
+                                           on_stage=lambda stage, *args: stages.append(stage))
+
+        assert Path(result['excel']).exists()
+        assert Path(result['word']).exists()
+        assert (tmp_path / reports.TYPE_CHART).exists()
+        assert set(result['timings']) == {'type_chart', 'year_chart', 'excel', 'word'}
+
+        # Документы собираются только после графиков
+        assert set(stages[:2]) == {'type_chart', 'year_chart'}
+        assert set(stages[2:]) == {'excel', 'word'}
+
+    def test_chart_cache(self, tmp_path):
+        """Неизмененный график берется из кэша, измененный строится заново"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = reports.build_reports(self.STATS, executor, tmp_path)
+            second = reports.build_reports(self.STATS, executor, tmp_path)
+            changed = dict(self.STATS, year_distribution={2022: 1, 2023: 4})
+            third = reports.build_reports(changed, executor, tmp_path)
+
+        assert first['chart_cache'] == {'hits': 0, 'misses': 2}
+        assert second['chart_cache'] == {'hits': 2, 'misses': 0}
+        assert 'type_chart' not in second['timings']
+        assert third['chart_cache'] == {'hits': 1, 'misses': 1}
+        assert set(third['timings']) == {'year_chart', 'excel', 'word'}
+        assert (tmp_path / reports.YEAR_CHART).exists()
+        assert len(list((tmp_path / reports.CHART_CACHE_DIR).glob("year_chart_*.png"))) == 2
+
+    def test_chart_cache_key(self):
+        """Ключ зависит от данных и параметров графика"""
+        options = reports.CHART_OPTIONS['type_chart']
+        key = reports.chart_cache_key('type_chart', {'Грант': 1}, options)
+
+        assert key == reports.chart_cache_key('type_chart', {'Грант': 1}, dict(options))
+        assert key != reports.chart_cache_key('type_chart', {'Грант': 2}, options)
+        assert key != reports.chart_cache_key('type_chart', {'Грант': 1}, dict(options, dpi=150))
+
+    def test_build_reports_without_years(self, tmp_path):
+        """Старый график удаляется, если данных для него больше нет"""
+        (tmp_path / reports.YEAR_CHART).write_bytes(b"old")
+        stats = dict(self.STATS, year_distribution={})
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = reports.build_reports(stats, executor, tmp_path)
+
+        assert result['charts']['year_chart'] is None
+        assert not (tmp_path / reports.YEAR_CHART).exists()
+        assert 'year_chart' not in result['timings']
+
+
+    def test_build_reports_cancelled(self, tmp_path):
+        """Отмена до начала: ни один этап не выполняется"""
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(reports.ReportCancelled):
+                reports.build_reports(self.STATS, executor, tmp_path, cancel_event=cancel_event)
+
+        assert not (tmp_path / reports.TYPE_CHART).exists()
+
+    def test_build_reports_cancelled_between_stages(self, tmp_path):
+        """Отмена после графиков: документы не собираются"""
+        cancel_event = threading.Event()
+
+        def on_stage(stage, done, total, seconds):
+            cancel_event.set()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(reports.ReportCancelled):
+                reports.build_reports(self.STATS, executor, tmp_path,
+                                      on_stage=on_stage, cancel_event=cancel_event)
+
+        assert not (tmp_path / "portfolio_report.docx").exists()
+
+
+    def test_cancel_after_last_stage_keeps_reports(self, tmp_path):
+        """Отмена во время последнего этапа не выбрасывает готовые отчеты"""
+        cancel_event = threading.Event()
+
+        def on_stage(stage, done, total, seconds):
+            if done == total:
+                cancel_event.set()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = reports.build_reports(self.STATS, executor, tmp_path,
+                                           on_stage=on_stage, cancel_event=cancel_event)
+
+        assert cancel_event.is_set()
+        assert Path(result['excel']).exists()
+        assert Path(result['word']).exists()
+
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestReportJobs:
+    """Тесты очереди заданий на отчеты"""
+
+    def make_queue(self, mocker, tmp_path, executor):
+        db = mocker.Mock()
+        db.get_statistics.return_value = TestReports.STATS
+        return report_jobs.ReportJobQueue(db, lambda: executor, tmp_path)
+
+    def wait_events(self, jobs, count):
+        """События до завершения count заданий"""
+        events = []
+        while sum(kind in ('done', 'cancelled', 'error') for kind, _, _ in events) < count:
+            events.append(jobs.events.get(timeout=30))
+        return events
+
+    def test_jobs_run_one_after_another(self, mocker, tmp_path):
+        """Задания выполняются по очереди в одном потоке"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            jobs = self.make_queue(mocker, tmp_path, executor)
+            first = jobs.submit()
+            second = jobs.submit()
+            events = self.wait_events(jobs, 2)
+            jobs.shutdown()
+
+        finished = [(kind, job_id) for kind, job_id, _ in events if kind in ('done', 'error')]
+        assert finished == [('done', first.id), ('done', second.id)]
+
+        # Прогресс второго задания начинается только после завершения первого
+        kinds = [(kind, job_id) for kind, job_id, _ in events if kind != 'queued']
+        assert kinds.index(('done', first.id)) < kinds.index(('progress', second.id))
+
+    def test_cancel_queued_job(self, mocker, tmp_path):
+        """Отмененное задание из очереди пропускается"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            jobs = self.make_queue(mocker, tmp_path, executor)
+            job = jobs.submit()
+            job.cancel()
+            events = self.wait_events(jobs, 1)
+            jobs.shutdown()
+
+        assert events[-1][:2] == ('cancelled', job.id)
+
+    def test_shutdown_cancels_running_job(self, mocker, tmp_path):
+        """shutdown отменяет и выполняемое задание, а не только ожидающие"""
+        started = threading.Event()
+        release = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            jobs = self.make_queue(mocker, tmp_path, executor)
+
+            def get_statistics():
+                started.set()
+                release.wait(5)
+                return TestReports.STATS
+
+            jobs.db.get_statistics.side_effect = get_statistics
+            running = jobs.submit()
+            waiting = jobs.submit()
+            assert started.wait(5)
+
+            jobs.shutdown()
+            assert running.cancelled and waiting.cancelled
+
+            # Поток еще внутри get_statistics: ожидание ограничено timeout
+            assert not jobs.shutdown(wait=True, timeout=0.1)
+            release.set()
+            assert jobs.shutdown(wait=True, timeout=5)
+
+        assert not jobs._thread.is_alive()
+        jobs.db.get_statistics.assert_called_once()
+        assert ('cancelled', running.id) in [event[:2] for event in jobs.get_events()]
+
+    def test_error_event(self, mocker, tmp_path):
+        """Ошибка задания передается событием, а не исключением в потоке"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            jobs = self.make_queue(mocker, tmp_path, executor)
+            jobs.db.get_statistics.side_effect = RuntimeError("нет соединения")
+            job = jobs.submit()
+            events = self.wait_events(jobs, 1)
+            jobs.shutdown()
+
+        kind, job_id, data = events[-1]
+        assert (kind, job_id) == ('error', job.id)
+        assert "нет соединения" in data['message']
+
+
+@pytest.mark.skipif(not MODULES_AVAILABLE, reason="Модули не доступны")
+class TestSortIndex:
+    """Тесты сортировки загруженного списка без запросов к БД"""
+
+    SORT_MODES = [(column, order) for column in ('created_at', 'title', 'year')
+                  for order in ('ASC', 'DESC')]
+
+    @pytest.mark.parametrize("sort_by,sort_order", SORT_MODES)
+    def test_same_order_as_database(self, sort_by, sort_order):
+        """Порядок совпадает с порядком страниц из БД, включая записи без года"""
+        db = SQLiteDatabaseManager(':memory:')
+        try:
+            for i, (title, year) in enumerate([("Статья", 2023), ("Грант", None),
+                                               ("Доклад", 2021), ("Аспирант", 2023),
+                                               ("Монография", None)]):
+                db.create_entry(title, "Публикация", year, f"/path/{i}.md")
+
+            index = EntrySortIndex()
+            for entry in db.get_entries():
+                index.add(entry[0], entry)
+
+            # Список приложения загружается страницами get_entries_page
+            entries, _ = db.get_entries_page(sort_by, sort_order, limit=10)
+            expected = [entry[0] for entry in entries]
+            assert index.ordered(sort_by, sort_order) == expected
+        finally:
+            db.close()
+
+    def test_title_order_matches_database(self):
+        """Порядок названий с разным регистром и ё совпадает с сортировкой на сервере"""
+        titles = ["ёлка", "Жук", "ель", "Яблоко", "анализ", "Ёж", "ЯБЛОКО", "Абрикос", "apple", "Zoo"]
+        db = SQLiteDatabaseManager(':memory:')
+        try:
+            index = EntrySortIndex()
+            for i, title in enumerate(titles):
+                entry_id = db.create_entry(title, "Публикация", 2023, f"/path/{i}.md")
+                index.add(entry_id, (entry_id, title, "Публикация", 2023, "01.02.2023 10:00"))
+
+            for sort_order in ('ASC', 'DESC'):
+                # Сервер отдает список страницами, в памяти он сортируется целиком
+                loaded, key = [], None
+                while True:
+                    page, key = db.get_entries_page('title', sort_order, key, limit=3)
+                    loaded.extend(entry[0] for entry in page)
+                    if key is None:
+                        break
+                assert index.ordered('title', sort_order) == loaded
+
+            # Без учета регистра, ё рядом с е
+            by_title = {entry_id: title for entry_id, title in
+                        ((entry[0], entry[1]) for entry in db.get_entries_page('title', 'ASC', limit=20)[0])}
+            ordered = [by_title[entry_id] for entry_id in index.ordered('title', 'ASC')]
+            assert ordered[:2] == ["apple", "Zoo"]
+            assert ordered[2:] == ["Абрикос", "анализ", "Ёж", "ёлка", "ель", "Жук", "Яблоко", "ЯБЛОКО"]
+        finally:
+            db.close()
+
+    def test_created_key(self):
+        """Дата создания сравнивается как дата, а не как строка"""
+        index = EntrySortIndex()
+        index.add('a', (1, "А", "Грант", 2023, "02.01.2024 09:00"))
+        index.add('b', (2, "Б", "Грант", 2023, "31.12.2023 23:59"))
+        index.add('c', (3, "В", "Грант", 2023, "02.01.2024 08:30"))
+
+        assert index.ordered('created_at', 'ASC') == ['b', 'c', 'a']
+
+        index.clear()
+        assert len(index) == 0
+        assert index.ordered('created_at', 'DESC') == []
+
 
 # ============================================================================
 # ПАРАМЕТРИЗОВАННЫЕ ТЕСТЫ